@@ -0,0 +1,54 @@
+"""
+BENCHMARK DA ROTA DO CARTEIRO CHINES
+Tempo, pico de memória e deslocamento sem coleta da rota heurística para
+algumas combinações de profundidade/melhorias do emparelhamento; nos grafos
+pequenos (até MAXIMO_IMPARES_EXATO nós ímpares) mostra quanto o deslocamento
+fica acima do emparelhamento exato (caminhos mínimos entre todos os nós
+ímpares + nx.min_weight_matching). A validade da rota está em tests/test_carteiro.py
+
+Uso (dentro de src/): python -m benchmarks.bench_carteiro 300 500 20000 100000
+"""
+import contextlib
+import io
+import sys
+
+from data.collector import ColetorDados
+from models.carteiro import rota_carteiro
+from models.optimizer import OtimizadorRotas
+from benchmarks.sinteticos import gerar_resposta_planar
+from benchmarks.medicao import medir
+from tests.auxiliares import MAXIMO_IMPARES_EXATO, deslocamento_exato
+
+TAMANHOS = [300, 500, 20_000, 100_000]
+# (profundidade, melhorias): 0/0 = só guloso
+CONFIGURACOES = [(0, 0), (4, 2), (8, 2)]
+
+def main(tamanhos=TAMANHOS):
+    with contextlib.redirect_stdout(io.StringIO()):
+        coletor = ColetorDados()
+        otimizador = OtimizadorRotas()
+
+    print(f"{'nos':>8} {'arestas':>8} {'impares':>8} | {'prof/melh':>9} {'tempo (s)':>9} {'MB':>7} "
+          f"{'sem coleta (m)':>14} {'exato (m)':>10} {'acima':>7}")
+    for numero_nos in tamanhos:
+        with contextlib.redirect_stdout(io.StringIO()):
+            grafo = otimizador.preparar_grafo(coletor.construir_grafo_real(gerar_resposta_planar(numero_nos)))
+        exato = deslocamento_exato(grafo, otimizador.peso)
+
+        for profundidade, melhorias in CONFIGURACOES:
+            (rota, resumo), tempo, memoria = medir(
+                rota_carteiro, grafo, otimizador.peso, raio=otimizador.raio_emparelhamento,
+                melhorias=melhorias, profundidade=profundidade)
+            if exato is None:
+                comparacao = f"{'-':>10} {'-':>7}"
+            else:
+                acima = (resumo['deslocamento_vazio'] / exato - 1) * 100 if exato > 0 else 0.0
+                comparacao = f"{exato:>10.0f} {acima:>+6.1f}%"
+            print(f"{len(grafo.nodes):>8} {len(grafo.edges):>8} {resumo['nos_impares']:>8} | "
+                  f"{profundidade:>4}/{melhorias:<4} {tempo:>9.3f} {memoria:>7.1f} "
+                  f"{resumo['deslocamento_vazio']:>14.0f} {comparacao}")
+
+    print(f"\nexato: só com até {MAXIMO_IMPARES_EXATO} nós ímpares ('-' acima disso)")
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANHOS)
@@ -0,0 +1,57 @@
+"""
+BENCHMARK DO CLIENTE HTTP CONTRA UM SERVIDOR LOCAL SIMULADO
+O servidor (tests/auxiliares.py) simula endpoints lentos, com falha, com limite de taxa (429)
+e instáveis; mede o tempo de cada cenário de nova tentativa e o ganho do
+pool de conexões (o comportamento é conferido em tests/test_cliente_http.py)
+
+Uso (dentro de src/): python -m benchmarks.bench_cliente_http
+"""
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import requests
+
+from data.cliente_http import ClienteHTTP
+from tests.auxiliares import ServidorSimulado
+
+def main():
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ServidorSimulado)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    cliente = ClienteHTTP({'User-Agent': 'Coleta/teste'}, timeout=0.5,
+                          tentativas=4, espera_base=0.05, espera_maxima=2)
+
+    def cronometrar(descricao, funcao):
+        inicio = time.perf_counter()
+        try:
+            resultado = funcao().status_code
+        except Exception as e:
+            resultado = type(e).__name__
+        print(f" {descricao}: {resultado} ({time.perf_counter() - inicio:.2f}s)")
+
+    print("CLIENTE HTTP x SERVIDOR SIMULADO")
+    cronometrar("503 e troca para o espelho", lambda: cliente.requisitar('GET', [f"{base}/falha", f"{base}/ok"]))
+    cronometrar("429 com Retry-After", lambda: cliente.requisitar('GET', f"{base}/limite"))
+    cronometrar("timeout e troca de espelho", lambda: cliente.requisitar('GET', [f"{base}/lento", f"{base}/ok"]))
+    cronometrar("504 intermitente", lambda: cliente.requisitar('GET', f"{base}/instavel"))
+    cronometrar("falha permanente", lambda: cliente.requisitar('GET', f"{base}/falha"))
+
+    # Comparação com requests.get sem sessão (uma conexão por chamada)
+    inicio = time.perf_counter()
+    for _ in range(200):
+        requests.get(f"{base}/ok", timeout=1)
+    tempo_sem_sessao = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for _ in range(200):
+        cliente.requisitar('GET', f"{base}/ok")
+    tempo_pool = time.perf_counter() - inicio
+    print(f"\n200 requisições: sem sessão {tempo_sem_sessao:.3f}s | cliente com pool {tempo_pool:.3f}s")
+
+    print()
+    cliente.imprimir_metricas()
+    servidor.shutdown()
+
+if __name__ == "__main__":
+    main()
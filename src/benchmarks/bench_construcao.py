@@ -0,0 +1,44 @@
+"""
+BENCHMARK DA CONSTRUÇÃO DO GRAFO
+Compara o construtor original (dicts) com o construtor em vetores (arrays)
+A coluna 'vetores' mede só a leitura em GrafoArrays, sem converter para NetworkX
+
+Uso (dentro de src/): python -m benchmarks.bench_construcao
+"""
+import json
+import sys
+
+from data.collector import ColetorDados
+from benchmarks.sinteticos import gerar_conteudo_overpass
+from benchmarks.medicao import medir
+
+TAMANHOS = [50, 150, 300]
+
+def construir_dicts(coletor, conteudo):
+    return coletor._construir_grafo_dicts(json.loads(conteudo))
+
+def construir_arrays(coletor, conteudo):
+    return coletor.construir_grafo_real(conteudo)
+
+def construir_somente_vetores(coletor, conteudo):
+    return coletor.construir_arrays(conteudo)
+
+def main(tamanhos=TAMANHOS):
+    coletor = ColetorDados()
+    coletor.construtor_grafo = 'arrays'
+
+    print(f"{'grade':>10} {'nos':>9} {'arestas':>9} | {'dicts (s)':>10} {'MB':>8} | "
+          f"{'arrays (s)':>10} {'MB':>8} | {'vetores (s)':>11} {'MB':>8}")
+    for lado in tamanhos:
+        conteudo = gerar_conteudo_overpass(lado, lado, duplicar_nos=True)
+
+        grafo, tempo_dicts, memoria_dicts = medir(construir_dicts, coletor, conteudo)
+        _, tempo_arrays, memoria_arrays = medir(construir_arrays, coletor, conteudo)
+        _, tempo_vetores, memoria_vetores = medir(construir_somente_vetores, coletor, conteudo)
+
+        print(f"{lado:>4}x{lado:<5} {len(grafo.nodes):>9} {len(grafo.edges):>9} | "
+              f"{tempo_dicts:>10.3f} {memoria_dicts:>8.1f} | {tempo_arrays:>10.3f} {memoria_arrays:>8.1f} | "
+              f"{tempo_vetores:>11.3f} {memoria_vetores:>8.1f}")
+
+if __name__ == "__main__":
+    main([int(lado) for lado in sys.argv[1:]] or TAMANHOS)
@@ -0,0 +1,42 @@
+"""
+BENCHMARK DAS DISTÂNCIAS GEODÉSICAS
+Compara a vazão do laço por aresta com o cálculo vetorizado
+(a precisão é conferida em tests/test_geodesia.py)
+
+Uso (dentro de src/): python -m benchmarks.bench_distancias [numero_de_arestas]
+"""
+import sys
+import time
+
+import numpy as np
+
+from data.geodesia import calcular_distancias, METODOS_DISTANCIA
+from tests.auxiliares import distancia_laco
+
+def medir_vazao(numero_arestas):
+    print(f"VAZÃO COM {numero_arestas} ARESTAS")
+    aleatorio = np.random.default_rng(42)
+    lat1 = -16.75 + aleatorio.random(numero_arestas) * 0.05
+    lon1 = -43.90 + aleatorio.random(numero_arestas) * 0.05
+    lat2 = lat1 + (aleatorio.random(numero_arestas) - 0.5) * 0.002
+    lon2 = lon1 + (aleatorio.random(numero_arestas) - 0.5) * 0.002
+
+    listas = [v.tolist() for v in (lat1, lon1, lat2, lon2)]
+    inicio = time.perf_counter()
+    laco = [distancia_laco(a, b, c, d) for a, b, c, d in zip(*listas)]
+    tempo_laco = time.perf_counter() - inicio
+    print(f" Laço por aresta: {tempo_laco:.3f}s ({numero_arestas / tempo_laco:,.0f} arestas/s)")
+
+    for metodo in METODOS_DISTANCIA:
+        inicio = time.perf_counter()
+        vetor = calcular_distancias(lat1, lon1, lat2, lon2, metodo=metodo)
+        tempo = time.perf_counter() - inicio
+        erro = np.max(np.abs(vetor - np.array(laco)))
+        print(f" Vetorizado ({metodo}): {tempo:.3f}s ({numero_arestas / tempo:,.0f} arestas/s, "
+              f"{tempo_laco / tempo:.0f}x, erro máximo {erro:.2e}m)")
+
+def main(numero_arestas=1_000_000):
+    medir_vazao(numero_arestas)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,60 @@
+"""
+BENCHMARK DA DIVISÃO EM DISTRITOS (VÁRIOS CAMINHÕES)
+Tempo de ponta a ponta da otimização do grafo inteiro (um caminhão) contra a
+divisão em k distritos otimizados em sequência e em um pool de processos,
+com o equilíbrio (maior/média da extensão); a validade dos distritos está em
+tests/test_distritos.py
+O ganho do pool depende dos núcleos disponíveis (com um só, fica igual ao sequencial)
+
+Uso (dentro de src/): python -m benchmarks.bench_distritos 20000 100000
+"""
+import contextlib
+import io
+import os
+import sys
+
+from data.collector import ColetorDados
+from models.optimizer import OtimizadorRotas
+from benchmarks.sinteticos import gerar_resposta_planar
+from benchmarks.medicao import medir
+
+TAMANHOS = [20_000, 100_000]
+CAMINHOES = [2, 4, 8]
+MODOS = ['arvore', 'carteiro']
+
+def main(tamanhos=TAMANHOS):
+    with contextlib.redirect_stdout(io.StringIO()):
+        coletor = ColetorDados()
+        otimizador = OtimizadorRotas()
+    otimizador.algoritmo, otimizador.motor = 'kruskal', 'kruskal_arrays'
+    # A coluna 'pool' usa sempre o pool (sem o limite ARESTAS_MINIMAS_POOL_DISTRITOS)
+    otimizador.arestas_minimas_pool_distritos = 0
+
+    print(f"núcleos disponíveis: {os.cpu_count()}")
+    print(f"{'nos':>8} {'modo':>9} {'k':>3} | {'sequencial (s)':>14} {'pool (s)':>9} {'equilibrio':>10}")
+    for numero_nos in tamanhos:
+        with contextlib.redirect_stdout(io.StringIO()):
+            grafo = otimizador.preparar_grafo(coletor.construir_grafo_real(gerar_resposta_planar(numero_nos)))
+
+        for modo in MODOS:
+            otimizador.modo = modo
+            calcular = (otimizador.calcular_rota_carteiro if modo == 'carteiro'
+                        else otimizador.calcular_rota_otimizada)
+            _, tempo_inteiro, _ = medir(calcular, grafo, memoria=False)
+            print(f"{len(grafo.nodes):>8} {modo:>9} {1:>3} | {tempo_inteiro:>14.3f} {'-':>9} {'-':>10}")
+
+            for caminhoes in CAMINHOES:
+                otimizador.caminhoes = caminhoes
+                tempos = []
+                for processos in (1, 0):
+                    otimizador.processos_distritos = processos
+                    (distritos, _, metricas), tempo, _ = medir(
+                        otimizador.calcular_rotas_distritos, grafo, memoria=False)
+                    tempos.append(tempo)
+
+                equilibrio = metricas['equilibrio_distritos'] if distritos is not None else float('nan')
+                print(f"{len(grafo.nodes):>8} {modo:>9} {caminhoes:>3} | {tempos[0]:>14.3f} {tempos[1]:>9.3f} "
+                      f"{equilibrio:>10.2f}")
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANHOS)
@@ -0,0 +1,86 @@
+"""
+BENCHMARK DA ATUALIZAÇÃO INCREMENTAL DA ÁRVORE
+Simula a atualização diária: uma fração das vias da malha planar é removida,
+renomeada ou deslocada (nós movidos) e vias novas são abertas; compara a
+preparação + árvore completas do grafo novo (pelo grafo NetworkX com o motor
+networkx e direto nos vetores da coleta com o motor scipy) com o caminho
+incremental inteiro: leitura do estado anterior nos snapshots (coluna 'estado',
+já incluída no total) e atualização da árvore.
+A paridade com o recálculo está em tests/test_incremental.py
+
+Uso (dentro de src/): python -m benchmarks.bench_incremental 20000 100000
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+from data.collector import ColetorDados
+from models.optimizer import OtimizadorRotas
+from benchmarks.sinteticos import gerar_resposta_planar
+from benchmarks.medicao import medir
+from tests.auxiliares import alterar_resposta
+
+TAMANHOS = [20_000, 100_000]
+FRACOES = [0.0005, 0.005] # Fração das vias alterada em cada tipo de mudança
+NOME = 'Incremental' # Nome dos snapshots na pasta temporária
+
+def main(tamanhos=TAMANHOS):
+    with contextlib.redirect_stdout(io.StringIO()):
+        coletor = ColetorDados()
+        otimizador = OtimizadorRotas()
+    coletor.construtor_grafo = 'arrays'
+    otimizador.algoritmo, otimizador.motor = 'kruskal', 'scipy'
+    otimizador.modo, otimizador.caminhoes, otimizador.simplificar = 'arvore', 1, False
+    otimizador.incremental = True
+
+    def recalcular(grafo, motor):
+        otimizador.motor = motor
+        return otimizador.calcular_rota_otimizada(otimizador.preparar_grafo(grafo))[0]
+
+    def atualizar(arrays_novos):
+        # Caminho do main: estado anterior lido dos snapshots + atualização da árvore
+        estado = otimizador.carregar_estado_anterior(NOME)
+        return otimizador.atualizar_rota_incremental(estado, None, NOME, arrays_novos)
+
+    print(f"{'nos':>8} {'fracao':>7} {'vias alt.':>9} | {'networkx (s)':>12} {'vetores (s)':>11} | "
+          f"{'estado (s)':>10} {'incremental (s)':>15} | {'x networkx':>10} {'x vetores':>9}")
+    diretorio = os.getcwd()
+    with tempfile.TemporaryDirectory() as pasta:
+        # Snapshots com caminhos relativos: a pasta temporária vira o cwd
+        os.chdir(pasta)
+        try:
+            for numero_nos in tamanhos:
+                resposta = gerar_resposta_planar(numero_nos)
+                # Execução anterior: coleta, grafo preparado e árvore gravados como no main
+                otimizador.salvar_snapshots = True
+                with contextlib.redirect_stdout(io.StringIO()):
+                    coletor.salvar_grafo_snapshot(NOME, coletor.construir_grafo_real(resposta))
+                    otimizador.motor = 'scipy'
+                    preparado = otimizador.preparar_grafo(coletor.ultimo_arrays, nome_snapshot=NOME)
+                    otimizador.salvar_arvore(otimizador.calcular_rota_otimizada(preparado)[0], NOME)
+                # As atualizações medidas não regravam o estado: todas partem da mesma execução anterior
+                otimizador.salvar_snapshots = False
+
+                for fracao in FRACOES:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        grafo_novo = coletor.construir_grafo_real(alterar_resposta(resposta, fracao))
+                    arrays_novos = coletor.ultimo_arrays
+
+                    _, tempo_estado, _ = medir(otimizador.carregar_estado_anterior, NOME, memoria=False)
+                    resultado, tempo_incremental, _ = medir(atualizar, arrays_novos, memoria=False)
+                    # Completo pelo grafo NetworkX do coletor (preparação no lugar: roda sobre uma cópia)
+                    # e direto nos vetores da coleta
+                    _, tempo_networkx, _ = medir(recalcular, grafo_novo.copy(), 'networkx', memoria=False)
+                    _, tempo_vetores, _ = medir(recalcular, arrays_novos, 'scipy', memoria=False)
+
+                    metricas = resultado[2]
+                    print(f"{numero_nos:>8} {fracao:>7.4f} {metricas['vias_alteradas']:>9} | {tempo_networkx:>12.3f} "
+                          f"{tempo_vetores:>11.3f} | {tempo_estado:>10.3f} {tempo_incremental:>15.3f} | "
+                          f"{tempo_networkx / tempo_incremental:>9.1f}x {tempo_vetores / tempo_incremental:>8.1f}x")
+        finally:
+            os.chdir(diretorio)
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANHOS)
@@ -0,0 +1,68 @@
+"""
+BENCHMARK DA MATRIZ DE DISTÂNCIAS
+Matriz muitos-para-muitos (pontos aleatórios ajustados à malha) com Dijkstra em
+lotes sobre CSR, contra chamadas repetidas de nx.shortest_path_length em uma
+amostra de pares (tempo extrapolado para a matriz inteira), e a leitura do cache
+em disco; a paridade com o NetworkX está em tests/test_matriz_distancias.py
+
+Uso (dentro de src/): python -m benchmarks.bench_matriz_distancias 20000 100000
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+
+import networkx as nx
+import numpy as np
+
+from data.collector import ColetorDados
+from models.matriz_distancias import MatrizDistancias
+from models.optimizer import OtimizadorRotas
+from benchmarks.sinteticos import gerar_resposta_planar
+from benchmarks.medicao import medir
+
+TAMANHOS = [20_000, 100_000]
+PONTOS = 1000 # Pontos de coleta; as garagens/aterros são os 20 primeiros
+ORIGENS = 20
+PARES_NETWORKX = 20 # Pares medidos com nx.shortest_path_length
+
+def main(tamanhos=TAMANHOS):
+    with contextlib.redirect_stdout(io.StringIO()):
+        coletor = ColetorDados()
+        otimizador = OtimizadorRotas()
+
+    print(f"{'nos':>8} {'matriz':>9} | {'networkx (s)*':>13} {'lotes (s)':>9} {'MB':>7} {'cache (s)':>9}")
+    for numero_nos in tamanhos:
+        with contextlib.redirect_stdout(io.StringIO()):
+            grafo = otimizador.preparar_grafo(coletor.construir_grafo_real(gerar_resposta_planar(numero_nos)))
+
+        lat = np.array([data['y'] for _, data in grafo.nodes(data=True)])
+        lon = np.array([data['x'] for _, data in grafo.nodes(data=True)])
+        gerador = np.random.default_rng(0)
+        pontos = np.column_stack([gerador.uniform(lat.min(), lat.max(), PONTOS),
+                                  gerador.uniform(lon.min(), lon.max(), PONTOS)])
+
+        with tempfile.TemporaryDirectory() as pasta:
+            matriz_distancias = MatrizDistancias(grafo, otimizador.peso)
+            matriz_distancias.pasta_cache = pasta
+
+            matriz, tempo, memoria = medir(matriz_distancias.calcular, pontos[:ORIGENS], pontos,
+                                           incluir_acesso=False)
+            _, tempo_cache, _ = medir(matriz_distancias.calcular, pontos[:ORIGENS], pontos,
+                                      incluir_acesso=False, memoria=False)
+
+        indices, _ = matriz_distancias.ajustar(pontos)
+        nos = matriz_distancias.nos
+        inicio = time.perf_counter()
+        for i, j in zip(range(PARES_NETWORKX), range(PONTOS - 1, PONTOS - 1 - PARES_NETWORKX, -1)):
+            nx.shortest_path_length(grafo, nos[indices[i]], nos[indices[j]], weight=otimizador.peso)
+        tempo_networkx = (time.perf_counter() - inicio) / PARES_NETWORKX * matriz.size
+
+        print(f"{len(grafo.nodes):>8} {matriz.shape[0]:>4}x{matriz.shape[1]:<4} | {tempo_networkx:>13.1f} "
+              f"{tempo:>9.3f} {memoria:>7.1f} {tempo_cache:>9.4f}")
+
+    print("* extrapolado da amostra de pares")
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANHOS)
@@ -0,0 +1,44 @@
+"""
+BENCHMARK DOS MOTORES DE ARVORE GERADORA MINIMA
+Compara nx.minimum_spanning_tree (prim/kruskal) com os motores em vetores
+em tempo e pico de memoria (a paridade e conferida em tests/test_mst.py)
+
+Uso (dentro de src/): python -m benchmarks.bench_mst 50 150 300
+"""
+import contextlib
+import io
+import sys
+
+from models.optimizer import OtimizadorRotas
+from benchmarks.sinteticos import gerar_grafo_grade
+from benchmarks.medicao import medir
+
+TAMANHOS = [50, 150, 300]
+CONFIGURACOES = [
+    ('networkx', 'prim'),
+    ('networkx', 'kruskal'),
+    ('scipy', 'kruskal'),
+    ('kruskal_arrays', 'kruskal'),
+]
+
+def main(tamanhos=TAMANHOS):
+    with contextlib.redirect_stdout(io.StringIO()):
+        otimizador = OtimizadorRotas()
+
+    for lado in tamanhos:
+        grafo = gerar_grafo_grade(lado, lado)
+        print(f"\nGRADE {lado}x{lado}: {len(grafo.nodes)} nos, {len(grafo.edges)} arestas")
+
+        for motor, algoritmo in CONFIGURACOES:
+            otimizador.motor = motor
+            otimizador.algoritmo = algoritmo
+            (arvore, metricas), tempo, memoria = medir(otimizador.calcular_rota_otimizada, grafo)
+
+            if arvore is None:
+                print(f" {motor:>15} {algoritmo:>8}: falhou")
+                continue
+            print(f" {motor:>15} {algoritmo:>8}: {tempo:7.3f}s {memoria:8.1f}MB "
+                  f"{metricas['comprimento_otimizado_metros']:.1f}m")
+
+if __name__ == "__main__":
+    main([int(lado) for lado in sys.argv[1:]] or TAMANHOS)
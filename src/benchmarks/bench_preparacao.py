@@ -0,0 +1,47 @@
+"""
+BENCHMARK DA PREPARAÇÃO DO GRAFO
+Compara a preparação original (NetworkX: connected_components + subgraph.copy)
+com a preparação em vetores (union-find, no próprio grafo) em tempo e pico de
+memória; a paridade das duas está em tests/test_preparacao.py
+
+Uso (dentro de src/): python -m benchmarks.bench_preparacao 20000 100000 300000
+"""
+import contextlib
+import io
+import sys
+
+from data.collector import ColetorDados
+from models.optimizer import OtimizadorRotas
+from benchmarks.sinteticos import gerar_resposta_planar
+from benchmarks.medicao import medir
+
+TAMANHOS = [20_000, 100_000, 300_000]
+
+def main(tamanhos=TAMANHOS):
+    with contextlib.redirect_stdout(io.StringIO()):
+        coletor = ColetorDados()
+        otimizador = OtimizadorRotas()
+
+    print(f"{'nos':>9} {'arestas':>9} {'maior':>9} | {'networkx (s)':>12} {'MB':>7} | {'vetores (s)':>11} {'MB':>7}")
+    for numero_nos in tamanhos:
+        # Metade das arestas removidas: muitos componentes pequenos, como em extratos reais recortados
+        with contextlib.redirect_stdout(io.StringIO()):
+            base = coletor.construir_grafo_real(gerar_resposta_planar(numero_nos, remover=0.5))
+        for k, (u, v) in enumerate(base.edges):
+            if k % 50 == 0:
+                del base[u][v]['length']
+
+        resultados = {}
+        for modo in ('networkx', 'vetores'):
+            otimizador.preparacao = modo
+            grafo = base.copy()
+            preparado, tempo, memoria = medir(otimizador.preparar_grafo, grafo)
+            resultados[modo] = (preparado, tempo, memoria)
+
+        (_, nx_tempo, nx_memoria), (vet_grafo, vet_tempo, vet_memoria) = \
+            resultados['networkx'], resultados['vetores']
+        print(f"{len(base.nodes):>9} {len(base.edges):>9} {len(vet_grafo.nodes):>9} | "
+              f"{nx_tempo:>12.3f} {nx_memoria:>7.1f} | {vet_tempo:>11.3f} {vet_memoria:>7.1f}")
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANHOS)
@@ -0,0 +1,52 @@
+"""
+BENCHMARK DO RECORTE PELO POLÍGONO DO BAIRRO
+Mede a redução de nós/arestas e o tempo de cada fase com e sem recorte, e o
+tempo do índice em grade, do teste ponto-no-polígono direto e da escolha
+automática entre os dois (a igualdade é conferida em tests/test_espacial.py)
+
+Uso (dentro de src/): python -m benchmarks.bench_recorte 200
+"""
+import sys
+
+from data.collector import ColetorDados
+from data.espacial import IndiceGrade, aneis_poligono, mascara_no_poligono, pontos_dentro
+from models.optimizer import OtimizadorRotas
+from benchmarks.sinteticos import gerar_conteudo_overpass
+from benchmarks.medicao import medir
+from tests.auxiliares import poligono_circular
+
+def main(lado=200):
+    espacamento = 0.0005
+    conteudo = gerar_conteudo_overpass(lado, lado, espacamento=espacamento)
+    meio = lado * espacamento / 2
+    poligono = poligono_circular(-43.90 + meio, -16.75 + meio, meio * 0.6)
+
+    coletor = ColetorDados()
+    coletor.construtor_grafo = 'arrays'
+    otimizador = OtimizadorRotas()
+    otimizador.motor = 'kruskal_arrays'
+
+    # Índice em grade x teste direto em todos os pontos
+    arrays, _, _ = medir(coletor.construir_arrays, conteudo)
+    aneis = aneis_poligono(poligono)
+    _, tempo_indice, _ = medir(lambda: IndiceGrade(arrays.lon, arrays.lat).pontos_no_poligono(aneis))
+    _, tempo_direto, _ = medir(pontos_dentro, arrays.lon, arrays.lat, aneis)
+    _, tempo_automatico, _ = medir(mascara_no_poligono, arrays.lon, arrays.lat, aneis)
+    print(f"{arrays.numero_nos} nós | índice em grade: {tempo_indice:.3f}s | teste direto: {tempo_direto:.3f}s | "
+          f"automático: {tempo_automatico:.3f}s")
+
+    print(f"\n{'fase':>12} | {'bbox (s)':>9} | {'polígono (s)':>12}")
+    resultados = {}
+    for nome, area in (('bbox', None), ('poligono', poligono)):
+        grafo, tempo_construir, _ = medir(coletor.construir_grafo_real, conteudo, poligono=area)
+        preparado, tempo_preparar, _ = medir(otimizador.preparar_grafo, grafo)
+        _, tempo_mst, _ = medir(otimizador.calcular_rota_otimizada, preparado)
+        resultados[nome] = (len(grafo.nodes), len(grafo.edges), tempo_construir, tempo_preparar, tempo_mst)
+
+    bbox, recorte = resultados['bbox'], resultados['poligono']
+    for indice, fase in ((2, 'construir'), (3, 'preparar'), (4, 'mst')):
+        print(f"{fase:>12} | {bbox[indice]:>9.3f} | {recorte[indice]:>12.3f}")
+    print(f"\nNós: {bbox[0]} -> {recorte[0]} | Arestas: {bbox[1]} -> {recorte[1]}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,56 @@
+"""
+BENCHMARK DA RENDERIZAÇÃO DO MAPA COMPARATIVO
+Compara o caminho original (nx.draw_networkx_*) com o renderizador rápido
+(uma única Line2D por camada, trechos separados por NaN), com os painéis em
+sequência e em processos paralelos
+O pico de memória é o do processo principal (tracemalloc não vê os processos do pool)
+
+Uso (dentro de src/): python -m benchmarks.bench_renderizacao 100 300
+"""
+import os
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import contextlib
+import io
+import sys
+import tempfile
+
+from models.optimizer import OtimizadorRotas
+from utils.visualizer import Visualizador
+from benchmarks.sinteticos import gerar_grafo_grade
+from benchmarks.medicao import medir
+
+TAMANHOS = [100, 300]
+MODOS = [
+    ('networkx', 'networkx', False),
+    ('rapido', 'rapido', False),
+    ('rapido (paralelo)', 'rapido', True),
+]
+
+def main(tamanhos=TAMANHOS):
+    with contextlib.redirect_stdout(io.StringIO()):
+        otimizador = OtimizadorRotas()
+    otimizador.algoritmo, otimizador.motor = 'kruskal', 'kruskal_arrays'
+
+    print(f"{'grade':>10} {'arestas':>9} | " + " | ".join(f"{nome:>17} {'MB':>6}" for nome, _, _ in MODOS))
+    with tempfile.TemporaryDirectory() as pasta:
+        visualizador = Visualizador(pasta_resultados=pasta)
+        for lado in tamanhos:
+            with contextlib.redirect_stdout(io.StringIO()):
+                grafo = otimizador.preparar_grafo(gerar_grafo_grade(lado, lado, pontos_forma=1))
+                arvore, metricas = otimizador.calcular_rota_otimizada(grafo)
+
+            colunas = []
+            for _, renderizador, paralelo in MODOS:
+                visualizador.renderizador = renderizador
+                visualizador.paineis_paralelos = paralelo
+                # Paralelo mesmo abaixo de ARESTAS_PAINEIS_PARALELOS
+                visualizador.arestas_paineis_paralelos = 0
+                _, tempo, memoria = medir(visualizador.criar_mapa_comparativo, grafo, arvore, metricas, 'bench')
+                colunas.append(f"{tempo:>16.2f}s {memoria:>6.0f}")
+
+            print(f"{lado:>4}x{lado:<5} {len(grafo.edges):>9} | " + " | ".join(colunas))
+
+if __name__ == "__main__":
+    main([int(lado) for lado in sys.argv[1:]] or TAMANHOS)
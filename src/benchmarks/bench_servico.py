@@ -0,0 +1,143 @@
+"""
+BENCHMARK DO MODO SERVIÇO
+Sobe o servico.py num processo separado (numa pasta temporária com snapshots de
+malhas planares sintéticas, sem rede) e mede: o tempo até responder /saude
+(partida a frio), a primeira otimização de cada bairro (fora do cache), as
+seguintes (no cache, p50/p95) e a otimização em um processo novo por pedido,
+como no main (com o perfil de fases das configurações); confere que pandas e
+matplotlib só são importados quando um CSV ou mapa é pedido
+
+Uso (dentro de src/): python -m benchmarks.bench_servico 20000 100000
+"""
+import contextlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import numpy as np
+
+from data.collector import ColetorDados
+from benchmarks.sinteticos import gerar_resposta_planar
+
+TAMANHOS = [20_000, 100_000]
+REPETICOES = 50 # Requisições no cache por bairro
+PASTA_SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ALGORITMO vem vazio nas configurações: o benchmark usa kruskal se não houver outro
+CONFIGURAR = ("import config.settings as configuracoes\n"
+              "configuracoes.ALGORITMO = configuracoes.ALGORITMO or 'kruskal'\n")
+INICIAR_SERVICO = CONFIGURAR + (
+    "import runpy, sys\n"
+    "sys.argv = ['servico.py'] + sys.argv[1:]\n"
+    f"runpy.run_path({os.path.join(PASTA_SRC, 'servico.py')!r}, run_name='__main__')\n")
+OTIMIZAR_UMA_VEZ = CONFIGURAR + (
+    "import sys\n"
+    "from servico import ServicoOtimizacao\n"
+    "servico = ServicoOtimizacao()\n"
+    "servico.usar_snapshots()\n"
+    "sys.exit(servico.otimizar(sys.argv[1]) is None)\n")
+
+def porta_livre():
+    with socket.socket() as conexao:
+        conexao.bind(('127.0.0.1', 0))
+        return conexao.getsockname()[1]
+
+def requisitar(url, dados=None):
+    """(status, corpo JSON, segundos)"""
+    corpo = json.dumps(dados).encode() if dados is not None else None
+    pedido = urllib.request.Request(url, data=corpo, headers={'Content-Type': 'application/json'})
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(pedido, timeout=600) as resposta:
+            return resposta.status, json.loads(resposta.read()), time.perf_counter() - inicio
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read()), time.perf_counter() - inicio
+
+def main(tamanhos=TAMANHOS):
+    ambiente = dict(os.environ, PYTHONPATH=PASTA_SRC, MPLBACKEND='Agg')
+    falhas = 0
+
+    with tempfile.TemporaryDirectory() as pasta:
+        # Snapshots de coleta dos bairros sintéticos (caminhos relativos: a pasta vira o cwd)
+        bairros = [f"Planar {numero_nos}" for numero_nos in tamanhos]
+        diretorio = os.getcwd()
+        os.chdir(pasta)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                coletor = ColetorDados()
+                for bairro, numero_nos in zip(bairros, tamanhos):
+                    coletor.salvar_grafo_snapshot(bairro, coletor.construir_grafo_real(gerar_resposta_planar(numero_nos)))
+        finally:
+            os.chdir(diretorio)
+
+        porta = porta_livre()
+        base = f"http://127.0.0.1:{porta}"
+        inicio = time.perf_counter()
+        processo = subprocess.Popen([sys.executable, '-c', INICIAR_SERVICO, '--porta', str(porta), '--usar-snapshots'],
+                                    cwd=pasta, env=ambiente, stdout=subprocess.DEVNULL)
+        try:
+            while True:
+                try:
+                    _, saude, _ = requisitar(f"{base}/saude")
+                    break
+                except OSError:
+                    if processo.poll() is not None:
+                        print("O serviço não subiu")
+                        sys.exit(1)
+                    time.sleep(0.01)
+            partida = time.perf_counter() - inicio
+            print(f"Partida a frio: {partida:.3f}s até /saude "
+                  f"(importações e inicialização: {saude['inicializacao_segundos']:.3f}s) | "
+                  f"bibliotecas carregadas: {saude['bibliotecas']}")
+            falhas += any(saude['bibliotecas'].values())
+
+            print(f"\n{'bairro':>14} | {'1a (s)':>8} {'cache p50 (ms)':>14} {'cache p95 (ms)':>14} | "
+                  f"{'processo novo (s)':>17} {'com CSV (s)':>11}")
+            for bairro in bairros:
+                status, resposta, primeira = requisitar(f"{base}/otimizar", {'bairro': bairro})
+                if status != 200 or resposta['origem'] != 'calculado':
+                    print(f"{bairro:>14} | falhou: {status} {resposta}")
+                    falhas += 1
+                    continue
+
+                tempos = []
+                for _ in range(REPETICOES):
+                    status, resposta_cache, tempo = requisitar(
+                        f"{base}/otimizar?bairro={urllib.parse.quote(bairro)}")
+                    tempos.append(tempo)
+                    falhas += status != 200 or resposta_cache['metricas'] != resposta['metricas']
+
+                inicio = time.perf_counter()
+                codigo = subprocess.run([sys.executable, '-c', OTIMIZAR_UMA_VEZ, bairro], cwd=pasta, env=ambiente,
+                                        stdout=subprocess.DEVNULL).returncode
+                processo_novo = time.perf_counter() - inicio
+                falhas += codigo != 0
+
+                status, resposta_csv, com_csv = requisitar(f"{base}/otimizar", {'bairro': bairro, 'relatorio': True})
+                falhas += status != 200 or not resposta_csv.get('arquivos')
+
+                print(f"{bairro:>14} | {primeira:>8.3f} {np.percentile(tempos, 50) * 1000:>14.2f} "
+                      f"{np.percentile(tempos, 95) * 1000:>14.2f} | {processo_novo:>17.3f} {com_csv:>11.3f}")
+
+            _, saude, _ = requisitar(f"{base}/saude")
+            print(f"\nCache: {saude['cache']['memoria_mb']:.1f} MB em {len(saude['cache']['entradas'])} bairro(s), "
+                  f"{saude['cache']['acertos']} acertos | bibliotecas depois dos CSVs: {saude['bibliotecas']}")
+            falhas += not saude['bibliotecas']['pandas'] or saude['bibliotecas']['matplotlib']
+        finally:
+            processo.terminate()
+            processo.wait()
+
+    if falhas:
+        print(f"{falhas} falha(s)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANHOS)
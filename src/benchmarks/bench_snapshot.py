@@ -0,0 +1,73 @@
+"""
+BENCHMARK DOS SNAPSHOTS BINÁRIOS
+Compara, de ponta a ponta (até a árvore geradora mínima pronta), reconstruir o
+grafo a partir da resposta do Overpass com recarregar o snapshot da coleta
+(com e sem memória mapeada) ou do grafo preparado com cadeias contraídas;
+a preparação e a MST sobre o snapshot ficam em vetores e a conversão para
+NetworkX (só para mapa e relatórios) aparece em linha separada.
+A paridade da ida e volta está em tests/test_snapshot.py
+
+Uso (dentro de src/): python -m benchmarks.bench_snapshot 300
+"""
+import contextlib
+import io
+import sys
+import tempfile
+
+from data.collector import ColetorDados
+from data.snapshot import carregar_snapshot, grafo_para_arrays, salvar_snapshot
+from models.optimizer import OtimizadorRotas
+from benchmarks.sinteticos import gerar_conteudo_overpass
+from benchmarks.medicao import medir
+
+def main(lado=300):
+    conteudo = gerar_conteudo_overpass(lado, lado, pontos_forma=2)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        coletor = ColetorDados()
+        coletor.construtor_grafo = 'arrays'
+        otimizador = OtimizadorRotas()
+    otimizador.algoritmo = otimizador.algoritmo or 'kruskal'
+    otimizador.motor = 'scipy'
+    otimizador.simplificar = False
+
+    def otimizar(grafo):
+        return otimizador.calcular_rota_otimizada(otimizador.preparar_grafo(grafo))
+
+    def otimizar_coleta(mmap):
+        return otimizar(carregar_snapshot(f"{pasta}/coleta", mmap=mmap)[0])
+
+    def otimizar_preparado():
+        return otimizador.calcular_rota_otimizada(carregar_snapshot(f"{pasta}/preparado")[0])
+
+    with tempfile.TemporaryDirectory() as pasta:
+        (arvore, _), tempo_construir, memoria_construir = medir(
+            lambda: otimizar(coletor.construir_grafo_real(conteudo)))
+        _, tempo_salvar, _ = medir(salvar_snapshot, coletor.ultimo_arrays, f"{pasta}/coleta")
+
+        print(f"Malha {lado}x{lado}: {len(arvore.nodes)} nós (MST '{otimizador.motor}')\n")
+        print(f"{'etapa (até a árvore pronta)':>34} | {'tempo (s)':>9} | {'pico (MB)':>9}")
+        print(f"{'construir do Overpass + preparar':>34} | {tempo_construir:>9.3f} | {memoria_construir:>9.1f}")
+        print(f"{'salvar snapshot':>34} | {tempo_salvar:>9.3f} |")
+
+        for mmap in (True, False):
+            _, tempo, memoria = medir(otimizar_coleta, mmap)
+            rotulo = 'coleta (mmap) + preparar' if mmap else 'coleta (cópia) + preparar'
+            print(f"{rotulo:>34} | {tempo:>9.3f} | {memoria:>9.1f}")
+
+        # Grafo preparado com cadeias contraídas: a MST filtra também a geometria
+        otimizador.simplificar = True
+        with contextlib.redirect_stdout(io.StringIO()):
+            preparado = otimizador.preparar_grafo(coletor.construir_grafo_real(conteudo))
+        salvar_snapshot(grafo_para_arrays(preparado, otimizador.peso), f"{pasta}/preparado")
+        _, tempo, memoria = medir(otimizar_preparado)
+        print(f"{'preparado simplificado (mmap)':>34} | {tempo:>9.3f} | {memoria:>9.1f}")
+
+        # Custo que só existe quando o mapa ou os relatórios são pedidos
+        print(f"\n{'NetworkX sob demanda':>34} |")
+        for fase in ('coleta', 'preparado'):
+            _, tempo, memoria = medir(lambda: carregar_snapshot(f"{pasta}/{fase}")[0].para_networkx())
+            print(f"{fase + ' -> para_networkx':>34} | {tempo:>9.3f} | {memoria:>9.1f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,89 @@
+"""
+RESPOSTAS GRAVADAS DO OPENSTREETMAP PARA BENCHMARKS
+Grava a resposta do Nominatim e o corpo bruto do Overpass de um bairro em
+benchmarks/fixtures/<nome>.json.gz, para repetir a construção sem rede
+
+Uso (dentro de src/, com acesso à rede):
+    python -m benchmarks.fixtures "Ibituruna" "Centro" "Major Prates"
+"""
+import contextlib
+import gzip
+import io
+import json
+import os
+import re
+import sys
+import time
+
+PASTA_FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def _nome_arquivo(nome_bairro):
+    return re.sub(r'[^\w-]+', '_', nome_bairro).strip('_').lower() or 'cidade'
+
+def gravar_fixture(nome_bairro, pasta=PASTA_FIXTURES):
+    """Baixa (ou lê do cache) as respostas do bairro e grava a fixture; retorna o caminho"""
+    from data.collector import ColetorDados
+
+    coletor = ColetorDados()
+    with contextlib.redirect_stdout(io.StringIO()):
+        bbox = coletor.buscar_coordenadas_bairro(nome_bairro)
+        if not bbox:
+            raise RuntimeError(f"bairro não encontrado: {nome_bairro}")
+
+        poligono = coletor.poligono_bairro if coletor.recortar_poligono else None
+        if coletor.precisa_tiles(bbox):
+            respostas = list(coletor.buscar_dados_ruas_em_tiles(bbox, poligono=poligono))
+        else:
+            respostas = [coletor.buscar_dados_ruas(bbox, bruto=True, poligono=poligono)]
+        if not all(respostas):
+            raise RuntimeError(f"dados das ruas não encontrados: {nome_bairro}")
+
+    fixture = {
+        'bairro': nome_bairro,
+        'cidade': coletor.cidade,
+        'gravado_em': time.strftime('%Y-%m-%d'),
+        'nominatim': coletor.lugar_encontrado,
+        'overpass': [resposta.decode('utf-8') for resposta in respostas]
+    }
+
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"{_nome_arquivo(nome_bairro)}.json.gz")
+    with gzip.open(caminho, 'wt', encoding='utf-8') as arquivo:
+        json.dump(fixture, arquivo, ensure_ascii=False)
+    return caminho
+
+def listar_fixtures(pasta=PASTA_FIXTURES):
+    """Nomes das fixtures gravadas (sem extensão), em ordem de tamanho do arquivo"""
+    if not os.path.isdir(pasta):
+        return []
+    arquivos = [nome for nome in os.listdir(pasta) if nome.endswith('.json.gz')]
+    arquivos.sort(key=lambda nome: os.path.getsize(os.path.join(pasta, nome)))
+    return [nome[:-len('.json.gz')] for nome in arquivos]
+
+def carregar_fixture(nome, pasta=PASTA_FIXTURES):
+    """
+    Retorna (conteúdo bruto do Overpass, polígono GeoJSON do bairro)
+    no mesmo formato que ColetorDados.obter_grafo_bairro passa para construir_grafo_real
+    """
+    with gzip.open(os.path.join(pasta, f"{nome}.json.gz"), 'rt', encoding='utf-8') as arquivo:
+        fixture = json.load(arquivo)
+
+    respostas = [resposta.encode('utf-8') for resposta in fixture['overpass']]
+    conteudo = respostas[0] if len(respostas) == 1 else respostas
+    poligono = (fixture.get('nominatim') or {}).get('geojson')
+    return conteudo, poligono
+
+def main(bairros):
+    if not bairros:
+        print(__doc__)
+        sys.exit(1)
+    for bairro in bairros:
+        try:
+            caminho = gravar_fixture(bairro)
+        except Exception as e:
+            print(f" [ERRO] {bairro}: {e}")
+            continue
+        print(f" [OK] {bairro}: '{caminho}' ({os.path.getsize(caminho) / 1024:.0f} KB)")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
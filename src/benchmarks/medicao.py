@@ -0,0 +1,32 @@
+"""
+FERRAMENTAS DE MEDIÇÃO PARA BENCHMARKS
+Tempo (perf_counter) e pico de memória (tracemalloc) de uma chamada
+"""
+import contextlib
+import io
+import time
+import tracemalloc
+
+from utils.perfil import perfilador
+
+# O perfil das fases também usa tracemalloc (e zera o pico): desativado nos benchmarks
+perfilador.ativo = False
+
+def medir(funcao, *args, silencioso=True, memoria=True, **kwargs):
+    """
+    Executa a função e retorna (resultado, segundos, pico de memória em MB)
+    memoria=False mede só o tempo (sem o custo do tracemalloc); o pico retorna None
+    """
+    saida = io.StringIO() if silencioso else None
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(saida) if silencioso else contextlib.nullcontext():
+            resultado = funcao(*args, **kwargs)
+        tempo = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if memoria else None
+    finally:
+        if memoria:
+            tracemalloc.stop()
+    return resultado, tempo, pico
@@ -0,0 +1,131 @@
+"""
+DADOS SINTÉTICOS PARA BENCHMARKS
+Gera respostas no formato do Overpass para malhas em grade e malhas planares aleatórias
+"""
+import json
+import random
+
+def gerar_resposta_overpass(linhas, colunas, espacamento=0.0005, origem=(-16.75, -43.90),
+                            semente=42, duplicar_nos=False, pontos_forma=0):
+    """
+    Gera uma malha em grade com 'linhas' x 'colunas' cruzamentos
+    Cada linha e cada coluna vira uma via; duplicar_nos imita 'out body' + 'out skel'
+    pontos_forma insere nós de grau 2 entre cruzamentos consecutivos (como no OSM)
+    """
+    aleatorio = random.Random(semente)
+    elementos = []
+    coordenadas = {}
+
+    def id_no(i, j):
+        return 1 + i * colunas + j
+
+    for i in range(linhas):
+        for j in range(colunas):
+            coordenadas[id_no(i, j)] = (
+                origem[0] + i * espacamento + aleatorio.uniform(-1, 1) * espacamento * 0.1,
+                origem[1] + j * espacamento + aleatorio.uniform(-1, 1) * espacamento * 0.1
+            )
+
+    proximo_id = [linhas * colunas + 1]
+
+    def com_pontos_forma(cruzamentos):
+        nos = [cruzamentos[0]]
+        for a, b in zip(cruzamentos[:-1], cruzamentos[1:]):
+            (lat_a, lon_a), (lat_b, lon_b) = coordenadas[a], coordenadas[b]
+            for k in range(1, pontos_forma + 1):
+                fracao = k / (pontos_forma + 1)
+                coordenadas[proximo_id[0]] = (
+                    lat_a + (lat_b - lat_a) * fracao + aleatorio.uniform(-1, 1) * espacamento * 0.02,
+                    lon_a + (lon_b - lon_a) * fracao + aleatorio.uniform(-1, 1) * espacamento * 0.02
+                )
+                nos.append(proximo_id[0])
+                proximo_id[0] += 1
+            nos.append(b)
+        return nos
+
+    vias = []
+    id_via = 10 ** 9
+    tipos = ['residential', 'residential', 'residential', 'tertiary', 'secondary']
+    for i in range(linhas):
+        vias.append({
+            'type': 'way',
+            'id': id_via,
+            'nodes': com_pontos_forma([id_no(i, j) for j in range(colunas)]),
+            'tags': {'highway': aleatorio.choice(tipos), 'name': f'Rua {i}'}
+        })
+        id_via += 1
+    for j in range(colunas):
+        vias.append({
+            'type': 'way',
+            'id': id_via,
+            'nodes': com_pontos_forma([id_no(i, j) for i in range(linhas)]),
+            'tags': {'highway': aleatorio.choice(tipos), 'name': f'Avenida {j}'}
+        })
+        id_via += 1
+
+    for no, (lat, lon) in coordenadas.items():
+        elementos.append({'type': 'node', 'id': no, 'lat': lat, 'lon': lon})
+    elementos += vias
+
+    if duplicar_nos:
+        elementos += [
+            {'type': 'node', 'id': e['id'], 'lat': e['lat'], 'lon': e['lon']}
+            for e in elementos if e['type'] == 'node'
+        ]
+
+    return {'version': 0.6, 'elements': elementos}
+
+def gerar_conteudo_overpass(linhas, colunas, **kwargs):
+    """Mesma malha de gerar_resposta_overpass, como corpo bruto (bytes)"""
+    return json.dumps(gerar_resposta_overpass(linhas, colunas, **kwargs)).encode('utf-8')
+
+def gerar_resposta_planar(numero_nos, espacamento=0.0005, origem=(-16.75, -43.90),
+                          semente=42, remover=0.25):
+    """
+    Malha planar aleatória: triangulação de Delaunay de pontos uniformes, sem as
+    arestas mais longas (bordas) e sem uma fração 'remover' das demais, imitando
+    quarteirões irregulares; ~2 arestas por nó (numero_nos=500_000 -> ~1 milhão)
+    Cada aresta é uma via de dois nós
+    """
+    import numpy as np
+    from scipy.spatial import Delaunay
+
+    aleatorio = np.random.default_rng(semente)
+    lado = np.sqrt(numero_nos) * espacamento
+    pontos = aleatorio.uniform(0, lado, size=(numero_nos, 2)) + np.array(origem)
+
+    triangulos = Delaunay(pontos).simplices
+    arestas = np.concatenate([triangulos[:, [0, 1]], triangulos[:, [1, 2]], triangulos[:, [0, 2]]])
+    arestas = np.unique(np.sort(arestas, axis=1), axis=0)
+
+    comprimento = np.hypot(*(pontos[arestas[:, 0]] - pontos[arestas[:, 1]]).T)
+    manter = comprimento < np.quantile(comprimento, 0.95)
+    manter &= aleatorio.random(len(arestas)) >= remover
+    arestas = arestas[manter]
+
+    elementos = [
+        {'type': 'node', 'id': no, 'lat': lat, 'lon': lon}
+        for no, (lat, lon) in enumerate(pontos.tolist(), start=1)
+    ]
+
+    tipos = ['residential', 'residential', 'residential', 'tertiary', 'secondary']
+    elementos += [
+        {
+            'type': 'way', 'id': 10 ** 9 + k, 'nodes': [u + 1, v + 1],
+            'tags': {'highway': tipos[k % len(tipos)], 'name': f'Rua {k}'}
+        }
+        for k, (u, v) in enumerate(arestas.tolist())
+    ]
+
+    return {'version': 0.6, 'elements': elementos}
+
+def gerar_grafo_grade(linhas, colunas, semente=42, **kwargs):
+    """Grafo NetworkX da malha sintética, construído pelo mesmo caminho do ColetorDados"""
+    import contextlib
+    import io
+    from data.collector import ColetorDados
+
+    coletor = ColetorDados()
+    with contextlib.redirect_stdout(io.StringIO()):
+        arrays = coletor.construir_arrays(gerar_resposta_overpass(linhas, colunas, semente=semente, **kwargs))
+    return arrays.para_networkx()
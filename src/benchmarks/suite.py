@@ -0,0 +1,234 @@
+"""
+SUÍTE DE BENCHMARKS DO PIPELINE
+Mede cada etapa (construir_grafo_real, preparar_grafo, calcular_rota_otimizada
+de cada algoritmo, criar_mapa_comparativo e gerar_relatorio_ruas) com respostas
+gravadas (benchmarks/fixtures) e malhas sintéticas em grade e planares aleatórias,
+e compara com a baseline salva, acusando as regressões acima do limite
+
+Uso (dentro de src/):
+    python -m benchmarks.suite --escala pequena --salvar-baseline   # grava a baseline
+    python -m benchmarks.suite --escala pequena                     # compara (sai com 1 se regredir)
+    python -m benchmarks.suite --escala cidade --sem-memoria        # milhões de arestas
+"""
+import os
+
+# Sem janela: o mapa só é salvo (plt.show não bloqueia)
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+
+from data.collector import ColetorDados
+from models.optimizer import OtimizadorRotas
+from utils.visualizer import Visualizador
+from benchmarks.fixtures import carregar_fixture, listar_fixtures
+from benchmarks.medicao import medir
+from benchmarks.sinteticos import gerar_conteudo_overpass, gerar_resposta_planar
+
+# Malhas sintéticas de cada escala: grade (lado x lado, um ponto de forma por trecho)
+# e planar (número de nós; ~2 arestas por nó)
+ESCALAS = {
+    'pequena': [('grade', 50), ('planar', 5_000)],
+    'media': [('grade', 200), ('planar', 50_000)],
+    'cidade': [('grade', 700), ('planar', 500_000)],
+}
+
+# (algoritmo, motor) medidos em calcular_rota_otimizada
+MOTORES = [
+    ('prim', 'networkx'),
+    ('kruskal', 'networkx'),
+    ('kruskal', 'scipy'),
+    ('kruskal', 'kruskal_arrays'),
+]
+
+LIMITE_TEMPO = 0.25 # Regressão: mais de 25% mais lento que a baseline
+LIMITE_MEMORIA = 0.25 # Regressão: pico de memória mais de 25% acima da baseline
+TEMPO_MINIMO = 0.1 # Etapas mais rápidas que isso (s) não acusam regressão de tempo (ruído)
+MEMORIA_MINIMA_MB = 1.0 # Diferenças de memória menores que isso são ignoradas
+MAXIMO_ARESTAS_MAPA = 300_000 # Acima disso o mapa não é medido (a não ser com --mapa-sempre)
+
+PASTA_BASELINES = os.path.join(os.path.dirname(__file__), 'baselines')
+
+def gerar_casos(escala, fixtures=True):
+    """Lista de (nome, função que retorna (conteúdo bruto, polígono))"""
+    casos = []
+    if fixtures:
+        for nome in listar_fixtures():
+            casos.append((f"fixture_{nome}", functools.partial(carregar_fixture, nome)))
+
+    for tipo, tamanho in ESCALAS[escala]:
+        if tipo == 'grade':
+            casos.append((f"grade_{tamanho}x{tamanho}",
+                          lambda lado=tamanho: (gerar_conteudo_overpass(lado, lado, pontos_forma=1), None)))
+        else:
+            casos.append((f"planar_{tamanho}",
+                          lambda nos=tamanho: (json.dumps(gerar_resposta_planar(nos)).encode('utf-8'), None)))
+    return casos
+
+def medir_etapa(funcao, entrada, repeticoes=1, memoria=True):
+    """
+    Tempo: menor de 'repeticoes' execuções sem tracemalloc
+    Memória: uma execução a mais com tracemalloc (pico em MB)
+    entrada() gera argumentos novos para cada execução, fora da medição
+    """
+    tempos = []
+    for _ in range(max(1, repeticoes)):
+        resultado, tempo, _ = medir(funcao, *entrada(), memoria=False)
+        tempos.append(tempo)
+
+    pico = None
+    if memoria:
+        _, _, pico = medir(funcao, *entrada())
+    return resultado, min(tempos), pico
+
+def executar_caso(nome, gerar, pasta_saida, repeticoes=1, memoria=True, mapa_sempre=False):
+    """Mede todas as etapas de um caso; retorna {etapa: medição}"""
+    conteudo, poligono = gerar()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        coletor = ColetorDados()
+        otimizador = OtimizadorRotas()
+        visualizador = Visualizador(pasta_resultados=pasta_saida)
+
+    medicoes = {}
+
+    def registrar(etapa, tempo, pico, grafo=None):
+        medicoes[etapa] = {
+            'tempo_segundos': tempo,
+            'memoria_mb': pico,
+            'nos': len(grafo.nodes) if grafo is not None else None,
+            'arestas': len(grafo.edges) if grafo is not None else None
+        }
+        pico_texto = f"{pico:9.1f}MB" if pico is not None else f"{'-':>11}"
+        print(f" {nome:<28} {etapa:<28} {tempo:9.3f}s {pico_texto}")
+
+    construir = functools.partial(coletor.construir_grafo_real, poligono=poligono)
+    grafo, tempo, pico = medir_etapa(construir, lambda: (conteudo,), repeticoes, memoria)
+    registrar('construir_grafo_real', tempo, pico, grafo)
+
+    preparado, tempo, pico = medir_etapa(otimizador.preparar_grafo, lambda: (grafo.copy(),), repeticoes, memoria)
+    registrar('preparar_grafo', tempo, pico, preparado)
+    del grafo
+
+    arvore = metricas = None
+    for algoritmo, motor in MOTORES:
+        otimizador.algoritmo, otimizador.motor = algoritmo, motor
+        (arvore_motor, metricas_motor), tempo, pico = medir_etapa(
+            otimizador.calcular_rota_otimizada, lambda: (preparado,), repeticoes, memoria
+        )
+        registrar(f"mst_{algoritmo}_{motor}", tempo, pico, arvore_motor)
+        if arvore is None:
+            arvore, metricas = arvore_motor, metricas_motor
+
+    if mapa_sempre or len(preparado.edges) <= MAXIMO_ARESTAS_MAPA:
+        _, tempo, pico = medir_etapa(
+            visualizador.criar_mapa_comparativo, lambda: (preparado, arvore, metricas, nome), 1, memoria
+        )
+        registrar('criar_mapa_comparativo', tempo, pico)
+    else:
+        print(f" {nome:<28} {'criar_mapa_comparativo':<28} (ignorado: {len(preparado.edges)} arestas)")
+
+    _, tempo, pico = medir_etapa(visualizador.gerar_relatorio_ruas, lambda: (arvore, nome), repeticoes, memoria)
+    registrar('gerar_relatorio_ruas', tempo, pico)
+
+    return medicoes
+
+def comparar(resultados, baseline, limite_tempo=LIMITE_TEMPO, limite_memoria=LIMITE_MEMORIA):
+    """Lista de regressões (chave, medida, valor atual, valor da baseline)"""
+    regressoes = []
+    for chave, atual in resultados.items():
+        base = baseline.get(chave)
+        if base is None:
+            continue
+
+        tempo, tempo_base = atual['tempo_segundos'], base['tempo_segundos']
+        if tempo >= TEMPO_MINIMO and tempo > tempo_base * (1 + limite_tempo):
+            regressoes.append((chave, 'tempo_segundos', tempo, tempo_base))
+
+        memoria, memoria_base = atual.get('memoria_mb'), base.get('memoria_mb')
+        if (memoria is not None and memoria_base is not None
+                and memoria - memoria_base > MEMORIA_MINIMA_MB
+                and memoria > memoria_base * (1 + limite_memoria)):
+            regressoes.append((chave, 'memoria_mb', memoria, memoria_base))
+    return regressoes
+
+def descrever_maquina():
+    return {
+        'maquina': platform.node(),
+        'processador': platform.processor() or platform.machine(),
+        'nucleos': os.cpu_count(),
+        'python': platform.python_version()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks das etapas do pipeline com baseline")
+    parser.add_argument('--escala', choices=sorted(ESCALAS), default='pequena')
+    parser.add_argument('--repeticoes', type=int, default=3, help="Execuções por etapa (vale a menor)")
+    parser.add_argument('--baseline', default=None, help="Arquivo da baseline (padrão: baselines/<escala>.json)")
+    parser.add_argument('--salvar-baseline', action='store_true', help="Grava os resultados como nova baseline")
+    parser.add_argument('--limite-tempo', type=float, default=LIMITE_TEMPO)
+    parser.add_argument('--limite-memoria', type=float, default=LIMITE_MEMORIA)
+    parser.add_argument('--sem-memoria', action='store_true', help="Não mede o pico de memória (mais rápido)")
+    parser.add_argument('--sem-fixtures', action='store_true', help="Apenas malhas sintéticas")
+    parser.add_argument('--mapa-sempre', action='store_true', help=f"Mede o mapa mesmo acima de {MAXIMO_ARESTAS_MAPA} arestas")
+    args = parser.parse_args()
+
+    caminho_baseline = args.baseline or os.path.join(PASTA_BASELINES, f"{args.escala}.json")
+    casos = gerar_casos(args.escala, fixtures=not args.sem_fixtures)
+
+    print(f"SUÍTE DE BENCHMARKS: escala {args.escala}, {len(casos)} casos, {args.repeticoes} repetições")
+    print("=" * 80)
+
+    resultados = {}
+    inicio = time.perf_counter()
+    with tempfile.TemporaryDirectory() as pasta_saida:
+        for nome, gerar in casos:
+            medicoes = executar_caso(nome, gerar, pasta_saida, args.repeticoes,
+                                     memoria=not args.sem_memoria, mapa_sempre=args.mapa_sempre)
+            resultados.update({f"{nome}/{etapa}": medicao for etapa, medicao in medicoes.items()})
+    print(f"\nTempo total da suíte: {time.perf_counter() - inicio:.1f}s")
+
+    if args.salvar_baseline:
+        os.makedirs(os.path.dirname(caminho_baseline) or '.', exist_ok=True)
+        with open(caminho_baseline, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'criado_em': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'escala': args.escala,
+                'ambiente': descrever_maquina(),
+                'resultados': resultados
+            }, arquivo, ensure_ascii=False, indent=2)
+        print(f"Baseline salva em: '{caminho_baseline}'")
+        return
+
+    if not os.path.exists(caminho_baseline):
+        print(f"Sem baseline em '{caminho_baseline}' (grave com --salvar-baseline)")
+        return
+
+    with open(caminho_baseline, encoding='utf-8') as arquivo:
+        baseline = json.load(arquivo)
+    if baseline.get('ambiente', {}).get('maquina') != descrever_maquina()['maquina']:
+        print("Aviso: a baseline foi gravada em outra máquina; os tempos podem não ser comparáveis")
+
+    regressoes = comparar(resultados, baseline['resultados'], args.limite_tempo, args.limite_memoria)
+    faltando = sorted(set(baseline['resultados']) - set(resultados))
+    if faltando:
+        print(f"{len(faltando)} medições da baseline não foram executadas agora")
+
+    if not regressoes:
+        print(f"Sem regressões em relação à baseline de {baseline['criado_em']}")
+        return
+
+    print(f"\n{len(regressoes)} REGRESSÕES em relação à baseline de {baseline['criado_em']}:")
+    for chave, medida, atual, base in regressoes:
+        print(f" {chave:<58} {medida:<15} {base:10.3f} -> {atual:10.3f} ({(atual / base - 1) * 100:+.0f}%)")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    main()
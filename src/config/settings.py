@@ -5,20 +5,100 @@ BAIRRO_FOCO = "" # Nome do bairro
 # ==================== CONFIGURAÇÕES DE API ====================
 NOMINATIM_URL = "https://nominatim.openstreetmap.org/search" # URL da API do Nominatim, GPS localizador
 OVERPASS_URL = "https://overpass-api.de/api/interpreter" # URL da API do Overpass, listagem de ruas
+OVERPASS_ESPELHOS = [ # Espelhos do Overpass usados quando o principal falha (429, 5xx, timeout)
+    "https://overpass.kumi.systems/api/interpreter",
+    "https://overpass.private.coffee/api/interpreter",
+]
 TIMEOUT = 180 # Tempo limite para obter dados da API
+TENTATIVAS_HTTP = 4 # Tentativas por requisição (alternando entre os espelhos)
+ESPERA_BASE_SEGUNDOS = 1.0 # Espera inicial entre tentativas (dobra a cada falha, com jitter)
+ESPERA_MAXIMA_SEGUNDOS = 60 # Espera máxima entre tentativas
+TAMANHO_POOL_HTTP = 8 # Conexões mantidas abertas por host (keep-alive)
 USER_AGENT = "Coleta/1.0" # User-Agent para a API
+CONSULTA_ENXUTA = True # Overpass retorna cada elemento uma vez e os nós sem tags (menos bytes)
+RECORTAR_POLIGONO = True # Usa o polígono real do bairro (Nominatim) na consulta e no recorte do grafo
+CONSTRUTOR_GRAFO = "arrays" # 'arrays' = um passe em vetores NumPy, 'dicts' = construtor original
+
+# ==================== CONFIGURAÇÕES DE TILES ====================
+TAMANHO_TILE_GRAUS = 0.05 # Áreas maiores que isso (~5,5 km) são baixadas em tiles
+TILES_PARALELOS = 4 # Quantidade de tiles baixados ao mesmo tempo
+REQUISICOES_POR_SEGUNDO = 1 # Limite de requisições às APIs (tiles, lote); o Nominatim pede no máximo 1 por segundo
+
+# ==================== CONFIGURAÇÕES DO MODO LOTE ====================
+BAIRROS_LOTE = [] # Bairros processados por 'python lote.py' sem argumentos (vazio = todos da cidade)
+PROCESSOS_LOTE = 0 # Processos para construir/otimizar/relatar (0 = número de núcleos)
+DOWNLOADS_LOTE = 2 # Bairros baixados ao mesmo tempo (respeitando REQUISICOES_POR_SEGUNDO)
+PASTA_LOTE = "lote" # Subpasta de PASTA_RESULTADOS com as saídas por bairro
+NOME_METRICAS_LOTE = "metricas_lote.csv" # Tabela consolidada com as métricas de todos os bairros
+
+# ==================== CONFIGURAÇÕES DO SERVIÇO ====================
+HOST_SERVICO = "127.0.0.1" # Endereço do serviço HTTP/JSON ('python servico.py'); só a máquina local por padrão
+PORTA_SERVICO = 8765 # Porta do serviço
+MEMORIA_CACHE_GRAFOS_MB = 1024 # Memória (estimada) dos grafos preparados e rotas mantidos entre requisições; os bairros usados há mais tempo saem primeiro
+PASTA_SERVICO = "servico" # Subpasta de PASTA_RESULTADOS com os mapas e CSVs pedidos ao serviço
+
+# ==================== CONFIGURAÇÕES DE CACHE ====================
+USAR_CACHE = True # Guarda em disco as respostas do Nominatim e do Overpass
+MODO_OFFLINE = False # Usa apenas o cache, sem acessar a rede (reexecuções, CI)
+PASTA_CACHE = "cache" # Pasta onde as respostas comprimidas são guardadas
+CACHE_TTL_SEGUNDOS = 7 * 24 * 3600 # Validade de uma resposta em cache (0 = sem validade)
+CACHE_TAMANHO_MAXIMO_MB = 500 # Tamanho máximo do cache, remove as entradas menos usadas
+
+# ==================== CONFIGURAÇÕES DE SNAPSHOTS ====================
+SALVAR_SNAPSHOTS = True # Grava o grafo coletado e o preparado em formato binário (NumPy)
+USAR_SNAPSHOTS = False # Recarrega os snapshots (memória mapeada) em vez de coletar/preparar de novo
+PASTA_SNAPSHOTS = "snapshots" # Pasta dos snapshots (uma subpasta por bairro e fase)
+ATUALIZACAO_INCREMENTAL = False # Compara a nova coleta com a anterior e atualiza a árvore só nas ruas alteradas (MODO_ROTA 'arvore', um caminhão, sem SIMPLIFICAR_GRAFO)
 
 # ==================== CONFIGURAÇÕES DO ALGORITMO ====================
 ALGORITMO = "" # Algoritmo a ser usado, 'prim' ou 'kruskal' -> prim = Prim - MST, kruskal = Kruskal - MST
+MOTOR_MST = "networkx" # 'networkx' (usa ALGORITMO), 'scipy' (matriz CSR) ou 'kruskal_arrays' (union-find em vetores)
+SIMPLIFICAR_GRAFO = False # Contrai cadeias de nos de grau 2 em uma aresta (MST entre cruzamentos)
+PREPARACAO_GRAFO = "vetores" # 'vetores' (union-find, no próprio grafo, sem cópia) ou 'networkx' (original, copia o maior componente)
 PESO_PADRAO = "length" # Atributo usado para calcular o peso do padrão
+MODO_ROTA = "arvore" # 'arvore' (MST: subconjunto das ruas) ou 'carteiro' (rota fechada que percorre todas as ruas)
+RAIO_EMPARELHAMENTO = 1000 # Carteiro: raio (m) do Dijkstra multi-fonte na 1a rodada de pares; dobra a cada rodada (0 = sem limite)
+PROFUNDIDADE_EMPARELHAMENTO = 8 # Carteiro: pares refeitos por caminho aumentante para nos que o guloso deixa sem par (0 = só guloso)
+MELHORIAS_EMPARELHAMENTO = 2 # Carteiro: passadas de troca de pares (2-opt) após o guloso; mais passadas = mais tempo
+METODO_DISTANCIA = "haversine" # Comprimento das ruas: 'haversine' (exato na esfera) ou 'equiretangular' (mais rápido)
+
+# ==================== CONFIGURAÇÕES DE CAMINHÕES ====================
+NUMERO_CAMINHOES = 1 # Caminhões que atendem o bairro; acima de 1 o grafo é dividido em distritos conexos de extensão equilibrada
+GARAGENS = [] # Ponto de partida (lat, lon) de cada caminhão, ex.: [(-16.72, -43.86), (-16.74, -43.88)]; vazio = sementes espalhadas pela malha
+PROCESSOS_DISTRITOS = 0 # Processos para otimizar os distritos em paralelo (0 = número de núcleos; 1 = em sequência)
+ARESTAS_MINIMAS_POOL_DISTRITOS = 20000 # Abaixo disso (arestas do grafo), os distritos são otimizados em sequência: o pool custaria mais do que economiza
+
+# ==================== CONFIGURAÇÕES DA MATRIZ DE DISTÂNCIAS ====================
+USAR_CACHE_MATRIZ = True # Guarda em disco as matrizes de distâncias (por grafo e conjunto de pontos)
+PASTA_MATRIZES = "cache/matrizes" # Pasta das matrizes em cache (.npy)
+CACHE_MATRIZES_TAMANHO_MAXIMO_MB = 1024 # Tamanho máximo da pasta de matrizes; remove as menos usadas
+MEMORIA_LOTE_DIJKSTRA_MB = 256 # Memória de cada lote de Dijkstra (fontes x nós); define quantas fontes por chamada
+PROCESSOS_MATRIZ = 1 # Processos para os lotes de Dijkstra (0 = número de núcleos; 1 = sem pool)
 
 # ==================== CONFIGURAÇÕES DE VISUALIZAÇÃO ====================
 COR_REDE_COMPLETA = "blue" # Cor do mapa completo
 COR_ROTA_OTIMIZADA = "red" # Cor do mapa otimizado
 TAMANHO_PONTO = 30 # Tamanho do ponto
 LARGURA_LINHA = 3 # Largura da linha
+RENDERIZADOR = "rapido" # 'rapido' (ruas em uma única Line2D com trechos separados por NaN, sem janela, nunca bloqueia) ou 'networkx' (original, abre a janela)
+RASTERIZAR_MAPA = True # Rasteriza as camadas densas (ruas e pontos) no renderizador rápido
+MAXIMO_PONTOS_MAPA = 20000 # Pontos (cruzamentos) desenhados por painel; acima disso, amostra (0 = todos)
+CORES_DISTRITOS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+                   "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"] # Cores dos distritos (repetidas acima de 10 caminhões)
+PAINEIS_PARALELOS = True # Renderiza os dois painéis em processos separados (grafos grandes)
+ARESTAS_PAINEIS_PARALELOS = 100000 # Abaixo disso os painéis são desenhados em sequência (custo dos processos)
 
 # ==================== CONFIGURAÇÕES DE SAÍDA ====================
 PASTA_RESULTADOS = "resultados" # Pasta onde os resultados serão salvos
 NOME_MAPA = "mapa_otimizacao.png" # Nome do arquivo de mapa
-NOME_RELATORIO = "ruas_otimizadas.csv" # Nome do arquivo de ruas otimizadas
\ No newline at end of file
+NOME_RELATORIO = "ruas_otimizadas.csv" # Nome do arquivo de ruas otimizadas
+NOME_ROTA = "rota_coleta.csv" # Sequência da rota de coleta (MODO_ROTA = 'carteiro')
+NOME_RELATORIO_DISTRITOS = "distritos.csv" # Métricas por caminhão (NUMERO_CAMINHOES > 1)
+NOME_RELATORIO_ALTERACOES = "ruas_alteradas.csv" # Ruas que mudaram desde a coleta anterior (ATUALIZACAO_INCREMENTAL)
+
+# ==================== CONFIGURAÇÕES DE PERFIL ====================
+MEDIR_FASES = True # Mede tempo, CPU, memória e contagens de cada fase do pipeline
+MEDIR_MEMORIA = False # Pico de memória por fase (tracemalloc; deixa a execução mais lenta; ou --medir-memoria)
+PERFIL_CPROFILE = False # Grava também o perfil cProfile da execução inteira
+NOME_METRICAS_FASES = "metricas_fases" # Métricas das fases (.json e .csv, na pasta de resultados)
+NOME_PERFIL_CPROFILE = "perfil.prof" # Arquivo do cProfile (abrir com pstats ou snakeviz)
@@ -0,0 +1,156 @@
+"""
+MÓDULO DE CACHE DE RESPOSTAS
+Guarda em disco as respostas das APIs do OpenStreetMap
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+from config.settings import PASTA_CACHE, CACHE_TTL_SEGUNDOS, CACHE_TAMANHO_MAXIMO_MB
+
+FRACAO_APOS_REMOCAO = 0.9 # Ao passar do limite, remove até sobrar esta fração dele
+
+class LimiteTamanho:
+    """
+    Limite de tamanho de uma pasta de cache (arquivos com a extensão dada)
+    O total fica em memória (a pasta é lida uma vez, na primeira gravação); só
+    quando ele passa do limite a pasta é relida e as entradas usadas há mais
+    tempo (mtime) saem, até sobrar FRACAO_APOS_REMOCAO do limite
+    """
+    def __init__(self, pasta, tamanho_maximo, extensao, silencioso=False):
+        self.pasta = pasta
+        self.tamanho_maximo = tamanho_maximo
+        self.extensao = extensao
+        self.silencioso = silencioso
+        self._tamanho_total = None
+        self._trava = threading.Lock()
+
+    def listar(self):
+        """(mtime, tamanho, caminho) de cada entrada da pasta"""
+        arquivos = []
+        for raiz, _, nomes in os.walk(self.pasta):
+            for nome in nomes:
+                if not nome.endswith(self.extensao):
+                    continue
+                caminho = os.path.join(raiz, nome)
+                try:
+                    info = os.stat(caminho)
+                except OSError:
+                    continue
+                arquivos.append((info.st_mtime, info.st_size, caminho))
+        return arquivos
+
+    def registrar(self, caminho, tamanho_anterior=0):
+        """Conta a entrada gravada (descontando a que ela substituiu) e aplica o limite"""
+        if self.tamanho_maximo <= 0:
+            return
+        with self._trava:
+            if self._tamanho_total is None:
+                self._tamanho_total = sum(tamanho for _, tamanho, _ in self.listar())
+            else:
+                self._tamanho_total += _tamanho_arquivo(caminho) - tamanho_anterior
+            if self._tamanho_total > self.tamanho_maximo:
+                self._remover_antigas(preservar=caminho)
+
+    def _remover_antigas(self, preservar):
+        # Relê a pasta: outros processos podem ter gravado ou removido entradas
+        arquivos = self.listar()
+        tamanho_total = sum(tamanho for _, tamanho, _ in arquivos)
+        alvo = self.tamanho_maximo * FRACAO_APOS_REMOCAO
+
+        removidos = 0
+        for _, tamanho, caminho in sorted(arquivos):
+            if tamanho_total <= alvo:
+                break
+            if caminho == preservar:
+                continue
+            remover_arquivo(caminho)
+            tamanho_total -= tamanho
+            removidos += 1
+        self._tamanho_total = tamanho_total
+
+        if removidos and not self.silencioso:
+            print(f" Cache: {removidos} entradas antigas removidas")
+
+    def esquecer(self):
+        """O total volta a ser lido da pasta na próxima gravação (ex.: depois de limpar)"""
+        self._tamanho_total = None
+
+def _tamanho_arquivo(caminho):
+    try:
+        return os.path.getsize(caminho)
+    except OSError:
+        return 0
+
+def remover_arquivo(caminho):
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
+
+class CacheRespostas:
+    def __init__(self, pasta=PASTA_CACHE, ttl=CACHE_TTL_SEGUNDOS,
+                 tamanho_maximo_mb=CACHE_TAMANHO_MAXIMO_MB, silencioso=False):
+        self.pasta = pasta
+        self.ttl = ttl
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self.limite = LimiteTamanho(pasta, self.tamanho_maximo, '.gz', silencioso)
+
+    def gerar_chave(self, *partes):
+        """Gera a chave (hash SHA-256) a partir do texto/parâmetros da consulta"""
+        texto = json.dumps(partes, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.pasta, chave[:2], f"{chave}.gz")
+
+    def obter(self, chave, ignorar_ttl=False):
+        """
+        Retorna o conteúdo (bytes) guardado para a chave
+        Retorna None se não existir ou se estiver expirado
+        """
+        caminho = self._caminho(chave)
+        if not os.path.exists(caminho):
+            return None
+
+        """ O TTL conta a partir da gravação, guardada no próprio arquivo """
+        try:
+            with gzip.open(caminho, 'rb') as arquivo:
+                gravado_em = float(arquivo.readline())
+                conteudo = arquivo.read()
+        except (OSError, ValueError, EOFError):
+            self._remover(caminho)
+            return None
+
+        if not ignorar_ttl and self.ttl and time.time() - gravado_em > self.ttl:
+            return None
+
+        # Marca o uso (mtime) para a política de remoção LRU
+        os.utime(caminho, None)
+        return conteudo
+
+    def salvar(self, chave, conteudo):
+        """Grava o conteúdo comprimido e aplica o limite de tamanho"""
+        caminho = self._caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(temporario, 'wb') as arquivo:
+            arquivo.write(f"{time.time()}\n".encode('ascii'))
+            arquivo.write(conteudo)
+        tamanho_anterior = _tamanho_arquivo(caminho)
+        os.replace(temporario, caminho)
+
+        self.limite.registrar(caminho, tamanho_anterior)
+
+    def _remover(self, caminho):
+        remover_arquivo(caminho)
+
+    def limpar(self):
+        """Remove todas as entradas do cache"""
+        for _, _, caminho in self.limite.listar():
+            self._remover(caminho)
+        self.limite.esquecer()
@@ -0,0 +1,156 @@
+"""
+MÓDULO DO CLIENTE HTTP
+Sessão compartilhada (pool de conexões, keep-alive) para as APIs do OpenStreetMap,
+com novas tentativas, espera exponencial com jitter e troca de espelho
+"""
+from collections import deque
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import (TENTATIVAS_HTTP, ESPERA_BASE_SEGUNDOS, ESPERA_MAXIMA_SEGUNDOS,
+                             TAMANHO_POOL_HTTP)
+
+# Respostas que valem nova tentativa (limite de taxa e falhas do servidor)
+STATUS_REPETIR = {429, 500, 502, 503, 504}
+# Tentativas guardadas uma a uma (as mais recentes) e latências usadas no p95 de cada host;
+# os totais por host são contadores e não crescem com o número de requisições
+METRICAS_RECENTES = 1000
+
+class ErroHTTP(Exception):
+    """Falha definitiva de uma requisição (após esgotar as tentativas)"""
+
+class ClienteHTTP:
+    def __init__(self, headers, timeout, tentativas=TENTATIVAS_HTTP,
+                 espera_base=ESPERA_BASE_SEGUNDOS, espera_maxima=ESPERA_MAXIMA_SEGUNDOS,
+                 tamanho_pool=TAMANHO_POOL_HTTP, silencioso=False):
+        self.timeout = timeout
+        self.tentativas = max(1, tentativas)
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+
+        self.sessao = requests.Session()
+        self.sessao.headers.update(headers)
+        # As novas tentativas são feitas aqui, não pelo urllib3
+        adaptador = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool, max_retries=0)
+        self.sessao.mount('http://', adaptador)
+        self.sessao.mount('https://', adaptador)
+
+        self.metricas = deque(maxlen=METRICAS_RECENTES)
+        self._por_host = {}
+        self._trava = threading.Lock()
+        # Sem mensagens no console (novas tentativas e resumo das métricas)
+        self.silencioso = silencioso
+
+    def _exibir(self, *args, **kwargs):
+        if not self.silencioso:
+            print(*args, **kwargs)
+
+    def _espera(self, tentativa, resposta=None):
+        """Espera exponencial com jitter; respeita Retry-After (429/503) quando houver"""
+        espera = min(self.espera_maxima, self.espera_base * (2 ** tentativa))
+        espera *= random.uniform(0.5, 1.5)
+
+        if resposta is not None:
+            retry_after = resposta.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                espera = max(espera, float(retry_after))
+        return min(espera, self.espera_maxima)
+
+    def _registrar(self, url, status, inicio, bytes_recebidos, tentativa, erro=None):
+        host = urlparse(url).netloc
+        latencia = time.perf_counter() - inicio
+        with self._trava:
+            self.metricas.append({
+                'host': host,
+                'status': status,
+                'latencia_segundos': latencia,
+                'bytes': bytes_recebidos,
+                'tentativa': tentativa,
+                'erro': erro
+            })
+            totais = self._por_host.get(host)
+            if totais is None:
+                totais = self._por_host[host] = {
+                    'requisicoes': 0, 'erros': 0, 'bytes': 0, 'latencia_total': 0.0,
+                    'latencias': deque(maxlen=METRICAS_RECENTES)
+                }
+            totais['requisicoes'] += 1
+            totais['erros'] += status is None or status >= 400
+            totais['bytes'] += bytes_recebidos
+            totais['latencia_total'] += latencia
+            totais['latencias'].append(latencia)
+
+    def requisitar(self, metodo, urls, params=None, data=None, timeout=None, aguardar=None):
+        """
+        Executa a requisição e retorna a resposta (requests.Response)
+        urls pode ser uma lista de espelhos: cada nova tentativa usa o próximo
+        aguardar: chamada antes de cada tentativa (ex.: limite de taxa compartilhado)
+        """
+        if isinstance(urls, str):
+            urls = [urls]
+
+        ultimo_erro = None
+        for tentativa in range(self.tentativas):
+            url = urls[tentativa % len(urls)]
+            inicio = time.perf_counter()
+            resposta = None
+            if aguardar is not None:
+                aguardar()
+
+            try:
+                resposta = self.sessao.request(
+                    metodo, url, params=params, data=data, timeout=timeout or self.timeout
+                )
+                conteudo = resposta.content
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._registrar(url, None, inicio, 0, tentativa + 1, erro=type(e).__name__)
+                ultimo_erro = f"{urlparse(url).netloc}: {type(e).__name__}"
+            else:
+                self._registrar(url, resposta.status_code, inicio, len(conteudo), tentativa + 1)
+
+                if resposta.status_code < 400:
+                    return resposta
+                if resposta.status_code not in STATUS_REPETIR:
+                    resposta.raise_for_status()
+                ultimo_erro = f"{urlparse(url).netloc}: HTTP {resposta.status_code}"
+
+            if tentativa + 1 < self.tentativas:
+                espera = self._espera(tentativa, resposta)
+                self._exibir(f" Falha em {ultimo_erro}, nova tentativa em {espera:.1f}s")
+                time.sleep(espera)
+
+        raise ErroHTTP(f"{self.tentativas} tentativas sem sucesso (última: {ultimo_erro})")
+
+    def resumo_metricas(self):
+        """
+        Requisições, erros, latência (média/p95) e bytes por host
+        O p95 usa as METRICAS_RECENTES latências mais recentes do host
+        """
+        resumo = {}
+        with self._trava:
+            for host in sorted(self._por_host):
+                totais = self._por_host[host]
+                latencias = sorted(totais['latencias'])
+                resumo[host] = {
+                    'requisicoes': totais['requisicoes'],
+                    'erros': totais['erros'],
+                    'latencia_media_segundos': totais['latencia_total'] / totais['requisicoes'],
+                    'latencia_p95_segundos': latencias[min(len(latencias) - 1, int(len(latencias) * 0.95))],
+                    'bytes': totais['bytes']
+                }
+        return resumo
+
+    def imprimir_metricas(self):
+        resumo = self.resumo_metricas()
+        if not resumo:
+            return
+        self._exibir("Requisições HTTP:")
+        for host, dados in resumo.items():
+            self._exibir(f" {host}: {dados['requisicoes']} requisições, {dados['erros']} erros, "
+                  f"latência média {dados['latencia_media_segundos']:.2f}s "
+                  f"(p95 {dados['latencia_p95_segundos']:.2f}s), {dados['bytes'] / 1024:.0f} KB")
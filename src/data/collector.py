@@ -2,25 +2,114 @@
 MÓDULO DE COLETA DE DADOS REAIS
 Busca dados reais do OpenStreetMap para Montes Claros
 """
-import requests
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import networkx as nx
-from config.settings import CIDADE, NOMINATIM_URL, OVERPASS_URL, TIMEOUT, USER_AGENT
+from config.settings import (CIDADE, NOMINATIM_URL, OVERPASS_URL, OVERPASS_ESPELHOS, TIMEOUT, USER_AGENT,
+                             USAR_CACHE, MODO_OFFLINE, CONSULTA_ENXUTA, CONSTRUTOR_GRAFO,
+                             METODO_DISTANCIA, RECORTAR_POLIGONO, TAMANHO_TILE_GRAUS,
+                             TILES_PARALELOS, REQUISICOES_POR_SEGUNDO,
+                             SALVAR_SNAPSHOTS, USAR_SNAPSHOTS)
+from data.cache import CacheRespostas
+from data.cliente_http import ClienteHTTP
+from data.espacial import aneis_poligono, mascara_no_poligono, poligono_overpass
+from data.geodesia import calcular_distancias
+from data.grafo_arrays import ConstrutorGrafoArrays, iterar_elementos
+from data.snapshot import (carregar_snapshot, grafo_para_arrays, pasta_snapshot,
+                           salvar_snapshot)
+from utils.perfil import contar_grafo, perfilador
+from data.tiles import LimitadorTaxa, dividir_em_tiles, tiles_no_poligono
 
 class ColetorDados:
-    def __init__(self):
+    def __init__(self, silencioso=False):
         self.nominatim_url = NOMINATIM_URL
         self.overpass_url = OVERPASS_URL
+        # Espelhos do Overpass usados nas novas tentativas (o principal primeiro)
+        self.overpass_espelhos = [OVERPASS_URL] + [url for url in OVERPASS_ESPELHOS if url != OVERPASS_URL]
         self.timeout = TIMEOUT
-        self.headers = {'User-Agent': USER_AGENT}
+        self.headers = {'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, deflate'}
         self.cidade = CIDADE
+        self.usar_cache = USAR_CACHE
+        self.modo_offline = MODO_OFFLINE
+        self.cache = CacheRespostas(silencioso=silencioso)
+        self.consulta_enxuta = CONSULTA_ENXUTA
+        self.construtor_grafo = CONSTRUTOR_GRAFO
+        self.metodo_distancia = METODO_DISTANCIA
+        self.recortar_poligono = RECORTAR_POLIGONO
+        self.poligono_bairro = None
+        self.tamanho_tile = TAMANHO_TILE_GRAUS
+        self.tiles_paralelos = TILES_PARALELOS
+        self.requisicoes_por_segundo = REQUISICOES_POR_SEGUNDO
+        self.ultima_resposta = {'bytes': 0, 'bytes_rede': 0, 'do_cache': False}
+        self.cliente = ClienteHTTP(self.headers, self.timeout, silencioso=silencioso)
+        # Limite de taxa das requisições à rede (respostas do cache não esperam);
+        # pode ser compartilhado entre coletores (ex.: modo lote)
+        self.limitador = LimitadorTaxa(self.requisicoes_por_segundo)
+        self.lugar_encontrado = None
+        self.salvar_snapshots = SALVAR_SNAPSHOTS
+        self.usar_snapshots = USAR_SNAPSHOTS
+        self.ultimo_arrays = None
+        # Sem mensagens no console (ex.: downloads em threads do modo lote)
+        self.silencioso = silencioso
     
-    def buscar_coordenadas_bairro(self, nome_bairro):
-        """Converte nome do bairro em coordenadas (geocoding)"""
-        print(f"Buscando coordenadas para: {nome_bairro}")
+    def _exibir(self, *args, **kwargs):
+        if not self.silencioso:
+            print(*args, **kwargs)
+    
+    def _obter_conteudo(self, metodo, url, params=None, data=None, timeout=None, espelhos=None):
+        """
+        Retorna o corpo (bytes) da resposta, usando o cache em disco quando possível
+        No modo offline nunca acessa a rede
+        espelhos: URLs alternativas com os mesmos dados (a chave do cache usa só a url)
+        """
+        chave = self.cache.gerar_chave(metodo, url, params, data)
+        
+        if self.usar_cache or self.modo_offline:
+            conteudo = self.cache.obter(chave, ignorar_ttl=self.modo_offline)
+            if conteudo is not None:
+                self._exibir(" Resposta obtida do cache")
+                self.ultima_resposta = {'bytes': len(conteudo), 'bytes_rede': 0, 'do_cache': True}
+                return conteudo
+        
+        if self.modo_offline:
+            raise RuntimeError("modo offline ativo e resposta não encontrada no cache")
+        
+        # Cada tentativa do cliente (inclusive as novas tentativas) passa pelo limite de taxa
+        resposta = self.cliente.requisitar(
+            metodo,
+            espelhos or url,
+            params=params,
+            data=data,
+            timeout=timeout or self.timeout,
+            aguardar=self.limitador.aguardar
+        )
+        conteudo = resposta.content
+        # Content-Length é o tamanho transferido (comprimido, quando há gzip)
+        self.ultima_resposta = {
+            'bytes': len(conteudo),
+            'bytes_rede': int(resposta.headers.get('Content-Length', len(conteudo))),
+            'do_cache': False
+        }
+        
+        if self.usar_cache:
+            self.cache.salvar(chave, conteudo)
+        return conteudo
+    
+    @perfilador.medir('geocodificacao')
+    def buscar_coordenadas_bairro(self, nome_bairro=None):
+        """
+        Converte nome do bairro em coordenadas (geocoding)
+        Sem nome_bairro, busca a cidade inteira
+        """
+        consulta = f"{nome_bairro}, {self.cidade}" if nome_bairro else self.cidade
+        self._exibir(f"Buscando coordenadas para: {nome_bairro or self.cidade}")
+        self.poligono_bairro = None
+        self.lugar_encontrado = None
         
         """ Configurações do request """
         params = {
-            'q': f"{nome_bairro}, {self.cidade}",
+            'q': consulta,
             'format': 'json',
             'limit': 1,
             'polygon_geojson': 1
@@ -28,14 +117,8 @@ class ColetorDados:
         
         """ Try catch, para buscar os dados e capturar erros """
         try:
-            resposta = requests.get(
-                self.nominatim_url,
-                params=params,
-                headers=self.headers,
-                timeout=self.timeout
-            )
-            resposta.raise_for_status()
-            dados = resposta.json()
+            conteudo = self._obter_conteudo('GET', self.nominatim_url, params=params)
+            dados = json.loads(conteudo)
             
             if dados:
                 lugar = dados[0]
@@ -46,39 +129,63 @@ class ColetorDados:
                     float(lugar['boundingbox'][3])   # leste
                 ]
                 
-                print(f"Bairro encontrado: {lugar['display_name']}")
-                print(f"Bounding Box: {bbox}")
+                # Polígono real do bairro (GeoJSON), usado para recortar a malha
+                self.poligono_bairro = lugar.get('geojson')
+                self.lugar_encontrado = lugar
+                
+                self._exibir(f"Bairro encontrado: {lugar['display_name']}")
+                self._exibir(f"Bounding Box: {bbox}")
+                if aneis_poligono(self.poligono_bairro):
+                    self._exibir(f"Polígono do bairro: {self.poligono_bairro['type']}")
                 return bbox
             else:
-                print(" Bairro não encontrado no Nominatim")
+                self._exibir(" Bairro não encontrado no Nominatim")
                 return None
                 
         except Exception as e:
-            print(f" Erro na busca de coordenadas: {e}")
+            self._exibir(f" Erro na busca de coordenadas: {e}")
             return None
     
-    def buscar_dados_ruas(self, bbox):
-        """Busca dados das ruas usando Overpass API"""
-        print("  Buscando dados das ruas...")
+    def _montar_query_overpass(self, filtro_area, enxuta=None):
+        """
+        Monta a query Overpass QL para as vias de veículos dentro da área
+        enxuta=True retorna cada elemento uma única vez e os nós sem tags
+        """
+        if enxuta is None:
+            enxuta = self.consulta_enxuta
+        
+        if enxuta:
+            # Vias com tags e lista de nós; nós apenas com id/lat/lon
+            saida = """->.vias;
+        .vias out body qt;
+        node(w.vias);
+        out skel qt;"""
+        else:
+            # Saída original: todos os nós aparecem duas vezes (body + skel)
+            saida = """;
+        //Resultados unificados
+        (._;>;);
+        out body;
+        out skel qt;"""
         
         # Query Overpass QL - busca vias para veículos
-        overpass_query = f"""
+        return f"""
         [out:json][timeout:90];
         (
           // ==================== VIAS PRINCIPAIS ====================
           // Vias arteriais - Caminhões de lixo principais
           way["highway"~"primary|primary_link"]
-            ({bbox[0]},{bbox[2]},{bbox[1]},{bbox[3]});
+            ({filtro_area});
           
           // ==================== VIAS SECUNDÁRIAS ====================
           // Vias coletoras - Caminhões de coleta
           way["highway"~"secondary|secondary_link|tertiary|tertiary_link"]
-            ({bbox[0]},{bbox[2]},{bbox[1]},{bbox[3]});
+            ({filtro_area});
 
           // ==================== VIAS LOCAIS ====================
           // Ruas residenciais - caminhões menores
           way["highway"~"residential|unclassified|living_street"]
-            ({bbox[0]},{bbox[2]},{bbox[1]},{bbox[3]});
+            ({filtro_area});
 
           // ==================== VIAS DE SERVIÇO ====================
           // Apenas vias de serviço acessíveis para veículos
@@ -86,25 +193,88 @@ class ColetorDados:
           way["highway"="service"]
             ["service"!~"parking_aisle|driveway|alley|emergency_access"]
             ["access"!~"private|no|destination"]
-            ({bbox[0]},{bbox[2]},{bbox[1]},{bbox[3]});
-        );
-        //Resultados unificados
-        (._;>;);
-        out body;
-        out skel qt;
+            ({filtro_area});
+        ){saida}
+        """
+    
+    def _filtro_bbox(self, bbox):
+        return f"{bbox[0]},{bbox[2]},{bbox[1]},{bbox[3]}"
+    
+    def _baixar_overpass_bruto(self, overpass_query):
+        """Envia a query ao Overpass e retorna o corpo da resposta (bytes)"""
+        return self._obter_conteudo(
+            'POST',
+            self.overpass_url,
+            data={'data': overpass_query},
+            timeout=120,
+            espelhos=self.overpass_espelhos
+        )
+    
+    def _baixar_overpass(self, overpass_query):
+        """Envia a query ao Overpass e retorna (dados, estatísticas da resposta)"""
+        conteudo = self._baixar_overpass_bruto(overpass_query)
+        
+        inicio = time.perf_counter()
+        with perfilador.fase('parse_json', bytes=len(conteudo)) as registro:
+            dados = json.loads(conteudo)
+            registro['elementos'] = len(dados['elements'])
+        tempo_parse = time.perf_counter() - inicio
+        
+        estatisticas = dict(self.ultima_resposta)
+        estatisticas['tempo_parse_segundos'] = tempo_parse
+        estatisticas.update(self._contar_elementos(dados['elements']))
+        return dados, estatisticas
+    
+    def _contar_elementos(self, elementos):
+        nos = 0
+        vias = 0
+        ids = set()
+        for elemento in elementos:
+            if elemento['type'] == 'node':
+                nos += 1
+            elif elemento['type'] == 'way':
+                vias += 1
+            ids.add((elemento['type'], elemento['id']))
+        return {
+            'elementos': len(elementos),
+            'nos': nos,
+            'vias': vias,
+            'duplicados': len(elementos) - len(ids)
+        }
+    
+    def _imprimir_estatisticas(self, estatisticas):
+        origem = "cache" if estatisticas['do_cache'] else "rede"
+        self._exibir(f" Dados recebidos: {estatisticas['elementos']} elementos "
+              f"({estatisticas['nos']} nós, {estatisticas['vias']} vias, "
+              f"{estatisticas['duplicados']} duplicados)")
+        self._exibir(f" Tamanho: {estatisticas['bytes'] / 1024:.0f} KB "
+              f"({estatisticas['bytes_rede'] / 1024:.0f} KB transferidos, origem: {origem}), "
+              f"parse em {estatisticas['tempo_parse_segundos']:.3f}s")
+    
+    @perfilador.medir('download')
+    def buscar_dados_ruas(self, bbox, bruto=False, poligono=None):
+        """
+        Busca dados das ruas usando Overpass API
+        bruto=True retorna o corpo da resposta (bytes) sem carregar o JSON,
+        (o JSON é lido uma única vez, por construir_grafo_real)
+        poligono (GeoJSON) troca o filtro de bbox pelo filtro 'poly' do Overpass
         """
+        self._exibir("  Buscando dados das ruas...")
+        
+        filtro_area = poligono_overpass(poligono) if poligono else None
+        if filtro_area:
+            self._exibir(" Filtro de área: polígono do bairro")
+        overpass_query = self._montar_query_overpass(filtro_area or self._filtro_bbox(bbox))
         try:
-            """ Enviando a query ao Overpass API """
-            resposta = requests.post(
-                self.overpass_url,
-                data={'data': overpass_query},
-                headers=self.headers,
-                timeout=120
-            )
-            resposta.raise_for_status()
+            if bruto:
+                conteudo = self._baixar_overpass_bruto(overpass_query)
+                perfilador.contar(bytes=len(conteudo))
+                self._exibir(f" Dados recebidos: {len(conteudo) / 1024:.0f} KB")
+                return conteudo
             
-            dados = resposta.json()
-            print(f" Dados recebidos: {len(dados['elements'])} elementos")
+            """ Enviando a query ao Overpass API """
+            dados, estatisticas = self._baixar_overpass(overpass_query)
+            self._imprimir_estatisticas(estatisticas)
 
             # Análise dos tipos de vias encontradas
             if dados['elements']:
@@ -114,26 +284,202 @@ class ColetorDados:
                         tipo = elemento['tags'].get('highway', 'desconhecido')
                         tipos_vias[tipo] = tipos_vias.get(tipo, 0) + 1
                 
-                print("Tipos de vias encontradas:")
+                self._exibir("Tipos de vias encontradas:")
                 for tipo, quantidade in tipos_vias.items():
-                    print(f" {tipo}: {quantidade} vias")
+                    self._exibir(f" {tipo}: {quantidade} vias")
 
             return dados
             
         except Exception as e:
-            print(f" Erro ao buscar dados das ruas: {e}")
+            self._exibir(f" Erro ao buscar dados das ruas: {e}")
+            return None
+    
+    def precisa_tiles(self, bbox):
+        """Áreas maiores que um tile são baixadas em partes"""
+        return (bbox[1] - bbox[0]) > self.tamanho_tile or (bbox[3] - bbox[2]) > self.tamanho_tile
+    
+    def _baixar_tile(self, tile):
+        """Baixa um tile (as novas tentativas e a troca de espelho ficam no ClienteHTTP)"""
+        return self._baixar_overpass_bruto(self._montar_query_overpass(self._filtro_bbox(tile)))
+    
+    def buscar_dados_ruas_em_tiles(self, bbox, poligono=None):
+        """
+        Divide a área em tiles e baixa todos em paralelo (limite de taxa em _obter_conteudo)
+        Gera o conteúdo bruto de cada tile assim que ele chega
+        """
+        tiles = dividir_em_tiles(bbox, self.tamanho_tile)
+        total = len(tiles)
+        if poligono:
+            tiles = tiles_no_poligono(tiles, aneis_poligono(poligono))
+        self._exibir(f"  Buscando dados das ruas em {len(tiles)} tiles ({total - len(tiles)} fora do polígono), "
+              f"{self.tiles_paralelos} em paralelo...")
+        
+        inicio = time.perf_counter()
+        recebidos = 0
+        total_bytes = 0
+        
+        with ThreadPoolExecutor(max_workers=self.tiles_paralelos) as executor:
+            futuros = [executor.submit(self._baixar_tile, tile) for tile in tiles]
+            for futuro in as_completed(futuros):
+                try:
+                    conteudo = futuro.result()
+                except Exception:
+                    # Um tile esgotou as tentativas do cliente: cancela os que ainda não começaram
+                    for pendente in futuros:
+                        pendente.cancel()
+                    raise
+                recebidos += 1
+                total_bytes += len(conteudo)
+                self._exibir(f" Tile {recebidos}/{len(tiles)} recebido ({len(conteudo) / 1024:.0f} KB)")
+                yield conteudo
+        
+        self._exibir(f" {len(tiles)} tiles em {time.perf_counter() - inicio:.1f}s ({total_bytes / 1024:.0f} KB)")
+    
+    def comparar_consultas(self, bbox):
+        """
+        Baixa a mesma área com a consulta original e com a enxuta
+        e mostra a diferença de bytes, elementos e tempo de parse
+        """
+        self._exibir("Comparando consulta original x enxuta...")
+        
+        resultado = {}
+        for nome, enxuta in (('original', False), ('enxuta', True)):
+            overpass_query = self._montar_query_overpass(self._filtro_bbox(bbox), enxuta=enxuta)
+            try:
+                _, estatisticas = self._baixar_overpass(overpass_query)
+            except Exception as e:
+                self._exibir(f" Erro na consulta {nome}: {e}")
+                return None
+            self._exibir(f"Consulta {nome}:")
+            self._imprimir_estatisticas(estatisticas)
+            resultado[nome] = estatisticas
+        
+        original, enxuta = resultado['original'], resultado['enxuta']
+        if original['bytes'] > 0:
+            reducao = (1 - enxuta['bytes'] / original['bytes']) * 100
+            self._exibir(f"Redução de tamanho: {reducao:.1f}%")
+        self._exibir(f"Elementos: {original['elementos']} -> {enxuta['elementos']}")
+        self._exibir(f"Parse: {original['tempo_parse_segundos']:.3f}s -> {enxuta['tempo_parse_segundos']:.3f}s")
+        
+        return resultado
+    
+    @perfilador.medir('construcao_grafo', contagens=contar_grafo)
+    def construir_grafo_real(self, dados_overpass, poligono=None):
+        """
+        Constrói grafo NetworkX a partir de dados reais do Overpass
+        Aceita o dicionário da resposta ou o conteúdo bruto (bytes)
+        Com poligono (GeoJSON), mantém apenas os nós dentro do bairro
+        """
+        self.ultimo_arrays = None
+        if self.construtor_grafo == 'dicts':
+            if not isinstance(dados_overpass, dict):
+                # Uma ou várias respostas (tiles) unidas em um único dicionário
+                dados_overpass = {'elements': [
+                    elemento
+                    for fonte in self._fontes(dados_overpass)
+                    for elemento in iterar_elementos(fonte)
+                ]}
+            G = self._construir_grafo_dicts(dados_overpass)
+            if poligono:
+                G = self._recortar_grafo(G, poligono)
+            return G
+        
+        arrays = self.construir_arrays(dados_overpass)
+        if poligono:
+            arrays = self.recortar_arrays(arrays, poligono)
+        self.ultimo_arrays = arrays
+        G = arrays.para_networkx()
+        
+        self._exibir(f"Grafo construído: {len(G.nodes)} nós, {len(G.edges)} arestas")
+        return G
+    
+    def _fontes(self, dados_overpass):
+        """Uma resposta (dict/bytes) ou várias (lista/gerador de tiles)"""
+        if isinstance(dados_overpass, (dict, bytes, bytearray, str)):
+            return [dados_overpass]
+        return dados_overpass
+    
+    def construir_arrays(self, dados_overpass):
+        """
+        Lê os elementos em um único passe e retorna a malha em vetores (GrafoArrays)
+        Várias respostas (tiles) são unidas: nós e vias repetidos entram uma vez (id OSM)
+        """
+        self._exibir("Construindo grafo a partir de dados reais...")
+        
+        construtor = ConstrutorGrafoArrays()
+        for fonte in self._fontes(dados_overpass):
+            for elemento in iterar_elementos(fonte):
+                construtor.adicionar(elemento)
+        
+        self._exibir(f"   Processando {len(construtor.ids_nos)} nós...")
+        self._exibir(f"Processando {construtor.numero_elementos_vias} vias...")
+        if construtor.tipos_vias:
+            self._exibir("Tipos de vias encontradas:")
+            for tipo, quantidade in construtor.tipos_vias.items():
+                self._exibir(f" {tipo}: {quantidade} vias")
+        
+        arrays = construtor.finalizar()
+        arrays.comprimento = self._calcular_distancias(
+            arrays.lat[arrays.origem], arrays.lon[arrays.origem],
+            arrays.lat[arrays.destino], arrays.lon[arrays.destino]
+        )
+        
+        self._exibir(f"Ruas processadas: {construtor.ruas_processadas}")
+        return arrays
+    
+    def _mascara_poligono(self, lon, lat, poligono):
+        """Nós dentro do polígono (teste direto ou índice em grade, conforme a quantidade)"""
+        aneis = aneis_poligono(poligono)
+        if not aneis or len(lon) == 0:
             return None
+        return mascara_no_poligono(lon, lat, aneis)
+    
+    def _imprimir_recorte(self, nos_antes, arestas_antes, nos_depois, arestas_depois, tempo):
+        reducao_nos = (1 - nos_depois / nos_antes) * 100 if nos_antes > 0 else 0
+        reducao_arestas = (1 - arestas_depois / arestas_antes) * 100 if arestas_antes > 0 else 0
+        self._exibir(f"Recorte pelo polígono do bairro em {tempo:.3f}s:")
+        self._exibir(f"   Nós: {nos_antes} -> {nos_depois} (-{reducao_nos:.1f}%)")
+        self._exibir(f"   Arestas: {arestas_antes} -> {arestas_depois} (-{reducao_arestas:.1f}%)")
     
-    def construir_grafo_real(self, dados_overpass):
-        """Constrói grafo NetworkX a partir de dados reais do Overpass"""
-        print("Construindo grafo a partir de dados reais...")
+    def recortar_arrays(self, arrays, poligono):
+        """Recorta a malha em vetores pelo polígono (arestas com os dois nós dentro)"""
+        inicio = time.perf_counter()
+        mascara = self._mascara_poligono(arrays.lon, arrays.lat, poligono)
+        if mascara is None:
+            return arrays
+        
+        recortado = arrays.filtrar_nos(mascara)
+        self._imprimir_recorte(arrays.numero_nos, arrays.numero_arestas,
+                               recortado.numero_nos, recortado.numero_arestas,
+                               time.perf_counter() - inicio)
+        return recortado
+    
+    def _recortar_grafo(self, G, poligono):
+        """Recorta o grafo NetworkX pelo polígono (usado pelo construtor original)"""
+        inicio = time.perf_counter()
+        nos = list(G.nodes)
+        lon = [G.nodes[no]['x'] for no in nos]
+        lat = [G.nodes[no]['y'] for no in nos]
+        mascara = self._mascara_poligono(lon, lat, poligono)
+        if mascara is None:
+            return G
+        
+        nos_antes, arestas_antes = len(G.nodes), len(G.edges)
+        G.remove_nodes_from([no for no, dentro in zip(nos, mascara.tolist()) if not dentro])
+        self._imprimir_recorte(nos_antes, arestas_antes, len(G.nodes), len(G.edges),
+                               time.perf_counter() - inicio)
+        return G
+    
+    def _construir_grafo_dicts(self, dados_overpass):
+        """Construtor original: dicionário por nó e uma chamada G.add_edge por trecho"""
+        self._exibir("Construindo grafo a partir de dados reais...")
         
         G = nx.Graph()
         nodes_dict = {}
         
         # Fase 1: Processar nós (cruzamentos)
         elementos_nos = [e for e in dados_overpass['elements'] if e['type'] == 'node']
-        print(f"   Processando {len(elementos_nos)} nós...")
+        self._exibir(f"   Processando {len(elementos_nos)} nós...")
         
         for node in elementos_nos:
             nodes_dict[node['id']] = {
@@ -144,7 +490,7 @@ class ColetorDados:
         
         # Fase 2: Processar arestas (vias/ruas)
         elementos_ways = [e for e in dados_overpass['elements'] if e['type'] == 'way']
-        print(f"Processando {len(elementos_ways)} vias...")
+        self._exibir(f"Processando {len(elementos_ways)} vias...")
         
         ruas_processadas = 0
         
@@ -160,7 +506,7 @@ class ColetorDados:
                 node1, node2 = nodes_way[i], nodes_way[i + 1]
                 
                 if node1 in nodes_dict and node2 in nodes_dict:
-                    # Calcular distância aproximada em metros
+                    # Calcular distância em metros
                     lat1, lon1 = nodes_dict[node1]['lat'], nodes_dict[node1]['lon']
                     lat2, lon2 = nodes_dict[node2]['lat'], nodes_dict[node2]['lon']
                     
@@ -175,49 +521,172 @@ class ColetorDados:
                     )
                     ruas_processadas += 1
         
-        print(f"Grafo construído: {len(G.nodes)} nós, {len(G.edges)} arestas")
-        print(f"Ruas processadas: {ruas_processadas}")
+        self._exibir(f"Grafo construído: {len(G.nodes)} nós, {len(G.edges)} arestas")
+        self._exibir(f"Ruas processadas: {ruas_processadas}")
         
         return G
     
     def _calcular_distancia_aproximada(self, lat1, lon1, lat2, lon2):
-        """Calcula distância aproximada em metros entre coordenadas"""
-        # Fórmula simplificada - 1 grau ≈ 111km
-        delta_lat = (float(lat2) - float(lat1)) * 111320  # metros
-        delta_lon = (float(lon2) - float(lon1)) * 111320 * abs(float(lat1))  # ajuste por latitude
+        """Calcula distância em metros entre um par de coordenadas (usado pelo construtor original)"""
+        return float(calcular_distancias(
+            float(lat1), float(lon1), float(lat2), float(lon2), metodo=self.metodo_distancia
+        ))
+    
+    def _calcular_distancias(self, lat1, lon1, lat2, lon2):
+        """Calcula as distâncias de todas as arestas em uma única chamada vetorizada"""
+        return calcular_distancias(lat1, lon1, lat2, lon2, metodo=self.metodo_distancia)
+    
+    def listar_bairros_cidade(self):
+        """
+        Lista os nomes dos bairros da cidade (limites administrativos e
+        lugares 'suburb'/'neighbourhood' do OSM dentro da área da cidade)
+        """
+        self._exibir(f"Listando bairros de: {self.cidade}")
+        if not self.buscar_coordenadas_bairro(None) or not self.lugar_encontrado:
+            return []
+        
+        # Área do Overpass: 3600000000 + id da relação (2400000000 + id para ways)
+        tipo_osm = self.lugar_encontrado.get('osm_type')
+        base_area = {'relation': 3600000000, 'way': 2400000000}.get(tipo_osm)
+        if base_area is None:
+            self._exibir(" A cidade não tem limite (relation/way) no OSM")
+            return []
+        area = base_area + int(self.lugar_encontrado['osm_id'])
+        
+        overpass_query = f"""
+        [out:json][timeout:90];
+        area({area})->.cidade;
+        (
+          relation["boundary"="administrative"]["admin_level"~"^(9|10)$"](area.cidade);
+          nwr["place"~"^(suburb|neighbourhood|quarter)$"](area.cidade);
+        );
+        out tags;
+        """
+        try:
+            dados = json.loads(self._baixar_overpass_bruto(overpass_query))
+        except Exception as e:
+            self._exibir(f" Erro ao listar bairros: {e}")
+            return []
+        
+        bairros = sorted({
+            elemento['tags']['name']
+            for elemento in dados['elements']
+            if 'name' in elemento.get('tags', {})
+        })
+        self._exibir(f"Bairros encontrados: {len(bairros)}")
+        return bairros
+    
+    def _metadados_snapshot(self, nome_bairro):
+        """Configurações que mudam o grafo coletado (snapshot com outras é ignorado)"""
+        return {
+            'bairro': nome_bairro,
+            'cidade': self.cidade,
+            'recortar_poligono': self.recortar_poligono,
+            'metodo_distancia': self.metodo_distancia
+        }
+    
+    def salvar_grafo_snapshot(self, nome_bairro, grafo):
+        """Grava o grafo coletado em snapshot binário"""
+        arrays = self.ultimo_arrays if self.ultimo_arrays is not None else grafo_para_arrays(grafo)
+        pasta = pasta_snapshot(nome_bairro, 'coleta')
+        salvar_snapshot(arrays, pasta, self._metadados_snapshot(nome_bairro))
+        self._exibir(f"Snapshot salvo em: '{pasta}'")
+    
+    @perfilador.medir('snapshot', contagens=contar_grafo)
+    def carregar_grafo_snapshot(self, nome_bairro):
+        """
+        Recarrega (memória mapeada) o grafo coletado em vetores (GrafoArrays; a
+        preparação e a MST trabalham direto neles); None se não houver snapshot válido
+        """
+        inicio = time.perf_counter()
+        pasta = pasta_snapshot(nome_bairro, 'coleta')
+        arrays, metadados = carregar_snapshot(pasta)
+        if arrays is None or metadados != self._metadados_snapshot(nome_bairro):
+            return None
         
-        return (delta_lat**2 + delta_lon**2)**0.5
+        self.ultimo_arrays = arrays
+        self._exibir(f"Grafo carregado do snapshot '{pasta}' em {time.perf_counter() - inicio:.3f}s")
+        return arrays
+    
+    def obter_grafo_cidade(self):
+        """Obtém o grafo da cidade inteira (baixado em tiles)"""
+        return self.obter_grafo_bairro(None)
     
     def obter_grafo_bairro(self, nome_bairro):
         """
         Método principal: obtém grafo completo do bairro
-        Retorna grafo real ou None se não conseguir
+        Retorna grafo real (NetworkX) ou None se não conseguir
+        """
+        arrays = self._snapshot_bairro(nome_bairro)
+        if arrays is not None:
+            return arrays.para_networkx()
+        return self._coletar_grafo(nome_bairro)
+    
+    def obter_arrays_bairro(self, nome_bairro):
+        """
+        Obtém a malha do bairro em vetores (GrafoArrays), como obter_grafo_bairro
+        Vinda do snapshot, a malha não passa por NetworkX (preparação e MST em vetores)
+        Retorna None se não conseguir
         """
-        print(f"\n OBTENDO DADOS REAIS PARA: {nome_bairro}")
-        print("=" * 50)
+        arrays = self._snapshot_bairro(nome_bairro)
+        if arrays is not None:
+            return arrays
         
+        grafo = self._coletar_grafo(nome_bairro)
+        if grafo is None:
+            return None
+        return self.ultimo_arrays if self.ultimo_arrays is not None else grafo_para_arrays(grafo)
+    
+    def _snapshot_bairro(self, nome_bairro):
+        """Snapshot de uma execução anterior (sem rede e sem reconstruir), se USAR_SNAPSHOTS"""
+        self._exibir(f"\n OBTENDO DADOS REAIS PARA: {nome_bairro or self.cidade}")
+        self._exibir("=" * 50)
+        
+        if not self.usar_snapshots:
+            return None
+        arrays = self.carregar_grafo_snapshot(nome_bairro)
+        if arrays is None or arrays.numero_nos == 0:
+            return None
+        return arrays
+    
+    def _coletar_grafo(self, nome_bairro):
+        """Coleta (coordenadas, ruas) e construção do grafo NetworkX do bairro"""
         # 1. Buscar coordenadas do bairro
         bbox = self.buscar_coordenadas_bairro(nome_bairro)
         if not bbox:
-            print(" Não foi possível obter coordenadas do bairro")
+            self._exibir(" Não foi possível obter coordenadas do bairro")
             return None
         
-        # 2. Buscar dados das ruas
-        dados_ruas = self.buscar_dados_ruas(bbox)
-        if not dados_ruas or len(dados_ruas['elements']) == 0:
-            print(" Não foi possível obter dados das ruas")
+        poligono = self.poligono_bairro if self.recortar_poligono else None
+        
+        # 2. Buscar dados das ruas (bruto: o JSON só é lido pelo construtor)
+        if self.precisa_tiles(bbox):
+            # Área grande: tiles baixados em paralelo e unidos durante a construção
+            dados_ruas = self.buscar_dados_ruas_em_tiles(bbox, poligono=poligono)
+        else:
+            dados_ruas = self.buscar_dados_ruas(bbox, bruto=self.construtor_grafo != 'dicts', poligono=poligono)
+            if not dados_ruas or (isinstance(dados_ruas, dict) and len(dados_ruas['elements']) == 0):
+                self._exibir(" Não foi possível obter dados das ruas")
+                return None
+        
+        # 3. Construir grafo (recortado pelo polígono do bairro)
+        try:
+            grafo = self.construir_grafo_real(dados_ruas, poligono=poligono)
+        except Exception as e:
+            self._exibir(f" Erro ao construir o grafo: {e}")
             return None
         
-        # 3. Construir grafo
-        grafo = self.construir_grafo_real(dados_ruas)
+        self.cliente.imprimir_metricas()
         
         if grafo and len(grafo.nodes) > 0:
-            print(f"\n GRAFO REAL OBTIDO COM SUCESSO!")
-            print(f"   • Bairro: {nome_bairro}")
-            print(f"   • Cruzamentos: {len(grafo.nodes)}")
-            print(f"   • Trechos de rua: {len(grafo.edges)}")
-            print(f"   • Extensão total: {sum(data['length'] for _, _, data in grafo.edges(data=True)):.0f} metros")
+            self._exibir(f"\n GRAFO REAL OBTIDO COM SUCESSO!")
+            self._exibir(f"   • Bairro: {nome_bairro or self.cidade}")
+            self._exibir(f"   • Cruzamentos: {len(grafo.nodes)}")
+            self._exibir(f"   • Trechos de rua: {len(grafo.edges)}")
+            self._exibir(f"   • Extensão total: {sum(data['length'] for _, _, data in grafo.edges(data=True)):.0f} metros")
+            if self.salvar_snapshots:
+                self.salvar_grafo_snapshot(nome_bairro, grafo)
             return grafo
         else:
-            print(" Grafo vazio ou inválido")
+            self._exibir(" Grafo vazio ou inválido")
             return None
@@ -0,0 +1,180 @@
+"""
+MÓDULO DE RECORTE ESPACIAL
+Índice em grade sobre as coordenadas dos nós e recorte pelo polígono do bairro
+"""
+import numpy as np
+
+def aneis_poligono(geojson):
+    """
+    Extrai os anéis (externos e buracos) de um Polygon/MultiPolygon GeoJSON
+    Retorna lista de vetores Nx2 (lon, lat) ou lista vazia se não for polígono
+    """
+    if not geojson:
+        return []
+
+    tipo = geojson.get('type')
+    if tipo == 'Polygon':
+        poligonos = [geojson['coordinates']]
+    elif tipo == 'MultiPolygon':
+        poligonos = geojson['coordinates']
+    else:
+        return []
+
+    return [
+        np.asarray(anel, dtype=np.float64)[:, :2]
+        for poligono in poligonos
+        for anel in poligono
+        if len(anel) >= 3
+    ]
+
+# Abaixo disso o teste direto em todos os pontos é mais rápido que montar o índice em grade
+PONTOS_MINIMOS_INDICE = 10_000
+
+def poligono_overpass(geojson, pontos_maximos=1000):
+    """
+    Filtro 'poly:"lat lon ..."' do Overpass com o anel externo do polígono
+    Anéis com mais de pontos_maximos vértices usam a envoltória convexa (que
+    contém o polígono inteiro; o recorte local tira o excesso)
+    MultiPolygon, geometrias que não são polígonos e envoltórias ainda grandes
+    demais retornam None (usar bbox)
+    """
+    if not geojson or geojson.get('type') != 'Polygon':
+        return None
+
+    externo = np.asarray(geojson['coordinates'][0], dtype=np.float64)[:, :2]
+    if len(externo) > pontos_maximos:
+        from scipy.spatial import ConvexHull
+        externo = externo[ConvexHull(externo).vertices]
+        if len(externo) > pontos_maximos:
+            return None
+
+    coordenadas = " ".join(f"{lat:.7f} {lon:.7f}" for lon, lat in externo)
+    return f'poly:"{coordenadas}"'
+
+def pontos_dentro(x, y, aneis):
+    """
+    Teste ponto-no-polígono vetorizado (regra par-ímpar, trata buracos e multipolígonos)
+    x/y: vetores de longitude/latitude
+    """
+    dentro = np.zeros(len(x), dtype=bool)
+    for anel in aneis:
+        x1, y1 = anel[:, 0], anel[:, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+        for ax, ay, bx, by in zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist()):
+            if ay == by:
+                continue
+            cruza = (ay > y) != (by > y)
+            x_cruzamento = ax + (y - ay) * (bx - ax) / (by - ay)
+            dentro ^= cruza & (x < x_cruzamento)
+    return dentro
+
+def mascara_no_poligono(x, y, aneis):
+    """
+    Máscara dos pontos dentro do polígono: teste direto para poucos pontos,
+    índice em grade a partir de PONTOS_MINIMOS_INDICE
+    """
+    if len(x) < PONTOS_MINIMOS_INDICE:
+        return pontos_dentro(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), aneis)
+    return IndiceGrade(x, y).pontos_no_poligono(aneis)
+
+class IndiceGrade:
+    """
+    Índice espacial em grade regular sobre pontos (lon, lat)
+    Cada célula guarda os índices dos pontos que caem nela
+    """
+    def __init__(self, x, y, pontos_por_celula=16):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+
+        self.x_min, self.y_min = float(self.x.min()), float(self.y.min())
+        largura = max(float(self.x.max()) - self.x_min, 1e-9)
+        altura = max(float(self.y.max()) - self.y_min, 1e-9)
+
+        # Grade aproximadamente quadrada com ~pontos_por_celula pontos por célula
+        celulas = max(1, len(self.x) // pontos_por_celula)
+        self.tamanho_celula = max(np.sqrt(largura * altura / celulas), 1e-9)
+        self.colunas = int(largura // self.tamanho_celula) + 1
+        self.linhas = int(altura // self.tamanho_celula) + 1
+
+        self.celula = self._celula(self.x, self.y)
+        self.ordem = np.argsort(self.celula, kind='stable')
+        self.inicio = np.searchsorted(self.celula[self.ordem], np.arange(self.linhas * self.colunas + 1))
+
+    def _coluna_linha(self, x, y):
+        coluna = np.clip(((x - self.x_min) // self.tamanho_celula).astype(np.int64), 0, self.colunas - 1)
+        linha = np.clip(((y - self.y_min) // self.tamanho_celula).astype(np.int64), 0, self.linhas - 1)
+        return coluna, linha
+
+    def _celula(self, x, y):
+        coluna, linha = self._coluna_linha(x, y)
+        return linha * self.colunas + coluna
+
+    def pontos_da_celula(self, celula):
+        return self.ordem[self.inicio[celula]:self.inicio[celula + 1]]
+
+    def _celulas_de_borda(self, aneis):
+        """Células atravessadas pelo contorno do polígono (amostragem densa + vizinhas)"""
+        borda = np.zeros((self.linhas, self.colunas), dtype=bool)
+        passo = self.tamanho_celula / 2
+        for anel in aneis:
+            inicio, fim = anel, np.roll(anel, -1, axis=0)
+            comprimento = np.hypot(*(fim - inicio).T)
+            amostras = np.maximum(1, np.ceil(comprimento / passo).astype(np.int64))
+            fracao = np.concatenate([np.arange(n) / n for n in amostras.tolist()])
+            segmento = np.repeat(np.arange(len(anel)), amostras)
+            pontos = inicio[segmento] + (fim[segmento] - inicio[segmento]) * fracao[:, None]
+            coluna, linha = self._coluna_linha(pontos[:, 0], pontos[:, 1])
+            borda[linha, coluna] = True
+
+        # Inclui as vizinhas para não depender da precisão da amostragem
+        expandida = borda.copy()
+        expandida[1:, :] |= borda[:-1, :]
+        expandida[:-1, :] |= borda[1:, :]
+        expandida[:, 1:] |= borda[:, :-1]
+        expandida[:, :-1] |= borda[:, 1:]
+        return expandida.ravel()
+
+    def pontos_no_poligono(self, aneis):
+        """
+        Máscara dos pontos dentro do polígono
+        Células sem contorno são decididas pelo centro; só os pontos
+        das células de borda passam pelo teste ponto-no-polígono
+        """
+        if not aneis:
+            return np.zeros(len(self.x), dtype=bool)
+
+        borda = self._celulas_de_borda(aneis)
+        ocupadas = np.flatnonzero(np.diff(self.inicio) > 0)
+
+        internas = ocupadas[~borda[ocupadas]]
+        celula_dentro = np.zeros(len(borda), dtype=bool)
+        if len(internas):
+            centro_x = self.x_min + (internas % self.colunas + 0.5) * self.tamanho_celula
+            centro_y = self.y_min + (internas // self.colunas + 0.5) * self.tamanho_celula
+            celula_dentro[internas] = pontos_dentro(centro_x, centro_y, aneis)
+        mascara = celula_dentro[self.celula]
+
+        de_borda = ocupadas[borda[ocupadas]]
+        if len(de_borda):
+            indices = np.concatenate([self.pontos_da_celula(celula) for celula in de_borda.tolist()])
+            mascara[indices] = pontos_dentro(self.x[indices], self.y[indices], aneis)
+
+        return mascara
+
+def nos_mais_proximos(lon_nos, lat_nos, lon, lat):
+    """
+    Índice do nó mais próximo de cada ponto (lon, lat) e a distância até ele (metros)
+    KD-tree sobre as coordenadas projetadas (equiretangular, em metros)
+    """
+    from scipy.spatial import cKDTree
+    from data.geodesia import RAIO_TERRA_METROS
+
+    lon_nos, lat_nos = np.asarray(lon_nos, dtype=np.float64), np.asarray(lat_nos, dtype=np.float64)
+    escala = np.cos(np.radians(lat_nos.mean()))
+
+    def projetar(x, y):
+        return np.radians(np.column_stack([np.asarray(x, dtype=np.float64) * escala,
+                                           np.asarray(y, dtype=np.float64)])) * RAIO_TERRA_METROS
+
+    distancias, indices = cKDTree(projetar(lon_nos, lat_nos)).query(projetar(lon, lat))
+    return np.asarray(indices, dtype=np.int64), np.asarray(distancias, dtype=np.float64)
@@ -0,0 +1,38 @@
+"""
+MÓDULO DE DISTÂNCIAS GEODÉSICAS
+Comprimento de trechos de rua em metros, calculado em lote com NumPy
+"""
+import numpy as np
+
+RAIO_TERRA_METROS = 6371008.8 # Raio médio da Terra (IUGG)
+METODOS_DISTANCIA = ('haversine', 'equiretangular')
+
+def distancia_haversine(lat1, lon1, lat2, lon2):
+    """Distância de grande círculo (aceita escalares ou vetores, em graus)"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+
+    seno_lat = np.sin((lat2 - lat1) / 2)
+    seno_lon = np.sin((lon2 - lon1) / 2)
+    a = seno_lat**2 + np.cos(lat1) * np.cos(lat2) * seno_lon**2
+
+    return 2 * RAIO_TERRA_METROS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def distancia_equiretangular(lat1, lon1, lat2, lon2):
+    """
+    Aproximação plana: longitude escalada pelo cosseno da latitude média
+    Erro desprezível para trechos de rua (poucas centenas de metros)
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+
+    x = (lon2 - lon1) * np.cos((lat1 + lat2) / 2)
+    y = lat2 - lat1
+
+    return RAIO_TERRA_METROS * np.sqrt(x**2 + y**2)
+
+def calcular_distancias(lat1, lon1, lat2, lon2, metodo='haversine'):
+    """Calcula as distâncias (metros) de todos os pares em uma única chamada"""
+    if metodo == 'haversine':
+        return distancia_haversine(lat1, lon1, lat2, lon2)
+    if metodo == 'equiretangular':
+        return distancia_equiretangular(lat1, lon1, lat2, lon2)
+    raise ValueError(f"Método de distância desconhecido: '{metodo}' (use {', '.join(METODOS_DISTANCIA)})")
@@ -0,0 +1,347 @@
+"""
+MÓDULO DE GRAFO EM VETORES
+Representação compacta (NumPy) da malha viária lida do Overpass
+"""
+from array import array
+import json
+
+import numpy as np
+import networkx as nx
+
+
+def iterar_elementos(fonte):
+    """
+    Itera sobre os elementos de uma resposta do Overpass
+    Aceita o dicionário já carregado, o conteúdo bruto (bytes) ou um arquivo
+    """
+    if isinstance(fonte, dict):
+        return iter(fonte['elements'])
+
+    if hasattr(fonte, 'read'):
+        fonte = fonte.read()
+    return iter(json.loads(fonte)['elements'])
+
+
+def _posicoes_fatias(inicios, tamanhos):
+    """Posições de várias fatias [inicio, inicio + tamanho) concatenadas"""
+    deslocamento = np.repeat(inicios - (np.cumsum(tamanhos) - tamanhos), tamanhos)
+    return np.arange(int(tamanhos.sum()), dtype=np.int64) + deslocamento
+
+
+def como_networkx(grafo):
+    """Grafo NetworkX (convertido só quando recebe um GrafoArrays; o resto passa direto)"""
+    return grafo.para_networkx() if isinstance(grafo, GrafoArrays) else grafo
+
+
+def tamanho_grafo(grafo):
+    """(nós, arestas) de um grafo NetworkX ou GrafoArrays"""
+    if isinstance(grafo, GrafoArrays):
+        return grafo.numero_nos, grafo.numero_arestas
+    return len(grafo.nodes), len(grafo.edges)
+
+
+class GrafoArrays:
+    """
+    Malha viária em vetores:
+    - nós: ids (int64), lat/lon (float64)
+    - arestas: origem/destino (índices int32 nos vetores de nós), comprimento, via (int32)
+    - vias: osm_id, índice do nome e do tipo nas tabelas de strings (-1 = sem nome)
+    Opcionais (grafo preparado): pesos {atributo: vetor} e geometria das cadeias
+    contraídas {'inicio', 'ids', 'lat', 'lon', 'comprimentos'}, com 'inicio'
+    indexando os nós intermediários de cada aresta (n + 1 posições)
+    """
+    def __init__(self, ids, lat, lon, origem, destino, via,
+                 osm_vias, nome_vias, highway_vias, nomes, tipos, comprimento=None,
+                 pesos=None, geometria=None):
+        self.ids = ids
+        self.lat = lat
+        self.lon = lon
+        self.origem = origem
+        self.destino = destino
+        self.via = via
+        self.osm_vias = osm_vias
+        self.nome_vias = nome_vias
+        self.highway_vias = highway_vias
+        self.nomes = nomes
+        self.tipos = tipos
+        self.comprimento = comprimento
+        self.pesos = pesos or {}
+        self.geometria = geometria
+
+    @property
+    def numero_nos(self):
+        return len(self.ids)
+
+    @property
+    def numero_arestas(self):
+        return len(self.origem)
+
+    def pesos_arestas(self, peso):
+        """Vetor de pesos das arestas ('length' e o comprimento; NaN onde faltar)"""
+        if peso in self.pesos:
+            return self.pesos[peso]
+        if peso == 'length' and self.comprimento is not None:
+            return self.comprimento
+        return np.full(self.numero_arestas, np.nan)
+
+    def filtrar_nos(self, mascara):
+        """
+        Mantém apenas os nós marcados na máscara e as arestas entre eles
+        (as tabelas de vias e strings são compartilhadas)
+        """
+        novo_indice = np.full(len(mascara), -1, dtype=np.int64)
+        novo_indice[mascara] = np.arange(int(mascara.sum()))
+        manter = np.flatnonzero(mascara[self.origem] & mascara[self.destino])
+
+        return self._com_arestas(
+            self.ids[mascara], self.lat[mascara], self.lon[mascara], manter,
+            novo_indice[self.origem[manter]].astype(np.int32),
+            novo_indice[self.destino[manter]].astype(np.int32)
+        )
+
+    def filtrar_arestas(self, indices):
+        """Mesmos nós, apenas as arestas indicadas (ex.: as da árvore geradora mínima)"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return self._com_arestas(self.ids, self.lat, self.lon, indices,
+                                 self.origem[indices], self.destino[indices])
+
+    def _com_arestas(self, ids, lat, lon, indices, origem, destino):
+        """Novo GrafoArrays com as arestas indicadas (pesos e geometria junto)"""
+        return GrafoArrays(
+            ids=ids,
+            lat=lat,
+            lon=lon,
+            origem=origem,
+            destino=destino,
+            via=self.via[indices],
+            osm_vias=self.osm_vias,
+            nome_vias=self.nome_vias,
+            highway_vias=self.highway_vias,
+            nomes=self.nomes,
+            tipos=self.tipos,
+            comprimento=self.comprimento[indices] if self.comprimento is not None else None,
+            pesos={atributo: valores[indices] for atributo, valores in self.pesos.items()},
+            geometria=self._geometria_arestas(indices)
+        )
+
+    def _geometria_arestas(self, indices):
+        """Geometria das cadeias contraídas só das arestas indicadas"""
+        if self.geometria is None:
+            return None
+        inicio = self.geometria['inicio']
+        a = inicio[indices]
+        tamanhos = inicio[indices + 1] - a
+        intermediarios = _posicoes_fatias(a, tamanhos)
+        # Cada aresta tem (intermediários + 1) trechos: deslocamento de 'aresta' posições
+        trechos = _posicoes_fatias(a + indices, tamanhos + 1)
+
+        return {
+            'inicio': np.concatenate(([0], np.cumsum(tamanhos))).astype(np.int64),
+            'ids': self.geometria['ids'][intermediarios],
+            'lat': self.geometria['lat'][intermediarios],
+            'lon': self.geometria['lon'][intermediarios],
+            'comprimentos': self.geometria['comprimentos'][trechos]
+        }
+
+    def nomes_das_vias(self):
+        """Nome de cada via, com o mesmo padrão 'Via_<id>' do construtor original"""
+        return [
+            self.nomes[indice] if indice >= 0 else f'Via_{osm_id}'
+            for indice, osm_id in zip(self.nome_vias.tolist(), self.osm_vias.tolist())
+        ]
+
+    def tipos_das_vias(self):
+        return [
+            self.tipos[indice] if indice >= 0 else 'desconhecido'
+            for indice in self.highway_vias.tolist()
+        ]
+
+    def para_networkx(self):
+        """Converte os vetores em grafo NetworkX (mesmos atributos do construtor original)"""
+        G = nx.Graph()
+
+        ids = self.ids.tolist()
+        G.add_nodes_from(
+            (no, {'y': y, 'x': x})
+            for no, y, x in zip(ids, self.lat.tolist(), self.lon.tolist())
+        )
+
+        nomes = self.nomes_das_vias()
+        tipos = self.tipos_das_vias()
+        osm_ids = self.osm_vias.tolist()
+        comprimentos = self.comprimento.tolist() if self.comprimento is not None else [None] * self.numero_arestas
+
+        G.add_edges_from(
+            (ids[u], ids[v], {
+                'length': comprimento,
+                'name': nomes[w],
+                'highway': tipos[w],
+                'osm_id': osm_ids[w]
+            })
+            for u, v, w, comprimento in zip(
+                self.origem.tolist(), self.destino.tolist(), self.via.tolist(), comprimentos
+            )
+        )
+
+        for atributo, valores in self.pesos.items():
+            for u, v, valor in zip(self.origem.tolist(), self.destino.tolist(), valores.tolist()):
+                G[ids[u]][ids[v]][atributo] = valor
+
+        if self.geometria is not None:
+            self._restaurar_geometria(G, ids)
+        return G
+
+    def _restaurar_geometria(self, G, ids):
+        """Devolve às arestas contraídas os atributos usados por models.simplificacao"""
+        inicio = self.geometria['inicio'].tolist()
+        ids_intermediarios = self.geometria['ids'].tolist()
+        lat = self.geometria['lat'].tolist()
+        lon = self.geometria['lon'].tolist()
+        comprimentos = self.geometria['comprimentos'].tolist()
+
+        for aresta, (u, v) in enumerate(zip(self.origem.tolist(), self.destino.tolist())):
+            a, b = inicio[aresta], inicio[aresta + 1]
+            if a == b:
+                continue
+            # Cada aresta tem (intermediários + 1) trechos: deslocamento de 'aresta' posições
+            G[ids[u]][ids[v]].update({
+                'origem': ids[u],
+                'nos_intermediarios': ids_intermediarios[a:b],
+                'coordenadas': list(zip(lon[a:b], lat[a:b])),
+                'comprimentos': comprimentos[a + aresta:b + aresta + 1]
+            })
+
+
+class ConstrutorGrafoArrays:
+    """
+    Lê os elementos do Overpass em um único passe, sem guardar dicionários por nó,
+    e gera um GrafoArrays no final (a ordem nós/vias na resposta não importa)
+    """
+    def __init__(self):
+        self.ids_nos = array('q')
+        self.lat = array('d')
+        self.lon = array('d')
+
+        # Nós de todas as vias concatenados + quantidade de nós de cada via
+        self.refs = array('q')
+        self.tamanho_vias = array('q')
+        self.osm_vias = array('q')
+        self.nome_vias = array('i')
+        self.highway_vias = array('i')
+
+        # Tabelas de strings internadas (nome da rua e tipo de via)
+        self.nomes = []
+        self.tipos = []
+        self._indice_nomes = {}
+        self._indice_tipos = {}
+
+        self.numero_elementos_vias = 0
+        self.tipos_vias = {}
+        # Vias repetidas (ex.: a mesma via em tiles vizinhos) entram uma única vez
+        self._vias_vistas = set()
+
+    def _internar(self, valor, tabela, indice):
+        if valor is None:
+            return -1
+        posicao = indice.get(valor)
+        if posicao is None:
+            posicao = len(tabela)
+            indice[valor] = posicao
+            tabela.append(valor)
+        return posicao
+
+    def adicionar(self, elemento):
+        tipo = elemento['type']
+
+        if tipo == 'node':
+            self.ids_nos.append(elemento['id'])
+            self.lat.append(float(elemento['lat']))
+            self.lon.append(float(elemento['lon']))
+
+        elif tipo == 'way':
+            self.numero_elementos_vias += 1
+            tags = elemento.get('tags')
+            if tags is None or elemento['id'] in self._vias_vistas:
+                return
+            self._vias_vistas.add(elemento['id'])
+
+            nos = elemento['nodes']
+            self.refs.extend(nos)
+            self.tamanho_vias.append(len(nos))
+            self.osm_vias.append(elemento['id'])
+            self.nome_vias.append(self._internar(tags.get('name'), self.nomes, self._indice_nomes))
+            self.highway_vias.append(self._internar(tags.get('highway'), self.tipos, self._indice_tipos))
+
+            tipo_via = tags.get('highway', 'desconhecido')
+            self.tipos_vias[tipo_via] = self.tipos_vias.get(tipo_via, 0) + 1
+
+    def finalizar(self):
+        """Resolve as referências das vias e gera as arestas"""
+        ids = np.array(self.ids_nos, dtype=np.int64)
+        lat = np.array(self.lat, dtype=np.float64)
+        lon = np.array(self.lon, dtype=np.float64)
+
+        # Nós repetidos (ex.: 'out body' + 'out skel'): mantém a primeira ocorrência
+        _, primeiros = np.unique(ids, return_index=True)
+        if len(primeiros) != len(ids):
+            primeiros.sort()
+            ids, lat, lon = ids[primeiros], lat[primeiros], lon[primeiros]
+
+        ordem = np.argsort(ids, kind='stable')
+        ids_ordenados = ids[ordem]
+
+        refs = np.array(self.refs, dtype=np.int64)
+        tamanhos = np.array(self.tamanho_vias, dtype=np.int64)
+        numero_vias = len(tamanhos)
+
+        origem = destino = via = np.empty(0, dtype=np.int64)
+        self.ruas_processadas = 0
+
+        if len(refs) >= 2 and len(ids) > 0:
+            # Pares de nós consecutivos, descartando os que cruzam o fim de uma via
+            valido = np.ones(len(refs) - 1, dtype=bool)
+            fim_vias = np.cumsum(tamanhos) - 1
+            valido[fim_vias[(fim_vias >= 0) & (fim_vias < len(refs) - 1)]] = False
+            via_de_cada_ref = np.repeat(np.arange(numero_vias, dtype=np.int64), tamanhos)
+
+            u_ref = refs[:-1][valido]
+            v_ref = refs[1:][valido]
+            via = via_de_cada_ref[:-1][valido]
+
+            # Converte ids OSM em índices; pares com nó ausente são ignorados
+            pos_u = np.minimum(np.searchsorted(ids_ordenados, u_ref), len(ids) - 1)
+            pos_v = np.minimum(np.searchsorted(ids_ordenados, v_ref), len(ids) - 1)
+            existe = (ids_ordenados[pos_u] == u_ref) & (ids_ordenados[pos_v] == v_ref)
+
+            origem = ordem[pos_u[existe]]
+            destino = ordem[pos_v[existe]]
+            via = via[existe]
+            self.ruas_processadas = int(existe.sum())
+
+            # Arestas repetidas: posição da primeira ocorrência, atributos da última
+            # (mesmo resultado de chamadas sucessivas a G.add_edge)
+            menor = np.minimum(origem, destino)
+            maior = np.maximum(origem, destino)
+            chave = menor * len(ids) + maior
+            _, primeira = np.unique(chave, return_index=True)
+            if len(primeira) != len(chave):
+                _, ultima_invertida = np.unique(chave[::-1], return_index=True)
+                ultima = len(chave) - 1 - ultima_invertida
+                posicao = np.argsort(primeira, kind='stable')
+                origem = origem[primeira[posicao]]
+                destino = destino[primeira[posicao]]
+                via = via[ultima[posicao]]
+
+        return GrafoArrays(
+            ids=ids,
+            lat=lat,
+            lon=lon,
+            origem=origem.astype(np.int32),
+            destino=destino.astype(np.int32),
+            via=via.astype(np.int32),
+            osm_vias=np.array(self.osm_vias, dtype=np.int64),
+            nome_vias=np.array(self.nome_vias, dtype=np.int32),
+            highway_vias=np.array(self.highway_vias, dtype=np.int32),
+            nomes=self.nomes,
+            tipos=self.tipos
+        )
@@ -0,0 +1,190 @@
+"""
+MÓDULO DE SNAPSHOTS DO GRAFO
+Formato binário versionado (vetores NumPy .npy + manifesto JSON) para
+recarregar o grafo entre as fases sem refazer a coleta e a construção;
+a leitura usa memória mapeada (np.load com mmap_mode)
+"""
+import json
+import os
+import re
+import shutil
+import time
+
+import numpy as np
+
+from config.settings import PASTA_SNAPSHOTS
+from data.grafo_arrays import GrafoArrays
+
+VERSAO_SNAPSHOT = 1
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+CAMPOS_VETORES = ('ids', 'lat', 'lon', 'origem', 'destino', 'via', 'comprimento',
+                  'osm_vias', 'nome_vias', 'highway_vias')
+
+def pasta_snapshot(nome, fase, pasta_base=PASTA_SNAPSHOTS):
+    """Pasta do snapshot de uma fase ('coleta', 'preparado', 'arvore') de um bairro"""
+    nome_seguro = re.sub(r'[^\w-]+', '_', nome or 'cidade').strip('_') or 'cidade'
+    return os.path.join(pasta_base, nome_seguro, fase)
+
+def grafo_para_arrays(grafo, peso=None):
+    """
+    Converte um grafo NetworkX (coletado ou preparado) em GrafoArrays
+    Guarda também o atributo de peso (se diferente de 'length') e a
+    geometria das cadeias contraídas por models.simplificacao
+    Um GrafoArrays (preparado ou árvore em vetores) é devolvido como está
+    """
+    if isinstance(grafo, GrafoArrays):
+        return grafo
+
+    nos = list(grafo.nodes)
+    indice = {no: i for i, no in enumerate(nos)}
+    dados_nos = grafo.nodes
+
+    ids = np.array(nos, dtype=np.int64)
+    lat = np.array([dados_nos[no].get('y', np.nan) for no in nos], dtype=np.float64)
+    lon = np.array([dados_nos[no].get('x', np.nan) for no in nos], dtype=np.float64)
+
+    numero_arestas = grafo.number_of_edges()
+    origem = np.empty(numero_arestas, dtype=np.int32)
+    destino = np.empty(numero_arestas, dtype=np.int32)
+    via = np.empty(numero_arestas, dtype=np.int32)
+    comprimento = np.empty(numero_arestas, dtype=np.float64)
+    valores_peso = np.empty(numero_arestas, dtype=np.float64) if peso and peso != 'length' else None
+
+    # Vias internadas por (osm_id, nome, tipo)
+    vias, osm_vias, nome_vias, highway_vias = {}, [], [], []
+    nomes, tipos, indice_nomes, indice_tipos = [], [], {}, {}
+
+    def internar(valor, tabela, indice_tabela):
+        if valor not in indice_tabela:
+            indice_tabela[valor] = len(tabela)
+            tabela.append(valor)
+        return indice_tabela[valor]
+
+    geometria_inicio = [0]
+    geometria_ids, geometria_lat, geometria_lon, geometria_comprimentos = [], [], [], []
+    tem_geometria = False
+
+    for k, (u, v, data) in enumerate(grafo.edges(data=True)):
+        # Arestas contraídas são gravadas no sentido da sua geometria
+        if data.get('origem') == v:
+            u, v = v, u
+        origem[k], destino[k] = indice[u], indice[v]
+        comprimento[k] = data.get('length', np.nan)
+        if valores_peso is not None:
+            valores_peso[k] = data.get(peso, np.nan)
+
+        chave = (data.get('osm_id', -1), data.get('name'), data.get('highway'))
+        if chave not in vias:
+            vias[chave] = len(osm_vias)
+            osm_vias.append(chave[0] if isinstance(chave[0], int) else -1)
+            nome_vias.append(internar(chave[1], nomes, indice_nomes) if chave[1] is not None else -1)
+            highway_vias.append(internar(chave[2], tipos, indice_tipos) if chave[2] is not None else -1)
+        via[k] = vias[chave]
+
+        intermediarios = data.get('nos_intermediarios', ())
+        if intermediarios:
+            tem_geometria = True
+            geometria_ids.extend(intermediarios)
+            geometria_lon.extend(x for x, _ in data['coordenadas'])
+            geometria_lat.extend(y for _, y in data['coordenadas'])
+            geometria_comprimentos.extend(data['comprimentos'])
+        else:
+            geometria_comprimentos.append(comprimento[k])
+        geometria_inicio.append(len(geometria_ids))
+
+    geometria = None
+    if tem_geometria:
+        geometria = {
+            'inicio': np.array(geometria_inicio, dtype=np.int64),
+            'ids': np.array(geometria_ids, dtype=np.int64),
+            'lat': np.array(geometria_lat, dtype=np.float64),
+            'lon': np.array(geometria_lon, dtype=np.float64),
+            'comprimentos': np.array(geometria_comprimentos, dtype=np.float64)
+        }
+
+    return GrafoArrays(
+        ids=ids, lat=lat, lon=lon,
+        origem=origem, destino=destino, via=via,
+        osm_vias=np.array(osm_vias, dtype=np.int64),
+        nome_vias=np.array(nome_vias, dtype=np.int32),
+        highway_vias=np.array(highway_vias, dtype=np.int32),
+        nomes=nomes, tipos=tipos,
+        comprimento=comprimento,
+        pesos={peso: valores_peso} if valores_peso is not None else None,
+        geometria=geometria
+    )
+
+def salvar_snapshot(arrays, pasta, metadados=None):
+    """Grava o GrafoArrays na pasta (substitui de forma atômica um snapshot anterior)"""
+    temporaria = f"{pasta}.tmp{os.getpid()}"
+    shutil.rmtree(temporaria, ignore_errors=True)
+    os.makedirs(temporaria)
+
+    vetores = {campo: getattr(arrays, campo) for campo in CAMPOS_VETORES if getattr(arrays, campo) is not None}
+    for atributo, valores in arrays.pesos.items():
+        vetores[f'peso__{atributo}'] = valores
+    for campo, valores in (arrays.geometria or {}).items():
+        vetores[f'geometria__{campo}'] = valores
+
+    for campo, valores in vetores.items():
+        np.save(os.path.join(temporaria, f"{campo}.npy"), np.ascontiguousarray(valores))
+
+    manifesto = {
+        'versao': VERSAO_SNAPSHOT,
+        'criado_em': time.time(),
+        'numero_nos': int(arrays.numero_nos),
+        'numero_arestas': int(arrays.numero_arestas),
+        'vetores': sorted(vetores),
+        'nomes': arrays.nomes,
+        'tipos': arrays.tipos,
+        'metadados': metadados or {}
+    }
+    with open(os.path.join(temporaria, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False)
+
+    shutil.rmtree(pasta, ignore_errors=True)
+    os.makedirs(os.path.dirname(pasta) or '.', exist_ok=True)
+    os.replace(temporaria, pasta)
+
+def ler_manifesto(pasta):
+    """Manifesto do snapshot, ou None se não existir ou for de outra versão"""
+    caminho = os.path.join(pasta, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding='utf-8') as arquivo:
+        manifesto = json.load(arquivo)
+    if manifesto.get('versao') != VERSAO_SNAPSHOT:
+        return None
+    return manifesto
+
+def carregar_snapshot(pasta, mmap=True):
+    """
+    Recarrega o GrafoArrays; com mmap=True os vetores são mapeados
+    em memória (somente leitura) em vez de copiados
+    Retorna (arrays, metadados) ou (None, None)
+    """
+    manifesto = ler_manifesto(pasta)
+    if manifesto is None:
+        return None, None
+
+    modo = 'r' if mmap else None
+    vetores = {
+        campo: np.load(os.path.join(pasta, f"{campo}.npy"), mmap_mode=modo)
+        for campo in manifesto['vetores']
+    }
+
+    pesos = {campo[len('peso__'):]: valores for campo, valores in vetores.items() if campo.startswith('peso__')}
+    geometria = {
+        campo[len('geometria__'):]: valores
+        for campo, valores in vetores.items() if campo.startswith('geometria__')
+    }
+
+    arrays = GrafoArrays(
+        **{campo: vetores.get(campo) for campo in CAMPOS_VETORES},
+        nomes=manifesto['nomes'],
+        tipos=manifesto['tipos'],
+        pesos=pesos or None,
+        geometria=geometria or None
+    )
+    return arrays, manifesto['metadados']
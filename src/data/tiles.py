@@ -0,0 +1,74 @@
+"""
+MÓDULO DE TILES
+Divide áreas grandes (cidade inteira) em tiles para consultas paralelas ao Overpass
+"""
+import math
+import threading
+import time
+
+import numpy as np
+
+from data.espacial import pontos_dentro
+
+def dividir_em_tiles(bbox, tamanho_graus):
+    """Divide a bbox [sul, norte, oeste, leste] em tiles de até tamanho_graus de lado"""
+    sul, norte, oeste, leste = bbox
+    linhas = max(1, math.ceil((norte - sul) / tamanho_graus))
+    colunas = max(1, math.ceil((leste - oeste) / tamanho_graus))
+    altura = (norte - sul) / linhas
+    largura = (leste - oeste) / colunas
+
+    return [
+        [sul + i * altura, sul + (i + 1) * altura, oeste + j * largura, oeste + (j + 1) * largura]
+        for i in range(linhas)
+        for j in range(colunas)
+    ]
+
+def tiles_no_poligono(tiles, aneis):
+    """
+    Mantém só os tiles que tocam o polígono: centro dentro dele
+    ou algum ponto do contorno (amostrado) dentro do tile
+    """
+    if not aneis or not tiles:
+        return tiles
+
+    passo = min(min(n - s, l - o) for s, n, o, l in tiles) / 4
+    amostras = []
+    for anel in aneis:
+        inicio, fim = anel, np.roll(anel, -1, axis=0)
+        quantidade = np.maximum(1, np.ceil(np.hypot(*(fim - inicio).T) / passo).astype(np.int64))
+        fracao = np.concatenate([np.arange(n) / n for n in quantidade.tolist()])
+        segmento = np.repeat(np.arange(len(anel)), quantidade)
+        amostras.append(inicio[segmento] + (fim[segmento] - inicio[segmento]) * fracao[:, None])
+    contorno = np.concatenate(amostras)
+
+    tiles_array = np.asarray(tiles, dtype=np.float64)
+    centro_x = (tiles_array[:, 2] + tiles_array[:, 3]) / 2
+    centro_y = (tiles_array[:, 0] + tiles_array[:, 1]) / 2
+    dentro = pontos_dentro(centro_x, centro_y, aneis)
+
+    selecionados = []
+    for tile, centro_dentro in zip(tiles, dentro.tolist()):
+        sul, norte, oeste, leste = tile
+        toca_contorno = np.any(
+            (contorno[:, 0] >= oeste) & (contorno[:, 0] <= leste)
+            & (contorno[:, 1] >= sul) & (contorno[:, 1] <= norte)
+        )
+        if centro_dentro or toca_contorno:
+            selecionados.append(tile)
+    return selecionados
+
+class LimitadorTaxa:
+    """Espaça as requisições de várias threads para no máximo N por segundo"""
+    def __init__(self, requisicoes_por_segundo):
+        self.intervalo = 1.0 / requisicoes_por_segundo if requisicoes_por_segundo > 0 else 0.0
+        self.proxima = time.monotonic()
+        self.trava = threading.Lock()
+
+    def aguardar(self):
+        with self.trava:
+            agora = time.monotonic()
+            espera = self.proxima - agora
+            self.proxima = max(agora, self.proxima) + self.intervalo
+        if espera > 0:
+            time.sleep(espera)
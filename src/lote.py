@@ -0,0 +1,207 @@
+"""
+MODO LOTE - VÁRIOS BAIRROS POR EXECUÇÃO
+Baixa os dados de vários bairros (compartilhando sessão e limite de taxa)
+e processa cada um (grafo, otimização, mapa e relatório) em um pool de processos
+
+Uso:
+    python lote.py "Ibituruna" "Centro"     # bairros informados
+    python lote.py                          # BAIRROS_LOTE ou todos os bairros da cidade
+    python lote.py --cidade --processos 8
+"""
+import os
+
+# Sem janela: os processos só salvam os mapas (plt.show não bloqueia)
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import argparse
+import contextlib
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from data.collector import ColetorDados
+from config.settings import (CIDADE, BAIRROS_LOTE, PROCESSOS_LOTE, DOWNLOADS_LOTE,
+                             PASTA_RESULTADOS, PASTA_LOTE, NOME_METRICAS_LOTE)
+
+# Os processos do pool não são criados por fork: o fork copiaria o processo principal
+# com as threads de download em andamento (travas do HTTP/urllib3 podem ficar presas)
+METODO_PROCESSOS = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+def _nome_pasta(nome_bairro):
+    return re.sub(r'[^\w-]+', '_', nome_bairro).strip('_') or 'bairro'
+
+def baixar_bairro(nome_bairro, cliente, limitador):
+    """
+    Fase de coleta (no processo principal): coordenadas, polígono e conteúdo bruto das ruas
+    Sessão HTTP e limite de taxa são compartilhados entre todos os bairros
+    """
+    # Silencioso em vez de redirecionar sys.stdout, que é do processo inteiro (e não da thread)
+    coletor = ColetorDados(silencioso=True)
+    coletor.cliente = cliente
+    coletor.limitador = limitador
+
+    bbox = coletor.buscar_coordenadas_bairro(nome_bairro)
+    if not bbox:
+        raise RuntimeError("coordenadas do bairro não encontradas")
+
+    poligono = coletor.poligono_bairro if coletor.recortar_poligono else None
+    if coletor.precisa_tiles(bbox):
+        conteudo = list(coletor.buscar_dados_ruas_em_tiles(bbox, poligono=poligono))
+    else:
+        conteudo = coletor.buscar_dados_ruas(bbox, bruto=True, poligono=poligono)
+    if not conteudo:
+        raise RuntimeError("dados das ruas não encontrados")
+
+    return conteudo, poligono
+
+def processar_bairro(nome_bairro, conteudo, poligono, pasta, configuracao=None):
+    """
+    Fase de processamento (em um processo do pool): grafo, otimização (árvore, carteiro
+    ou distritos, conforme a configuração), mapa e relatórios
+    A saída de texto vai para o log.txt do bairro
+    configuracao: atributos do OtimizadorRotas trocados antes de otimizar (ex.: {'modo': 'carteiro'})
+    """
+    from data.grafo_arrays import como_networkx
+    from models.optimizer import OtimizadorRotas
+    from utils.perfil import perfilador
+    from utils.visualizer import Visualizador
+
+    os.makedirs(pasta, exist_ok=True)
+    inicio = time.perf_counter()
+    # Processos do pool são reutilizados: cada bairro começa um perfil novo
+    perfilador.limpar()
+
+    with open(os.path.join(pasta, 'log.txt'), 'w', encoding='utf-8') as log, \
+            contextlib.redirect_stdout(log):
+        coletor = ColetorDados()
+        grafo = coletor.construir_grafo_real(conteudo, poligono=poligono)
+        if len(grafo.nodes) == 0:
+            raise RuntimeError("grafo vazio")
+
+        otimizador = OtimizadorRotas()
+        for atributo, valor in (configuracao or {}).items():
+            setattr(otimizador, atributo, valor)
+        grafo_preparado = otimizador.preparar_grafo(grafo)
+        # Mesmos modos do main: distritos, carteiro ou árvore
+        if otimizador.caminhoes > 1:
+            distritos, rota, metricas = otimizador.calcular_rotas_distritos(grafo_preparado)
+        elif otimizador.modo == 'carteiro':
+            rota, metricas = otimizador.calcular_rota_carteiro(grafo_preparado)
+        else:
+            rota, metricas = otimizador.calcular_rota_otimizada(grafo_preparado)
+        if not rota:
+            raise RuntimeError("falha na otimização")
+
+        visualizador = Visualizador(pasta_resultados=pasta)
+        grafo_preparado, rota = como_networkx(grafo_preparado), como_networkx(rota)
+        if otimizador.caminhoes > 1:
+            visualizador.criar_mapa_distritos(grafo_preparado, distritos, rota, metricas, nome_bairro)
+            visualizador.gerar_relatorio_distritos(distritos, rota, metricas, nome_bairro)
+        elif otimizador.modo == 'carteiro':
+            visualizador.criar_mapa_rota(grafo_preparado, rota, metricas, nome_bairro)
+            visualizador.gerar_relatorio_rota(grafo_preparado, rota, nome_bairro)
+        else:
+            visualizador.criar_mapa_comparativo(grafo_preparado, rota, metricas, nome_bairro)
+            visualizador.gerar_relatorio_ruas(rota, nome_bairro)
+        visualizador.gerar_relatorio_execucao(metricas, nome_bairro)
+        perfilador.salvar(pasta, metadados={'bairro': nome_bairro})
+
+    # Uma linha por bairro na tabela: as métricas por caminhão ficam no distritos.csv do bairro
+    metricas = {chave: valor for chave, valor in metricas.items() if chave != 'caminhoes'}
+    metricas['tempo_processamento_segundos'] = time.perf_counter() - inicio
+    return metricas
+
+def executar_lote(bairros, processos=None, downloads=DOWNLOADS_LOTE, configuracao=None):
+    """
+    Baixa os bairros em paralelo (limitado) e envia cada um ao pool de processos
+    assim que seus dados chegam; retorna a tabela consolidada (DataFrame)
+    configuracao: repassada a processar_bairro em cada processo
+    """
+    import pandas as pd
+
+    processos = processos or PROCESSOS_LOTE or os.cpu_count() or 1
+    # Caminho absoluto: a pasta de trabalho dos processos do pool pode ser outra
+    pasta_lote = os.path.abspath(os.path.join(PASTA_RESULTADOS, PASTA_LOTE))
+    os.makedirs(pasta_lote, exist_ok=True)
+
+    print(f"MODO LOTE: {len(bairros)} bairros, {processos} processos, {downloads} downloads simultâneos")
+    print("=" * 60)
+
+    coletor = ColetorDados()
+    inicio = time.perf_counter()
+    resultados = []
+
+    contexto = multiprocessing.get_context(METODO_PROCESSOS)
+    with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as pool_processos, \
+            ThreadPoolExecutor(max_workers=downloads) as pool_downloads:
+        downloads_futuros = {
+            pool_downloads.submit(baixar_bairro, bairro, coletor.cliente, coletor.limitador): bairro
+            for bairro in bairros
+        }
+        processamentos = {}
+
+        for futuro in as_completed(downloads_futuros):
+            bairro = downloads_futuros[futuro]
+            try:
+                conteudo, poligono = futuro.result()
+            except Exception as e:
+                print(f" [ERRO] {bairro}: coleta falhou ({e})")
+                resultados.append({'bairro': bairro, 'status': f'erro na coleta: {e}'})
+                continue
+
+            print(f" [COLETA] {bairro}")
+            pasta = os.path.join(pasta_lote, _nome_pasta(bairro))
+            processamentos[pool_processos.submit(processar_bairro, bairro, conteudo, poligono, pasta,
+                                                  configuracao)] = bairro
+
+        for futuro in as_completed(processamentos):
+            bairro = processamentos[futuro]
+            try:
+                metricas = futuro.result()
+            except Exception as e:
+                print(f" [ERRO] {bairro}: processamento falhou ({e})")
+                resultados.append({'bairro': bairro, 'status': f'erro no processamento: {e}'})
+                continue
+
+            # Extensão das ruas e tempo existem em todos os modos (árvore, carteiro, distritos)
+            print(f" [OK] {bairro}: {metricas['comprimento_total_metros'] / 1000:.1f}km de ruas "
+                  f"em {metricas['tempo_processamento_segundos']:.1f}s")
+            resultados.append({'bairro': bairro, 'status': 'ok', **metricas})
+
+    tempo_total = time.perf_counter() - inicio
+
+    df = pd.DataFrame(resultados).sort_values('bairro')
+    caminho = os.path.join(pasta_lote, NOME_METRICAS_LOTE)
+    df.to_csv(caminho, index=False, encoding='utf-8')
+
+    sucesso = int((df['status'] == 'ok').sum())
+    print("=" * 60)
+    print(f"LOTE CONCLUÍDO: {sucesso}/{len(bairros)} bairros em {tempo_total:.1f}s")
+    if 'tempo_processamento_segundos' in df:
+        soma = df['tempo_processamento_segundos'].sum()
+        print(f"Tempo de processamento somado: {soma:.1f}s (paralelismo efetivo {soma / tempo_total:.1f}x)")
+    print(f"Métricas consolidadas: '{caminho}'")
+    coletor.cliente.imprimir_metricas()
+
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description="Otimização de rotas para vários bairros")
+    parser.add_argument('bairros', nargs='*', help="Bairros a processar (padrão: BAIRROS_LOTE)")
+    parser.add_argument('--cidade', action='store_true', help=f"Processa todos os bairros de {CIDADE}")
+    parser.add_argument('--processos', type=int, default=None, help="Processos do pool (padrão: núcleos)")
+    parser.add_argument('--downloads', type=int, default=DOWNLOADS_LOTE, help="Downloads simultâneos")
+    args = parser.parse_args()
+
+    bairros = args.bairros or ([] if args.cidade else list(BAIRROS_LOTE))
+    if not bairros:
+        bairros = ColetorDados().listar_bairros_cidade()
+    if not bairros:
+        print(" Nenhum bairro para processar. Encerrando.")
+        return
+
+    executar_lote(bairros, processos=args.processos, downloads=args.downloads)
+
+if __name__ == "__main__":
+    main()
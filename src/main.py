@@ -1,13 +1,21 @@
 """
 SISTEMA COMPLETO DE OTIMIZAÇÃO DE ROTAS - MONTES CLAROS
 Script principal que orquestra todo o processo
+
+Uso:
+    python main.py
+    python main.py --medir-memoria      # pico de memória por fase (tracemalloc)
 """
+import argparse
+
 from data.collector import ColetorDados
+from data.grafo_arrays import como_networkx
 from models.optimizer import OtimizadorRotas
 from utils.visualizer import Visualizador
-from config.settings import BAIRRO_FOCO, CIDADE
+from utils.perfil import perfilador
+from config.settings import BAIRRO_FOCO, CIDADE, PASTA_RESULTADOS
 
-def main():
+def executar():
     print(" SISTEMA DE OTIMIZAÇÃO DE ROTAS DE COLETA")
     print("=" * 60)
     print(f" FOCO: {BAIRRO_FOCO} - {CIDADE}")
@@ -18,41 +26,104 @@ def main():
     print("-" * 40)
     
     coletor = ColetorDados()
-    grafo_original = coletor.obter_grafo_bairro(BAIRRO_FOCO)
+    otimizador = OtimizadorRotas()
+    
+    with perfilador.fase('coleta'):
+        # Atualização incremental: estado da execução anterior, lido antes da nova coleta
+        estado_anterior = otimizador.carregar_estado_anterior(BAIRRO_FOCO)
+        
+        # Snapshot do grafo preparado (USAR_SNAPSHOTS): pula coleta e preparação
+        grafo_preparado = None
+        if estado_anterior is None:
+            grafo_preparado = otimizador.carregar_grafo_preparado(BAIRRO_FOCO)
+        
+        if grafo_preparado is None:
+            # Em vetores: a preparação (e a atualização incremental) parte direto deles
+            grafo_original = coletor.obter_arrays_bairro(BAIRRO_FOCO)
     
-    if not grafo_original:
+    if grafo_preparado is None and grafo_original is None:
         print(" Não foi possível obter dados reais. Encerrando.")
-        return
+        return False
     
     # PASSO 2: Otimizar rotas
     print("\n2️⃣  FASE 2: OTIMIZAÇÃO DE ROTAS")
     print("-" * 40)
     
-    otimizador = OtimizadorRotas()
-    grafo_preparado = otimizador.preparar_grafo(grafo_original)
-    arvore_otimizada, metricas = otimizador.calcular_rota_otimizada(grafo_preparado)
+    alteracoes = None
+    with perfilador.fase('otimizacao'):
+        if estado_anterior is not None:
+            # Só as ruas que mudaram desde a execução anterior (sem recalcular a árvore)
+            resultado = otimizador.atualizar_rota_incremental(estado_anterior, grafo_original, BAIRRO_FOCO)
+            if resultado is not None:
+                grafo_preparado, rota, metricas, alteracoes = resultado
+        
+        if alteracoes is None:
+            if grafo_preparado is None:
+                grafo_preparado = otimizador.preparar_grafo(grafo_original, nome_snapshot=BAIRRO_FOCO)
+            if otimizador.caminhoes > 1:
+                # Um distrito por caminhão, otimizados em paralelo
+                distritos, rota, metricas = otimizador.calcular_rotas_distritos(grafo_preparado)
+            elif otimizador.modo == 'carteiro':
+                rota, metricas = otimizador.calcular_rota_carteiro(grafo_preparado)
+            else:
+                rota, metricas = otimizador.calcular_rota_otimizada(grafo_preparado)
+                otimizador.salvar_arvore(rota, BAIRRO_FOCO)
     
-    if not arvore_otimizada:
+    if not rota:
         print(" Falha na otimização. Encerrando.")
-        return
+        return False
     
     # PASSO 3: Visualizar resultados
     print("\n FASE 3: VISUALIZAÇÃO DE RESULTADOS")
     print("-" * 40)
     
-    visualizador = Visualizador()
-    
-    # Gerar mapa comparativo
-    visualizador.criar_mapa_comparativo(grafo_preparado, arvore_otimizada, metricas, BAIRRO_FOCO)
-    
-    # Gerar relatório de ruas
-    visualizador.gerar_relatorio_ruas(arvore_otimizada, BAIRRO_FOCO)
+    with perfilador.fase('visualizacao'):
+        visualizador = Visualizador()
+        if alteracoes is None:
+            # Vindos dos snapshots, grafo e árvore ficam em vetores até aqui: NetworkX só para mapa e relatórios
+            grafo_preparado, rota = como_networkx(grafo_preparado), como_networkx(rota)
+        
+        if alteracoes is not None:
+            # Atualização incremental: só as ruas alteradas (o mapa não é redesenhado)
+            visualizador.gerar_relatorio_alteracoes(alteracoes, BAIRRO_FOCO)
+        elif otimizador.caminhoes > 1:
+            # Mapa e relatórios com uma cor/coluna por caminhão
+            visualizador.criar_mapa_distritos(grafo_preparado, distritos, rota, metricas, BAIRRO_FOCO)
+            visualizador.gerar_relatorio_distritos(distritos, rota, metricas, BAIRRO_FOCO)
+        elif otimizador.modo == 'carteiro':
+            # Mapa e sequência da rota que percorre todas as ruas
+            visualizador.criar_mapa_rota(grafo_preparado, rota, metricas, BAIRRO_FOCO)
+            visualizador.gerar_relatorio_rota(grafo_preparado, rota, BAIRRO_FOCO)
+        else:
+            # Gerar mapa comparativo
+            visualizador.criar_mapa_comparativo(grafo_preparado, rota, metricas, BAIRRO_FOCO)
+            
+            # Gerar relatório de ruas
+            visualizador.gerar_relatorio_ruas(rota, BAIRRO_FOCO)
     
     # Relatório final
     visualizador.gerar_relatorio_execucao(metricas, BAIRRO_FOCO)
     
     print("\n PROJETO CONCLUÍDO COM SUCESSO!")
     print(" Verifique os arquivos na pasta 'resultados/'")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Otimização das rotas de coleta de {BAIRRO_FOCO}")
+    parser.add_argument('--medir-memoria', action='store_true',
+                        help="Pico de memória por fase no perfil (tracemalloc; deixa a execução mais lenta)")
+    argumentos = parser.parse_args()
+    if argumentos.medir_memoria:
+        perfilador.memoria = True
+    
+    # Métricas das fases (e cProfile, se ativado) gravadas mesmo quando a execução falha
+    with perfilador.cprofile(PASTA_RESULTADOS):
+        try:
+            with perfilador.fase('total'):
+                executar()
+        finally:
+            perfilador.imprimir_resumo()
+            perfilador.salvar(PASTA_RESULTADOS, metadados={'bairro': BAIRRO_FOCO, 'cidade': CIDADE})
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""
+MODULO DO CARTEIRO CHINES (ROTA DE COLETA)
+Rota fechada que percorre todas as ruas do grafo preparado: os nos de grau impar
+sao emparelhados por caminhos minimos (trechos percorridos sem coletar) e o
+multigrafo resultante e percorrido por um circuito euleriano
+
+Para escalar a grafos de cidade, nao ha caminhos minimos entre todos os pares nem
+emparelhamento exato: cada rodada roda um unico Dijkstra multi-fonte (limitado por
+raio) a partir dos nos impares livres, os pares candidatos sao os vizinhos nas
+fronteiras das regioes de Voronoi e o emparelhamento e guloso, com caminhos
+aumentantes curtos e trocas de pares (2-opt) opcionais
+"""
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from models.preparacao import vetores_arestas
+
+def nos_impares(numero_nos, origem, destino):
+    """Indices dos nos de grau impar (lacos contam 2 e nao mudam a paridade)"""
+    grau = (np.bincount(origem, minlength=numero_nos)
+            + np.bincount(destino, minlength=numero_nos))
+    return np.flatnonzero(grau % 2)
+
+def _pares_candidatos(origem, destino, pesos, distancia, fonte):
+    """
+    Pares (a, b, custo, aresta) de fontes vizinhas: para cada aresta u-v com
+    fontes diferentes, custo = dist(a, u) + peso(u, v) + dist(v, b)
+    Fica so a aresta de fronteira mais barata de cada par, em ordem de custo
+    """
+    fonte_u, fonte_v = fonte[origem], fonte[destino]
+    arestas = np.flatnonzero((fonte_u >= 0) & (fonte_v >= 0) & (fonte_u != fonte_v))
+    if len(arestas) == 0:
+        return arestas, arestas, np.empty(0), arestas
+
+    a = np.minimum(fonte_u[arestas], fonte_v[arestas])
+    b = np.maximum(fonte_u[arestas], fonte_v[arestas])
+    custo = distancia[origem[arestas]] + pesos[arestas] + distancia[destino[arestas]]
+
+    ordem = np.lexsort((custo, b, a))
+    a, b, custo, arestas = a[ordem], b[ordem], custo[ordem], arestas[ordem]
+    primeiro = np.ones(len(a), dtype=bool)
+    primeiro[1:] = (a[1:] != a[:-1]) | (b[1:] != b[:-1])
+    a, b, custo, arestas = a[primeiro], b[primeiro], custo[primeiro], arestas[primeiro]
+
+    ordem = np.argsort(custo, kind='stable')
+    return a[ordem], b[ordem], custo[ordem], arestas[ordem]
+
+def _emparelhar_guloso(a, b, custo, melhorias, profundidade):
+    """
+    Emparelhamento guloso por custo crescente. Os nos que ficam sem par tentam um
+    caminho aumentante curto (ate 'profundidade' pares refeitos) e depois ate
+    'melhorias' passadas trocam (x-y, z-w) por (x-z, y-w) quando os dois novos pares
+    sao candidatos e ficam mais baratos
+    Retorna ({no: par}, {no: custo do seu par}); nos sem par nao aparecem
+    """
+    par, custo_par = {}, {}
+    for x, y, c in zip(a.tolist(), b.tolist(), custo.tolist()):
+        if x not in par and y not in par:
+            par[x], par[y] = y, x
+            custo_par[x] = custo_par[y] = c
+
+    candidatos = {(x, y): c for x, y, c in zip(a.tolist(), b.tolist(), custo.tolist())}
+    if profundidade > 0:
+        vizinhos = {}
+        for (x, y), c in candidatos.items():
+            vizinhos.setdefault(x, []).append((y, c))
+            vizinhos.setdefault(y, []).append((x, c))
+        for livre in list(vizinhos):
+            if livre not in par:
+                _aumentar(livre, par, custo_par, vizinhos, profundidade)
+
+    for _ in range(melhorias):
+        trocas = 0
+        for (x, z), custo_xz in candidatos.items():
+            y, w = par.get(x), par.get(z)
+            if y is None or w is None or y == z:
+                continue
+            custo_yw = candidatos.get((min(y, w), max(y, w)))
+            if custo_yw is None or custo_xz + custo_yw >= custo_par[x] + custo_par[z] - 1e-9:
+                continue
+            par[x], par[z], par[y], par[w] = z, x, w, y
+            custo_par[x] = custo_par[z] = custo_xz
+            custo_par[y] = custo_par[w] = custo_yw
+            trocas += 1
+        if not trocas:
+            break
+    return par, custo_par
+
+def _aumentar(livre, par, custo_par, vizinhos, profundidade):
+    """
+    Busca em camadas o caminho alternante mais barato de 'livre' ate outro no sem par
+    (livre - z1 = w1 - z2 = w2 ... - y, com zi = wi pares atuais) e inverte os pares
+    Custo do caminho = soma dos pares novos - soma dos pares desfeitos
+    """
+    frente = {livre: 0.0}
+    chegada = {livre: None}
+    melhor = None
+    for _ in range(profundidade + 1):
+        proxima = {}
+        for no, acumulado in frente.items():
+            for vizinho, c in vizinhos[no]:
+                if vizinho in chegada or vizinho == par.get(no):
+                    continue
+                if vizinho not in par:
+                    if melhor is None or acumulado + c < melhor[0]:
+                        melhor = (acumulado + c, no, vizinho, c)
+                    continue
+                parceiro = par[vizinho]
+                if parceiro in chegada:
+                    continue
+                novo = acumulado + c - custo_par[vizinho]
+                if parceiro not in proxima or novo < proxima[parceiro][0]:
+                    proxima[parceiro] = (novo, no, vizinho, c)
+        if not proxima:
+            break
+        frente = {}
+        for parceiro, (novo, no, vizinho, c) in proxima.items():
+            # O mesmo par pode ter sido alcancado pelas duas pontas; fica a primeira
+            if vizinho in chegada:
+                continue
+            chegada[vizinho] = chegada[parceiro] = (no, vizinho, c)
+            frente[parceiro] = novo
+
+    if melhor is None:
+        return
+    _, no, fim, c = melhor
+    while True:
+        par[no], par[fim] = fim, no
+        custo_par[no] = custo_par[fim] = c
+        if chegada[no] is None:
+            return
+        no, fim, c = chegada[no]
+
+def _caminho_ate_fonte(no, predecessor, trechos):
+    """Acrescenta em 'trechos' os pares (anterior, no) do caminho de volta ate a fonte"""
+    while predecessor[no] >= 0:
+        trechos.append((predecessor[no], no))
+        no = predecessor[no]
+
+def emparelhar_impares(numero_nos, origem, destino, pesos, impares, raio=0.0, melhorias=0,
+                       profundidade=0):
+    """
+    Emparelha os nos impares por caminhos curtos, em rodadas de Dijkstra multi-fonte
+    raio > 0 limita a busca da primeira rodada (metros); o limite dobra a cada rodada
+    profundidade e melhorias trocam tempo por qualidade (ver _emparelhar_guloso)
+    Retorna (trechos repetidos como pares de nos, custo total, rodadas, pares candidatos)
+    """
+    sem_laco = origem != destino
+    matriz = coo_matrix((pesos[sem_laco], (origem[sem_laco], destino[sem_laco])),
+                        shape=(numero_nos, numero_nos)).tocsr()
+
+    livres = np.asarray(impares, dtype=np.int64)
+    limite = raio if raio > 0 else np.inf
+    trechos, custo_total, rodadas, total_candidatos = [], 0.0, 0, 0
+
+    while len(livres):
+        distancia, predecessor, fonte = dijkstra(matriz, directed=False, indices=livres,
+                                                 limit=limite, min_only=True,
+                                                 return_predecessors=True)
+        rodadas += 1
+        a, b, custo, arestas = _pares_candidatos(origem, destino, pesos, distancia, fonte)
+        if len(a) == 0:
+            if np.isinf(limite):
+                raise ValueError("nos de grau impar sem caminho entre si (grafo desconexo)")
+            limite *= 2
+            continue
+        total_candidatos += len(a)
+
+        par, _ = _emparelhar_guloso(a, b, custo, melhorias, profundidade)
+        fronteira = {(x, y): (c, k) for x, y, c, k in
+                     zip(a.tolist(), b.tolist(), custo.tolist(), arestas.tolist())}
+        predecessor = predecessor.tolist()
+        for x, y in par.items():
+            if x > y:
+                continue
+            c, k = fronteira[(x, y)]
+            u, v = int(origem[k]), int(destino[k])
+            if fonte[u] != x:
+                u, v = v, u
+            _caminho_ate_fonte(u, predecessor, trechos)
+            trechos.append((u, v))
+            _caminho_ate_fonte(v, predecessor, trechos)
+            custo_total += c
+
+        livres = livres[~np.isin(livres, np.fromiter(par, dtype=np.int64, count=len(par)))]
+        limite *= 2
+
+    return trechos, custo_total, rodadas, total_candidatos
+
+def _indices_arestas(numero_nos, origem, destino, trechos):
+    """Indice da aresta (grafo simples) de cada trecho (u, v), por busca binaria"""
+    chaves = np.minimum(origem, destino) * numero_nos + np.maximum(origem, destino)
+    ordem = np.argsort(chaves)
+    pares = np.array(trechos, dtype=np.int64).reshape(-1, 2)
+    procuradas = np.minimum(pares[:, 0], pares[:, 1]) * numero_nos + np.maximum(pares[:, 0], pares[:, 1])
+    return ordem[np.searchsorted(chaves, procuradas, sorter=ordem)]
+
+def circuito_euleriano(numero_nos, origem, destino, copias, inicio=0):
+    """
+    Circuito euleriano (Hierholzer iterativo) sobre as copias de arestas
+    copias[c] = indice da aresta original percorrida pela copia c
+    Retorna a lista de passos (de, para, aresta) na ordem do percurso
+    """
+    u, v = origem[copias], destino[copias]
+    extremos = np.concatenate([u, v])
+    vizinhos = np.concatenate([v, u])
+    copia_lado = np.concatenate([np.arange(len(copias)), np.arange(len(copias))])
+
+    ordem = np.argsort(extremos, kind='stable')
+    vizinhos, copia_lado = vizinhos[ordem].tolist(), copia_lado[ordem].tolist()
+    fim = np.cumsum(np.bincount(extremos, minlength=numero_nos))
+    ponteiro = np.concatenate([[0], fim[:-1]]).tolist()
+    fim = fim.tolist()
+    copias = copias.tolist()
+
+    usada = [False] * len(copias)
+    pilha_nos, pilha_copias, passos = [inicio], [-1], []
+    while pilha_nos:
+        no = pilha_nos[-1]
+        p = ponteiro[no]
+        while p < fim[no] and usada[copia_lado[p]]:
+            p += 1
+        ponteiro[no] = p
+        if p == fim[no]:
+            pilha_nos.pop()
+            c = pilha_copias.pop()
+            if c >= 0:
+                passos.append((pilha_nos[-1], no, copias[c]))
+        else:
+            usada[copia_lado[p]] = True
+            ponteiro[no] = p + 1
+            pilha_nos.append(vizinhos[p])
+            pilha_copias.append(copia_lado[p])
+
+    passos.reverse()
+    return passos
+
+def rota_carteiro(grafo, peso, raio=0.0, melhorias=0, profundidade=0, inicio=None):
+    """
+    Rota fechada que percorre todas as arestas do grafo (conexo, nao direcionado)
+    Retorna (rota, resumo): rota e a lista de passos (de, para, coleta), em que
+    coleta=False marca as passagens repetidas (deslocamento sem coletar)
+    """
+    nos, origem, destino, pesos = vetores_arestas(grafo, peso)
+    resumo = {'comprimento_ruas': float(pesos.sum()), 'deslocamento_vazio': 0.0,
+              'nos_impares': 0, 'rodadas': 0, 'pares_candidatos': 0}
+    if len(origem) == 0:
+        return [], resumo
+
+    impares = nos_impares(len(nos), origem, destino)
+    trechos, custo, rodadas, candidatos = emparelhar_impares(
+        len(nos), origem, destino, pesos, impares, raio, melhorias, profundidade)
+
+    repetidas = _indices_arestas(len(nos), origem, destino, trechos) if trechos else np.empty(0, dtype=np.int64)
+    copias = np.concatenate([np.arange(len(origem)), repetidas])
+
+    no_inicial = nos.index(inicio) if inicio is not None else int(origem[0])
+    passos = circuito_euleriano(len(nos), origem, destino, copias, no_inicial)
+
+    coletada = [False] * len(origem)
+    rota = []
+    for de, para, k in passos:
+        rota.append((nos[de], nos[para], not coletada[k]))
+        coletada[k] = True
+
+    resumo.update({'deslocamento_vazio': float(pesos[repetidas].sum()),
+                   'nos_impares': len(impares), 'rodadas': rodadas,
+                   'pares_candidatos': candidatos})
+    return rota, resumo
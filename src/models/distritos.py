@@ -0,0 +1,131 @@
+"""
+MODULO DE DIVISAO EM DISTRITOS (VARIOS CAMINHOES)
+Divide o grafo preparado em k distritos conexos com extensao de ruas equilibrada:
+cada distrito cresce a partir da sua garagem (ou de uma semente espalhada pela
+malha) como uma bola de Dijkstra, e a cada passo cresce o distrito mais leve
+"""
+import heapq
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from data.espacial import nos_mais_proximos
+from models.preparacao import componentes_union_find, vetores_arestas
+
+def indices_garagens(grafo, nos, garagens):
+    """Indice (em 'nos') do no mais proximo de cada garagem (lat, lon)"""
+    indices, _ = nos_mais_proximos([grafo.nodes[no]['x'] for no in nos],
+                                   [grafo.nodes[no]['y'] for no in nos],
+                                   [lon for _, lon in garagens], [lat for lat, _ in garagens])
+    return indices.tolist()
+
+def sementes_espalhadas(matriz, k):
+    """
+    k sementes afastadas pela distancia na malha (farthest point): a primeira e o
+    no mais distante de um no qualquer, cada nova e a mais distante das anteriores
+    """
+    distancia = dijkstra(matriz, directed=False, indices=0)
+    sementes = [int(np.argmax(np.where(np.isinf(distancia), -1, distancia)))]
+    while len(sementes) < k:
+        distancia = dijkstra(matriz, directed=False, indices=sementes, min_only=True)
+        sementes.append(int(np.argmax(np.where(np.isinf(distancia), -1, distancia))))
+    return sementes
+
+def crescer_distritos(numero_nos, origem, destino, pesos, sementes):
+    """
+    Rotulo (distrito) de cada no. Cada distrito guarda uma fila de prioridade
+    (distancia a sua semente) com os nos da sua fronteira; o distrito com menor
+    extensao interna pega o proximo no livre, entao todos ficam conexos
+    """
+    sem_laco = np.flatnonzero(origem != destino)
+    extremos = np.concatenate([origem[sem_laco], destino[sem_laco]])
+    vizinhos = np.concatenate([destino[sem_laco], origem[sem_laco]])
+    custos = np.concatenate([pesos[sem_laco], pesos[sem_laco]])
+    ordem = np.argsort(extremos, kind='stable')
+    vizinhos, custos = vizinhos[ordem].tolist(), custos[ordem].tolist()
+    fim = np.cumsum(np.bincount(extremos, minlength=numero_nos)).tolist()
+    inicio = [0] + fim[:-1]
+
+    rotulo = [-1] * numero_nos
+    extensao = [0.0] * len(sementes)
+    filas = [[(0.0, semente)] for semente in sementes]
+    ativos = [(0.0, d) for d in range(len(sementes))]
+
+    while ativos:
+        _, d = heapq.heappop(ativos)
+        fila = filas[d]
+        while fila and rotulo[fila[0][1]] >= 0:
+            heapq.heappop(fila)
+        if not fila:
+            continue
+
+        distancia, no = heapq.heappop(fila)
+        rotulo[no] = d
+        for p in range(inicio[no], fim[no]):
+            vizinho = vizinhos[p]
+            if rotulo[vizinho] == d:
+                extensao[d] += custos[p]
+            elif rotulo[vizinho] < 0:
+                heapq.heappush(fila, (distancia + custos[p], vizinho))
+        heapq.heappush(ativos, (extensao[d], d))
+
+    return np.array(rotulo, dtype=np.int64)
+
+def distribuir_arestas(origem, destino, pesos, rotulos, numero_distritos):
+    """
+    Distrito de cada aresta: as internas ficam com o distrito dos dois extremos e
+    as de fronteira com o mais leve dos dois (na ordem do peso, da maior para a menor)
+    Retorna (distrito de cada aresta, extensao de cada distrito)
+    """
+    dono = rotulos[origem].copy()
+    extensao = np.bincount(dono, weights=pesos, minlength=numero_distritos)
+    fronteira = np.flatnonzero(rotulos[origem] != rotulos[destino])
+    extensao -= np.bincount(dono[fronteira], weights=pesos[fronteira], minlength=numero_distritos)
+
+    for k in fronteira[np.argsort(-pesos[fronteira], kind='stable')].tolist():
+        a, b = rotulos[origem[k]], rotulos[destino[k]]
+        escolhido = a if extensao[a] <= extensao[b] else b
+        dono[k] = escolhido
+        extensao[escolhido] += pesos[k]
+    return dono, extensao
+
+def dividir_distritos(grafo, peso, numero_distritos, garagens=None):
+    """
+    Divide o grafo (conexo) em distritos conexos de extensao equilibrada
+    garagens: lista de (lat, lon), uma por caminhao; sem garagens, sementes espalhadas
+    Retorna (lista de grafos dos distritos, no de partida de cada distrito)
+    Levanta ValueError se o grafo nao for conexo (use o grafo preparado)
+    """
+    nos, origem, destino, pesos = vetores_arestas(grafo, peso)
+    # Nos fora do componente das sementes ficariam sem distrito
+    if len(np.unique(componentes_union_find(len(nos), origem, destino))) > 1:
+        raise ValueError("o grafo nao e conexo (divida o maior componente, como em preparar_grafo)")
+    if garagens:
+        numero_distritos = len(garagens)
+    numero_distritos = max(1, min(numero_distritos, len(nos)))
+
+    sem_laco = origem != destino
+    matriz = coo_matrix((pesos[sem_laco], (origem[sem_laco], destino[sem_laco])),
+                        shape=(len(nos), len(nos))).tocsr()
+    if garagens:
+        sementes = indices_garagens(grafo, nos, garagens)
+    else:
+        sementes = sementes_espalhadas(matriz, numero_distritos)
+    if len(set(sementes)) < len(sementes):
+        raise ValueError("duas garagens caem no mesmo no da malha")
+
+    rotulos = crescer_distritos(len(nos), origem, destino, pesos, sementes)
+    dono, _ = distribuir_arestas(origem, destino, pesos, rotulos, len(sementes))
+
+    distritos = [nx.Graph() for _ in sementes]
+    dados_nos = grafo.nodes
+    for k, (u, v, data) in enumerate(grafo.edges(data=True)):
+        distrito = distritos[dono[k]]
+        for no in (u, v):
+            if no not in distrito:
+                distrito.add_node(no, **dados_nos[no])
+        distrito.add_edge(u, v, **data)
+
+    return distritos, [nos[semente] for semente in sementes]
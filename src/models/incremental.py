@@ -0,0 +1,193 @@
+"""
+MODULO DE ATUALIZACAO INCREMENTAL DA ARVORE
+Compara os dados novos do Overpass com o snapshot da coleta anterior (trechos
+adicionados, removidos ou alterados, agrupados por osm_id) e atualiza a arvore
+geradora minima anterior direto nos vetores (GrafoArrays), sem montar NetworkX:
+- cortes em lote: as arestas da arvore removidas (ou mais pesadas) saem todas
+  de uma vez e os pedacos da floresta sao rotulados em vetores
+- religacao e insercoes: Kruskal sobre a floresta e as arestas que podem entrar
+  (novas, mais leves ou que cruzam entre os pedacos); uma aresta sem mudanca
+  dentro de um pedaco ja era a mais pesada do seu ciclo na arvore e fica de fora
+O resultado e a arvore minima do grafo novo, a mesma do recalculo
+"""
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from models.mst_esparso import selecionar_arestas
+
+def vetores_snapshot(arrays):
+    """
+    Trechos do snapshot da coleta: nos (indices em 'ids', ids OSM), comprimento e
+    via (osm_id, nome e tipo; None se a via nao tiver)
+    """
+    via = np.asarray(arrays.via)
+    # Indice -1 (sem nome ou tipo) cai no None do fim da tabela
+    nomes = np.array(list(arrays.nomes) + [None], dtype=object)
+    tipos = np.array(list(arrays.tipos) + [None], dtype=object)
+    return {
+        'ids': np.asarray(arrays.ids).astype(np.int64),
+        'origem': np.asarray(arrays.origem).astype(np.int64),
+        'destino': np.asarray(arrays.destino).astype(np.int64),
+        'comprimento': np.asarray(arrays.comprimento, dtype=np.float64),
+        'osm_id': np.asarray(arrays.osm_vias)[via].astype(np.int64),
+        'nome': nomes[np.asarray(arrays.nome_vias)[via]],
+        'highway': tipos[np.asarray(arrays.highway_vias)[via]]
+    }
+
+def _chaves(universo, ids, origem, destino):
+    """Chave de cada trecho pelo par de nos (sem direcao); universo: ids OSM ordenados que contem 'ids'"""
+    posicao = np.searchsorted(universo, np.asarray(ids))
+    a, b = posicao[np.asarray(origem)], posicao[np.asarray(destino)]
+    return np.minimum(a, b) * len(universo) + np.maximum(a, b)
+
+def indexar_trechos(antigo, novo):
+    """
+    Acrescenta aos vetores das duas coletas a 'chave' de cada trecho (par de nos)
+    Retorna o universo de ids de nos das duas (ordenado), que indexa as chaves
+    """
+    universo = np.unique(np.concatenate([antigo['ids'], novo['ids']]))
+    for vetores in (antigo, novo):
+        vetores['chave'] = _chaves(universo, vetores['ids'], vetores['origem'], vetores['destino'])
+    return universo
+
+def _localizar(chaves, consulta):
+    """Indice em 'chaves' de cada chave consultada (-1 se nao estiver)"""
+    if len(chaves) == 0:
+        return np.full(len(consulta), -1, dtype=np.int64)
+    ordem = np.argsort(chaves, kind='stable')
+    ordenadas = chaves[ordem]
+    posicao = np.minimum(np.searchsorted(ordenadas, consulta), len(chaves) - 1)
+    return np.where(ordenadas[posicao] == consulta, ordem[posicao], -1)
+
+def diferenca_trechos(antigo, novo, tolerancia=1e-6):
+    """
+    Trechos removidos, adicionados e alterados (comprimento, via, nome ou tipo)
+    Os trechos sao identificados pela chave de indexar_trechos (par de nos, sem direcao)
+    Retorna indices em 'antigo' (removidos) e em 'novo' (adicionados), e pares
+    de indices (antigo, novo) dos alterados
+    """
+    def chaves(vetores):
+        chave = vetores['chave']
+        # Trecho repetido (mesmo par de nos): vale o ultimo, como no grafo NetworkX
+        unicas, ultimo = np.unique(chave[::-1], return_index=True)
+        return unicas, len(chave) - 1 - ultimo
+
+    chave_antiga, indice_antigo = chaves(antigo)
+    chave_nova, indice_novo = chaves(novo)
+    em_novo = np.isin(chave_antiga, chave_nova, assume_unique=True)
+    em_antigo = np.isin(chave_nova, chave_antiga, assume_unique=True)
+
+    # Chaves ordenadas: os comuns ficam alinhados
+    comuns_antigo, comuns_novo = indice_antigo[em_novo], indice_novo[em_antigo]
+    diferente = ~np.isclose(antigo['comprimento'][comuns_antigo], novo['comprimento'][comuns_novo],
+                            rtol=0, atol=tolerancia, equal_nan=True)
+    for campo in ('osm_id', 'nome', 'highway'):
+        diferente |= antigo[campo][comuns_antigo] != novo[campo][comuns_novo]
+
+    return {
+        'removidos': indice_antigo[~em_novo],
+        'adicionados': indice_novo[~em_antigo],
+        'alterados': np.column_stack([comuns_antigo[diferente], comuns_novo[diferente]])
+    }
+
+def vias_alteradas(antigo, novo, diferenca, na_arvore=None):
+    """
+    Resumo por via (osm_id) dos trechos que mudaram
+    na_arvore: trechos de 'novo' que estao na arvore atualizada (de atualizar_arvore),
+    para marcar as vias com algum trecho novo ou alterado na rota
+    Retorna {osm_id: {'nome', 'highway', 'alteracao', 'trechos', 'comprimento_antes',
+    'comprimento_depois', 'na_rota'}}
+    """
+    vias = {}
+
+    def via(vetores, k):
+        osm_id = int(vetores['osm_id'][k])
+        if osm_id not in vias:
+            # Mesmos padroes do construtor do grafo para via sem nome ou tipo
+            nome, tipo = vetores['nome'][k], vetores['highway'][k]
+            vias[osm_id] = {'nome': nome if nome is not None else f'Via_{osm_id}',
+                            'highway': tipo if tipo is not None else 'desconhecido',
+                            'antes': 0, 'depois': 0, 'trechos': 0,
+                            'comprimento_antes': 0.0, 'comprimento_depois': 0.0, 'na_rota': False}
+        return vias[osm_id]
+
+    def na_rota(registro, k):
+        if na_arvore is not None and na_arvore[k]:
+            registro['na_rota'] = True
+
+    for k in diferenca['removidos'].tolist():
+        registro = via(antigo, k)
+        registro['antes'] += 1
+        registro['trechos'] += 1
+        registro['comprimento_antes'] += float(antigo['comprimento'][k])
+    for k in diferenca['adicionados'].tolist():
+        registro = via(novo, k)
+        registro['depois'] += 1
+        registro['trechos'] += 1
+        registro['comprimento_depois'] += float(novo['comprimento'][k])
+        na_rota(registro, k)
+    for k_antigo, k_novo in diferenca['alterados'].tolist():
+        via(antigo, k_antigo)['comprimento_antes'] += float(antigo['comprimento'][k_antigo])
+        registro = via(novo, k_novo)
+        registro['antes'] += 1
+        registro['depois'] += 1
+        registro['trechos'] += 1
+        registro['comprimento_depois'] += float(novo['comprimento'][k_novo])
+        na_rota(registro, k_novo)
+
+    for registro in vias.values():
+        antes, depois = registro.pop('antes'), registro.pop('depois')
+        registro['alteracao'] = ('adicionada' if antes == 0 else
+                                 'removida' if depois == 0 else 'alterada')
+    return vias
+
+
+def atualizar_arvore(arvore, grafo, antigo, novo, universo, pesos_antigos, peso, motor='scipy'):
+    """
+    Arvore geradora minima do grafo preparado novo a partir da arvore anterior
+    arvore: GrafoArrays da arvore anterior; grafo: GrafoArrays do grafo preparado
+    a partir da nova coleta (pesos preenchidos, maior componente)
+    antigo/novo/universo: vetores_snapshot das duas coletas e o retorno de
+    indexar_trechos; pesos_antigos: peso que a preparacao deu a cada trecho
+    antigo; motor: 'scipy' ou 'kruskal_arrays'
+    Retorna (GrafoArrays da arvore nova, {'entraram', 'sairam', 'nos_removidos'},
+    trechos de 'novo' que estao na arvore nova)
+    """
+    chave_arvore = _chaves(universo, arvore.ids, arvore.origem, arvore.destino)
+    chave_grafo = _chaves(universo, grafo.ids, grafo.origem, grafo.destino)
+    peso_grafo = np.asarray(grafo.pesos_arestas(peso), dtype=np.float64)
+    origem = np.asarray(grafo.origem, dtype=np.int64)
+    destino = np.asarray(grafo.destino, dtype=np.int64)
+
+    # Cortes: sai da arvore o que foi removido ou ficou mais pesado
+    posicao = _localizar(chave_grafo, chave_arvore)
+    mantida = posicao >= 0
+    mantida[mantida] = peso_grafo[posicao[mantida]] <= np.asarray(arvore.pesos_arestas(peso))[mantida]
+    floresta = np.zeros(len(chave_grafo), dtype=bool)
+    floresta[posicao[mantida]] = True
+
+    matriz = coo_matrix((np.ones(int(floresta.sum())), (origem[floresta], destino[floresta])),
+                        shape=(grafo.numero_nos, grafo.numero_nos))
+    _, pedacos = connected_components(matriz, directed=False)
+
+    # Trecho que ja estava no grafo com peso igual ou menor: dentro de um pedaco,
+    # o caminho na floresta ja era mais leve que ele (a arvore era minima)
+    anterior = _localizar(antigo['chave'], chave_grafo)
+    sem_mudanca = anterior >= 0
+    sem_mudanca[sem_mudanca] = peso_grafo[sem_mudanca] >= pesos_antigos[anterior[sem_mudanca]]
+    candidatas = np.flatnonzero((floresta | ~sem_mudanca | (pedacos[origem] != pedacos[destino]))
+                                & (origem != destino))
+
+    selecionadas = selecionar_arestas(grafo.numero_nos, origem[candidatas], destino[candidatas],
+                                       peso_grafo[candidatas], motor)
+    arestas = np.sort(candidatas[selecionadas])
+    chave_nova = chave_grafo[arestas]
+
+    resumo = {
+        'entraram': int(np.isin(chave_nova, chave_arvore, invert=True).sum()),
+        'sairam': int(np.isin(chave_arvore, chave_nova, invert=True).sum()),
+        'nos_removidos': int(np.isin(np.asarray(arvore.ids), np.asarray(grafo.ids), invert=True).sum())
+    }
+    na_arvore = np.isin(novo['chave'], chave_nova)
+    return grafo.filtrar_arestas(arestas), resumo, na_arvore
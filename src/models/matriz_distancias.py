@@ -0,0 +1,197 @@
+"""
+MODULO DA MATRIZ DE DISTANCIAS
+Distancias pela malha viaria entre garagens, pontos de coleta e aterros:
+os pontos (lat, lon) sao ajustados ao no mais proximo (KD-tree) e a matriz
+muitos-para-muitos sai de Dijkstra em lotes sobre a matriz CSR do grafo,
+com cache em disco por grafo (snapshot) e conjunto de pontos
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from config.settings import (PESO_PADRAO, PASTA_MATRIZES, USAR_CACHE_MATRIZ, CACHE_MATRIZES_TAMANHO_MAXIMO_MB,
+                             MEMORIA_LOTE_DIJKSTRA_MB, PROCESSOS_MATRIZ)
+from data.cache import LimiteTamanho
+from data.espacial import nos_mais_proximos
+from data.snapshot import carregar_snapshot, ler_manifesto
+from models.preparacao import vetores_arestas
+from utils.perfil import perfilador
+
+# Matriz CSR de cada processo do pool (enviada uma vez, no inicializador)
+_matriz_processo = None
+
+# Limite de tamanho de cada pasta de matrizes, compartilhado pelas instancias do processo
+# (o total da pasta e lido uma vez, e nao a cada matriz gravada)
+_limites_cache = {}
+
+def _limite_pasta(pasta, tamanho_maximo_mb):
+    chave = (os.path.abspath(pasta), tamanho_maximo_mb)
+    if chave not in _limites_cache:
+        _limites_cache[chave] = LimiteTamanho(pasta, int(tamanho_maximo_mb * 1024 * 1024), '.npy')
+    return _limites_cache[chave]
+
+def _iniciar_processo(matriz):
+    global _matriz_processo
+    _matriz_processo = matriz
+
+def _distancias_lote(fontes, alvos):
+    """Dijkstra de um lote de fontes, so as colunas dos alvos (executado no pool)"""
+    return dijkstra(_matriz_processo, directed=False, indices=fontes)[:, alvos]
+
+class MatrizDistancias:
+    """
+    Distancias (metros) pela malha entre pontos (lat, lon)
+    grafo: grafo NetworkX (ex.: o de ColetorDados ou o preparado) ou GrafoArrays
+    chave_grafo: identifica o grafo no cache; sem ela, e o hash da matriz CSR
+    """
+    def __init__(self, grafo, peso=PESO_PADRAO, chave_grafo=None):
+        self.peso = peso
+        self.usar_cache = USAR_CACHE_MATRIZ
+        self.pasta_cache = PASTA_MATRIZES
+        self.tamanho_maximo_cache_mb = CACHE_MATRIZES_TAMANHO_MAXIMO_MB
+        self.memoria_lote_mb = MEMORIA_LOTE_DIJKSTRA_MB
+        self.processos = PROCESSOS_MATRIZ
+
+        if hasattr(grafo, 'nodes'):
+            nos, origem, destino, pesos = vetores_arestas(grafo, peso)
+            dados = grafo.nodes
+            self.lon = np.array([dados[no]['x'] for no in nos], dtype=np.float64)
+            self.lat = np.array([dados[no]['y'] for no in nos], dtype=np.float64)
+            self.nos = nos
+        else:
+            origem, destino = grafo.origem.astype(np.int64), grafo.destino.astype(np.int64)
+            pesos = np.asarray(grafo.pesos_arestas(peso), dtype=np.float64)
+            self.lon, self.lat = np.asarray(grafo.lon), np.asarray(grafo.lat)
+            self.nos = grafo.ids.tolist()
+
+        numero_nos = len(self.lon)
+        self.matriz = coo_matrix((pesos, (origem, destino)), shape=(numero_nos, numero_nos)).tocsr()
+        self.chave_grafo = chave_grafo or self._hash_matriz()
+
+    @classmethod
+    def de_snapshot(cls, pasta, peso=PESO_PADRAO):
+        """
+        Matriz sobre um snapshot (data.snapshot), com memoria mapeada
+        A chave do cache vem do manifesto, sem ler os vetores inteiros
+        Retorna None se nao houver snapshot valido
+        """
+        manifesto = ler_manifesto(pasta)
+        arrays, _ = carregar_snapshot(pasta)
+        if arrays is None:
+            return None
+        chave = hashlib.sha256(json.dumps(manifesto, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return cls(arrays, peso=peso, chave_grafo=chave)
+
+    def _hash_matriz(self):
+        hash_grafo = hashlib.sha256()
+        for vetor in (self.matriz.indptr, self.matriz.indices, self.matriz.data):
+            hash_grafo.update(np.ascontiguousarray(vetor).tobytes())
+        return hash_grafo.hexdigest()
+
+    def ajustar(self, pontos):
+        """
+        No mais proximo de cada ponto (lat, lon)
+        Retorna (indices dos nos, distancia em metros do ponto ate o no)
+        """
+        pontos = np.asarray(pontos, dtype=np.float64).reshape(-1, 2)
+        return nos_mais_proximos(self.lon, self.lat, pontos[:, 1], pontos[:, 0])
+
+    @perfilador.medir('matriz_distancias', contagens=lambda matriz: {'linhas': matriz.shape[0],
+                                                                     'colunas': matriz.shape[1]})
+    def calcular(self, origens, destinos=None, incluir_acesso=True):
+        """
+        Matriz (len(origens) x len(destinos)) de distancias pela malha, em metros
+        origens/destinos: listas de (lat, lon); sem destinos, origens x origens
+        incluir_acesso soma o trecho em linha reta de cada ponto ate o seu no
+        Pares sem caminho ficam com inf
+        """
+        origens = np.asarray(origens, dtype=np.float64).reshape(-1, 2)
+        destinos = origens if destinos is None else np.asarray(destinos, dtype=np.float64).reshape(-1, 2)
+
+        chave = self._chave(origens, destinos, incluir_acesso)
+        matriz = self._ler_cache(chave)
+        if matriz is not None:
+            print(f"Matriz de distancias {matriz.shape[0]}x{matriz.shape[1]} carregada do cache")
+            return matriz
+
+        nos_origem, acesso_origem = self.ajustar(origens)
+        nos_destino, acesso_destino = self.ajustar(destinos)
+
+        # Pontos que caem no mesmo no compartilham a linha/coluna
+        fontes, linha = np.unique(nos_origem, return_inverse=True)
+        alvos, coluna = np.unique(nos_destino, return_inverse=True)
+        distancias = self._dijkstra_em_lotes(fontes, alvos)
+
+        matriz = distancias[np.ix_(linha, coluna)]
+        if incluir_acesso:
+            matriz += acesso_origem[:, None] + acesso_destino[None, :]
+
+        self._salvar_cache(chave, matriz)
+        print(f"Matriz de distancias {matriz.shape[0]}x{matriz.shape[1]} calculada "
+              f"({len(fontes)} fontes distintas)")
+        return matriz
+
+    def _dijkstra_em_lotes(self, fontes, alvos):
+        """
+        Dijkstra de varias fontes por chamada; o lote e limitado pela memoria da
+        saida (fontes x nos) e, com PROCESSOS_MATRIZ > 1, os lotes vao para um pool
+        """
+        por_lote = max(1, int(self.memoria_lote_mb * 1024 * 1024 // (8 * max(self.matriz.shape[0], 1))))
+        lotes = [fontes[inicio:inicio + por_lote] for inicio in range(0, len(fontes), por_lote)]
+        perfilador.contar(lotes=len(lotes))
+
+        processos = min(self.processos or os.cpu_count() or 1, len(lotes))
+        if processos > 1:
+            with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo,
+                                     initargs=(self.matriz,)) as pool:
+                partes = list(pool.map(_distancias_lote, lotes, [alvos] * len(lotes)))
+        else:
+            partes = [dijkstra(self.matriz, directed=False, indices=lote)[:, alvos] for lote in lotes]
+
+        if not partes:
+            return np.empty((0, len(alvos)))
+        return np.concatenate(partes)
+
+    def _chave(self, origens, destinos, incluir_acesso):
+        """Chave do cache: grafo, peso e os pontos (bytes exatos das coordenadas)"""
+        hash_pontos = hashlib.sha256()
+        hash_pontos.update(json.dumps([self.chave_grafo, self.peso, incluir_acesso,
+                                       origens.shape, destinos.shape]).encode('utf-8'))
+        hash_pontos.update(np.ascontiguousarray(origens).tobytes())
+        hash_pontos.update(np.ascontiguousarray(destinos).tobytes())
+        return hash_pontos.hexdigest()
+
+    def _caminho_cache(self, chave):
+        return os.path.join(self.pasta_cache, f"{chave}.npy")
+
+    def _ler_cache(self, chave):
+        if not self.usar_cache:
+            return None
+        caminho = self._caminho_cache(chave)
+        if not os.path.exists(caminho):
+            return None
+        try:
+            matriz = np.load(caminho)
+        except (OSError, ValueError):
+            return None
+        # Marca o uso (mtime) para a remocao das menos usadas, como no cache de respostas
+        os.utime(caminho, None)
+        return matriz
+
+    def _salvar_cache(self, chave, matriz):
+        if not self.usar_cache:
+            return
+        os.makedirs(self.pasta_cache, exist_ok=True)
+        caminho = self._caminho_cache(chave)
+        # Sem a extensao .npy no temporario: o limite de tamanho so conta as entradas prontas
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'wb') as arquivo:
+            np.save(arquivo, matriz)
+        tamanho_anterior = os.path.getsize(caminho) if os.path.exists(caminho) else 0
+        os.replace(temporario, caminho)
+        _limite_pasta(self.pasta_cache, self.tamanho_maximo_cache_mb).registrar(caminho, tamanho_anterior)
@@ -0,0 +1,114 @@
+"""
+MOTORES DE ARVORE GERADORA MINIMA SOBRE VETORES
+Alternativas ao nx.minimum_spanning_tree para grafos grandes:
+- 'scipy': scipy.sparse.csgraph.minimum_spanning_tree sobre matriz CSR
+- 'kruskal_arrays': Kruskal com union-find sobre vetores NumPy
+"""
+import numpy as np
+import networkx as nx
+
+MOTORES_MST = ('networkx', 'scipy', 'kruskal_arrays')
+
+def extrair_arestas(grafo, peso):
+    """
+    Converte o grafo NetworkX em vetores (nos, origem, destino, peso)
+    origem/destino sao indices na lista de nos; lacos sao descartados
+    """
+    nos = list(grafo.nodes)
+    indice = {no: i for i, no in enumerate(nos)}
+
+    numero_arestas = grafo.number_of_edges()
+    origem = np.empty(numero_arestas, dtype=np.int64)
+    destino = np.empty(numero_arestas, dtype=np.int64)
+    pesos = np.empty(numero_arestas, dtype=np.float64)
+
+    for k, (u, v, valor) in enumerate(grafo.edges(data=peso, default=1.0)):
+        origem[k] = indice[u]
+        destino[k] = indice[v]
+        pesos[k] = valor
+
+    sem_laco = origem != destino
+    return nos, origem[sem_laco], destino[sem_laco], pesos[sem_laco]
+
+def mst_scipy(numero_nos, origem, destino, pesos):
+    """Retorna os indices das arestas da arvore (floresta) usando scipy.sparse.csgraph"""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import minimum_spanning_tree
+
+    # csgraph trata peso zero como ausencia de aresta
+    if np.any(pesos <= 0):
+        raise ValueError("o motor 'scipy' exige pesos positivos")
+
+    menor = np.minimum(origem, destino)
+    maior = np.maximum(origem, destino)
+    matriz = coo_matrix((pesos, (menor, maior)), shape=(numero_nos, numero_nos)).tocsr()
+    arvore = minimum_spanning_tree(matriz).tocoo()
+
+    # Localiza cada aresta da arvore no vetor original de arestas
+    chave_arestas = menor * numero_nos + maior
+    ordem = np.argsort(chave_arestas, kind='stable')
+    chave_arvore = np.minimum(arvore.row, arvore.col).astype(np.int64) * numero_nos \
+        + np.maximum(arvore.row, arvore.col)
+    return ordem[np.searchsorted(chave_arestas[ordem], chave_arvore)]
+
+def mst_kruskal_arrays(numero_nos, origem, destino, pesos):
+    """Retorna os indices das arestas da arvore (floresta) com Kruskal + union-find"""
+    pai = list(range(numero_nos))
+    escolhidas = []
+    restantes = numero_nos - 1
+
+    ordem = np.argsort(pesos, kind='stable')
+    for k, u, v in zip(ordem.tolist(), origem[ordem].tolist(), destino[ordem].tolist()):
+        # Busca com compressao de caminho por divisao (path halving)
+        while pai[u] != u:
+            pai[u] = pai[pai[u]]
+            u = pai[u]
+        while pai[v] != v:
+            pai[v] = pai[pai[v]]
+            v = pai[v]
+        if u == v:
+            continue
+
+        pai[u] = v
+        escolhidas.append(k)
+        restantes -= 1
+        if restantes == 0:
+            break
+
+    return np.array(escolhidas, dtype=np.int64)
+
+def montar_arvore(grafo, nos, origem, destino, selecionadas):
+    """Monta o grafo NetworkX da arvore com os mesmos atributos do grafo original"""
+    arvore = nx.Graph()
+    arvore.add_nodes_from(grafo.nodes(data=True))
+    arvore.add_edges_from(
+        (nos[u], nos[v], grafo[nos[u]][nos[v]])
+        for u, v in zip(origem[selecionadas].tolist(), destino[selecionadas].tolist())
+    )
+    return arvore
+
+def selecionar_arestas(numero_nos, origem, destino, pesos, motor):
+    """Indices das arestas da arvore (floresta) com o motor em vetores escolhido"""
+    if motor == 'scipy':
+        return mst_scipy(numero_nos, origem, destino, pesos)
+    if motor == 'kruskal_arrays':
+        return mst_kruskal_arrays(numero_nos, origem, destino, pesos)
+    raise ValueError(f"Motor de MST desconhecido: '{motor}' (use {', '.join(MOTORES_MST)})")
+
+def arvore_geradora_minima(grafo, peso, motor):
+    """Calcula a arvore geradora minima com o motor em vetores escolhido"""
+    nos, origem, destino, pesos = extrair_arestas(grafo, peso)
+    selecionadas = selecionar_arestas(len(nos), origem, destino, pesos, motor)
+    return montar_arvore(grafo, nos, origem, destino, selecionadas)
+
+def arvore_geradora_minima_arrays(arrays, peso, motor):
+    """
+    Arvore geradora minima direto sobre um GrafoArrays (ex.: snapshot em memoria
+    mapeada), sem passar por NetworkX; retorna o GrafoArrays da arvore
+    """
+    origem = arrays.origem.astype(np.int64)
+    destino = arrays.destino.astype(np.int64)
+    arestas = np.flatnonzero(origem != destino)
+    selecionadas = selecionar_arestas(arrays.numero_nos, origem[arestas], destino[arestas],
+                                       np.asarray(arrays.pesos_arestas(peso))[arestas], motor)
+    return arrays.filtrar_arestas(np.sort(arestas[selecionadas]))
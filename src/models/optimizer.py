@@ -1,30 +1,109 @@
 """
 MODULO DE ALGORITMOS DE OTIMIZACAO
 Implementa Prim para arvore geradora minima (coleta de lixo)
+e o carteiro chines (rota fechada que percorre todas as ruas)
 """
+import contextlib
+import io
+import os
 import networkx as nx
+import numpy as np
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 # Import relativo correto - DOIS níveis acima
-from config.settings import ALGORITMO, PESO_PADRAO
+from config.settings import (ALGORITMO, PESO_PADRAO, MOTOR_MST, SIMPLIFICAR_GRAFO,
+                             PREPARACAO_GRAFO, SALVAR_SNAPSHOTS, USAR_SNAPSHOTS, MODO_ROTA,
+                             RAIO_EMPARELHAMENTO, PROFUNDIDADE_EMPARELHAMENTO,
+                             MELHORIAS_EMPARELHAMENTO, NUMERO_CAMINHOES, GARAGENS,
+                             PROCESSOS_DISTRITOS, ARESTAS_MINIMAS_POOL_DISTRITOS,
+                             ATUALIZACAO_INCREMENTAL)
+from data.grafo_arrays import GrafoArrays, como_networkx, tamanho_grafo
+from data.snapshot import (carregar_snapshot, grafo_para_arrays, ler_manifesto, pasta_snapshot,
+                           salvar_snapshot)
+from models.carteiro import rota_carteiro
+from models.distritos import dividir_distritos
+from models.incremental import (atualizar_arvore, diferenca_trechos, indexar_trechos, vetores_snapshot,
+                                vias_alteradas)
+from models.mst_esparso import arvore_geradora_minima, arvore_geradora_minima_arrays
+from models.preparacao import (componentes_union_find, manter_maior_componente,
+                               preencher_pesos, vetores_arestas)
+from models.simplificacao import simplificar_grafo
+from utils.perfil import contar_grafo, perfilador
+
+# Atributos do otimizador enviados a cada distrito (o otimizador inteiro nao vai ao pool)
+ATRIBUTOS_DISTRITO = ('algoritmo', 'peso', 'motor', 'modo', 'raio_emparelhamento',
+                      'profundidade_emparelhamento', 'melhorias_emparelhamento')
 
 class OtimizadorRotas:
     def __init__(self):
         self.algoritmo = ALGORITMO
         self.peso = PESO_PADRAO
-        print(f"Otimizador configurado: {self.algoritmo.upper()}")
+        self.motor = MOTOR_MST
+        self.simplificar = SIMPLIFICAR_GRAFO
+        self.preparacao = PREPARACAO_GRAFO
+        self.salvar_snapshots = SALVAR_SNAPSHOTS
+        self.usar_snapshots = USAR_SNAPSHOTS
+        self.modo = MODO_ROTA
+        self.raio_emparelhamento = RAIO_EMPARELHAMENTO
+        self.profundidade_emparelhamento = PROFUNDIDADE_EMPARELHAMENTO
+        self.melhorias_emparelhamento = MELHORIAS_EMPARELHAMENTO
+        self.caminhoes = len(GARAGENS) or NUMERO_CAMINHOES
+        self.garagens = GARAGENS
+        self.processos_distritos = PROCESSOS_DISTRITOS
+        self.arestas_minimas_pool_distritos = ARESTAS_MINIMAS_POOL_DISTRITOS
+        self.incremental = ATUALIZACAO_INCREMENTAL
+        if self.modo == 'carteiro':
+            print("Otimizador configurado: CARTEIRO CHINES (rota por todas as ruas)")
+        else:
+            print(f"Otimizador configurado: {self.algoritmo.upper()} (motor: {self.motor})")
     
-    def preparar_grafo(self, grafo):
+    @perfilador.medir('preparacao', contagens=contar_grafo)
+    def preparar_grafo(self, grafo, nome_snapshot=None):
         """
         Prepara o grafo para os algoritmos de otimizacao
+        Com nome_snapshot, grava o grafo preparado em snapshot binario
+        Na preparacao 'vetores' o grafo recebido e alterado no lugar (sem copia);
+        um GrafoArrays (snapshot da coleta) e preparado e devolvido em vetores
         """
         print("Preparando grafo para otimizacao...")
 
-        # 1. Converter para nao-direcionado se necessario
-        if grafo.is_directed():
-            grafo = grafo.to_undirected()
-            print("Convertido para grafo nao-direcionado")
+        # A preparacao original e a simplificacao sao feitas em NetworkX
+        if isinstance(grafo, GrafoArrays) and (self.preparacao != 'vetores' or self.simplificar):
+            grafo = grafo.para_networkx()
+        
+        if isinstance(grafo, GrafoArrays):
+            grafo = self._preparar_arrays(grafo)
+        else:
+            # 1. Converter para nao-direcionado se necessario
+            if grafo.is_directed():
+                grafo = grafo.to_undirected()
+                print("Convertido para grafo nao-direcionado")
+            
+            if self.preparacao == 'vetores':
+                grafo = self._preparar_em_vetores(grafo)
+            else:
+                grafo = self._preparar_networkx(grafo)
+            
+            # 4. Contrair cadeias de nos de grau 2 (geometria guardada na aresta)
+            if self.simplificar:
+                nos_antes = len(grafo.nodes)
+                with perfilador.fase('simplificacao') as registro:
+                    grafo, removidos = simplificar_grafo(grafo, self.peso)
+                    registro['nos_removidos'] = removidos
+                reducao = (removidos / nos_antes) * 100 if nos_antes > 0 else 0
+                print(f"Simplificado: {nos_antes} -> {len(grafo.nodes)} nos ({reducao:.1f}% de reducao)")
+        
+        print("Grafo preparado: {} nos, {} arestas".format(*tamanho_grafo(grafo)))
         
+        if self.salvar_snapshots and nome_snapshot is not None:
+            pasta = pasta_snapshot(nome_snapshot, 'preparado')
+            salvar_snapshot(grafo_para_arrays(grafo, self.peso), pasta, self._metadados_snapshot())
+            print(f"Snapshot do grafo preparado salvo em: '{pasta}'")
+        return grafo
+    
+    def _preparar_networkx(self, grafo):
+        """Passos 2 e 3 com NetworkX (preparacao original: copia o maior componente)"""
         # 2. Garantir que todas arestas tem peso
         arestas_sem_peso = 0
         for u, v, data in grafo.edges(data=True):
@@ -36,25 +115,226 @@ class OtimizadorRotas:
             print(f"{arestas_sem_peso} arestas receberam peso padrao")
         
         # 3. Extrair maior componente conexo
-        if not nx.is_connected(grafo):
-            componentes = list(nx.connected_components(grafo))
-            maior_componente = max(componentes, key=len)
-            grafo = grafo.subgraph(maior_componente).copy()
-            print(f"Extraido maior componente: {len(maior_componente)} nos")
+        with perfilador.fase('componentes') as registro:
+            if not nx.is_connected(grafo):
+                componentes = list(nx.connected_components(grafo))
+                maior_componente = max(componentes, key=len)
+                grafo = grafo.subgraph(maior_componente).copy()
+                registro['componentes'] = len(componentes)
+                print(f"Extraido maior componente: {len(maior_componente)} nos")
+        
+        return grafo
+    
+    def _preparar_em_vetores(self, grafo):
+        """
+        Passos 2 e 3 sobre vetores de arestas: pesos faltantes preenchidos em bloco,
+        componentes por union-find e nos fora do maior componente removidos no lugar
+        """
+        nos, origem, destino, pesos = vetores_arestas(grafo, self.peso)
+        
+        # 2. Garantir que todas arestas tem peso
+        arestas_sem_peso = preencher_pesos(grafo, nos, origem, destino, pesos, self.peso, 100.0)
+        if arestas_sem_peso > 0:
+            print(f"{arestas_sem_peso} arestas receberam peso padrao")
         
-        print(f"Grafo preparado: {len(grafo.nodes)} nos, {len(grafo.edges)} arestas")
+        # 3. Manter apenas o maior componente conexo
+        with perfilador.fase('componentes') as registro:
+            rotulos = componentes_union_find(len(nos), origem, destino)
+            componentes, nos_maior = manter_maior_componente(grafo, nos, rotulos)
+            if componentes > 1:
+                registro['componentes'] = componentes
+                print(f"Extraido maior componente: {nos_maior} nos")
         return grafo
     
+    def _preparar_arrays(self, arrays):
+        """
+        Passos 2 e 3 direto sobre um GrafoArrays, sem montar o grafo NetworkX:
+        pesos faltantes preenchidos em bloco e nos fora do maior componente
+        (union-find) filtrados dos vetores
+        """
+        # 2. Garantir que todas arestas tem peso
+        pesos, arestas_sem_peso = self._pesos_preenchidos(arrays)
+        if arestas_sem_peso > 0:
+            print(f"{arestas_sem_peso} arestas receberam peso padrao")
+        
+        # 3. Manter apenas o maior componente conexo
+        with perfilador.fase('componentes') as registro:
+            rotulos = componentes_union_find(arrays.numero_nos, arrays.origem, arrays.destino)
+            raizes, tamanhos = np.unique(rotulos, return_counts=True)
+            mascara = rotulos == raizes[np.argmax(tamanhos)]
+            manter = np.flatnonzero(mascara[arrays.origem] & mascara[arrays.destino])
+            preparado = arrays.filtrar_nos(mascara)
+            if len(raizes) > 1:
+                registro['componentes'] = len(raizes)
+                print(f"Extraido maior componente: {preparado.numero_nos} nos")
+        
+        # Os vetores do snapshot (somente leitura) nao sao alterados
+        if self.peso == 'length':
+            preparado.comprimento = pesos[manter]
+        else:
+            preparado.pesos[self.peso] = pesos[manter]
+        return preparado
+    
+    def _pesos_preenchidos(self, arrays):
+        """Pesos das arestas do GrafoArrays com o padrao onde falta peso valido; retorna (pesos, quantas)"""
+        pesos = np.asarray(arrays.pesos_arestas(self.peso))
+        sem_peso = ~(pesos > 0)
+        arestas_sem_peso = int(sem_peso.sum())
+        if arestas_sem_peso > 0:
+            pesos = np.where(sem_peso, 100.0, pesos)
+        return pesos, arestas_sem_peso
+    
+    def _metadados_snapshot(self):
+        return {'peso': self.peso, 'simplificar': self.simplificar}
+    
+    @perfilador.medir('snapshot', contagens=contar_grafo)
+    def carregar_grafo_preparado(self, nome_snapshot):
+        """
+        Recarrega (memoria mapeada) o grafo preparado de uma execucao anterior
+        Retorna None se os snapshots estiverem desativados ou nao houver um valido
+        """
+        if not self.usar_snapshots:
+            return None
+        
+        inicio = time.perf_counter()
+        pasta = pasta_snapshot(nome_snapshot, 'preparado')
+        arrays, metadados = carregar_snapshot(pasta)
+        if arrays is None or metadados != self._metadados_snapshot():
+            return None
+        
+        # Fica em vetores: o NetworkX so e montado se algum passo precisar (mapa, relatorios)
+        print(f"Grafo preparado carregado do snapshot '{pasta}' em {time.perf_counter() - inicio:.3f}s")
+        print(f"Grafo preparado: {arrays.numero_nos} nos, {arrays.numero_arestas} arestas")
+        return arrays
+    
+    def incremental_disponivel(self):
+        """A atualizacao incremental so cobre a arvore de um caminhao sobre o grafo sem simplificacao"""
+        return self.incremental and self.modo == 'arvore' and self.caminhoes == 1 and not self.simplificar
+    
+    def _versao_snapshot(self, nome_snapshot, fase):
+        """Momento em que o snapshot da fase foi gravado (identifica a execucao); None se nao houver"""
+        manifesto = ler_manifesto(pasta_snapshot(nome_snapshot, fase))
+        return manifesto['criado_em'] if manifesto else None
+    
+    def salvar_arvore(self, arvore, nome_snapshot):
+        """
+        Grava a arvore em snapshot para a proxima atualizacao incremental, junto com
+        as versoes da coleta e do grafo preparado de que ela saiu
+        """
+        if arvore is None or not (self.salvar_snapshots and self.incremental_disponivel()):
+            return
+        metadados = dict(self._metadados_snapshot(),
+                         coleta=self._versao_snapshot(nome_snapshot, 'coleta'),
+                         preparado=self._versao_snapshot(nome_snapshot, 'preparado'))
+        pasta = pasta_snapshot(nome_snapshot, 'arvore')
+        salvar_snapshot(grafo_para_arrays(arvore, self.peso), pasta, metadados)
+        print(f"Snapshot da arvore salvo em: '{pasta}'")
+    
+    @perfilador.medir('snapshot', contagens=lambda estado: contar_grafo(estado['arvore']))
+    def carregar_estado_anterior(self, nome_snapshot):
+        """
+        Coleta e arvore da execucao anterior, em vetores (lidas antes da nova
+        coleta, que substitui o snapshot da coleta)
+        Retorna None se a atualizacao incremental estiver desativada, se faltar algum
+        snapshot ou se a arvore nao tiver saido dessa coleta e desse grafo preparado
+        """
+        if not self.incremental_disponivel():
+            return None
+        
+        inicio = time.perf_counter()
+        arvore, metadados = carregar_snapshot(pasta_snapshot(nome_snapshot, 'arvore'))
+        esperado = dict(self._metadados_snapshot(),
+                        coleta=self._versao_snapshot(nome_snapshot, 'coleta'),
+                        preparado=self._versao_snapshot(nome_snapshot, 'preparado'))
+        if arvore is None or metadados != esperado:
+            print("Sem arvore anterior valida: calculo completo (a atualizacao incremental vale a partir da proxima execucao)")
+            return None
+        
+        coleta, _ = carregar_snapshot(pasta_snapshot(nome_snapshot, 'coleta'), mmap=False)
+        if coleta is None:
+            print("Snapshot da coleta anterior indisponivel: calculo completo")
+            return None
+        
+        # Fica em vetores: a atualizacao e feita sobre o GrafoArrays da arvore
+        print(f"Estado anterior carregado em {time.perf_counter() - inicio:.3f}s "
+              f"({arvore.numero_nos} nos, {arvore.numero_arestas} arestas na arvore)")
+        return {'coleta': coleta, 'arvore': arvore}
+    
+    @perfilador.medir('incremental', contagens=lambda resultado: {'vias_alteradas': len(resultado[3])})
+    def atualizar_rota_incremental(self, estado, grafo_novo, nome_snapshot, arrays_novos=None):
+        """
+        Atualiza a arvore anterior com as ruas adicionadas, removidas ou alteradas
+        na nova coleta, sem recalcular a arvore inteira
+        grafo_novo: NetworkX ou GrafoArrays da nova coleta; arrays_novos: vetores do
+        mesmo grafo (ColetorDados.ultimo_arrays), para nao converter o grafo NetworkX; grafo preparado e arvore sao devolvidos em vetores
+        Retorna (grafo preparado, arvore, metricas, vias alteradas por osm_id) ou None
+        """
+        print("Atualizando arvore geradora minima (incremental)...")
+        
+        inicio = time.time()
+        
+        try:
+            if arrays_novos is None and isinstance(grafo_novo, GrafoArrays):
+                arrays_novos = grafo_novo
+            elif arrays_novos is None:
+                if grafo_novo.is_directed():
+                    grafo_novo = grafo_novo.to_undirected()
+                arrays_novos = grafo_para_arrays(grafo_novo)
+            antigo, novo = vetores_snapshot(estado['coleta']), vetores_snapshot(arrays_novos)
+            universo = indexar_trechos(antigo, novo)
+            diferenca = diferenca_trechos(antigo, novo)
+            
+            # O grafo preparado sai da nova coleta como na preparacao completa (em vetores)
+            grafo = self._preparar_arrays(arrays_novos)
+            pesos_antigos, _ = self._pesos_preenchidos(estado['coleta'])
+            motor = self.motor if self.motor != 'networkx' else 'scipy'
+            arvore, atualizacao, na_arvore = atualizar_arvore(estado['arvore'], grafo, antigo, novo, universo,
+                                                               pesos_antigos, self.peso, motor)
+            alteracoes = vias_alteradas(antigo, novo, diferenca, na_arvore)
+        except Exception as e:
+            print(f"Erro na atualizacao incremental: {e}")
+            return None
+        
+        tempo_execucao = time.time() - inicio
+        
+        metricas = self._calcular_metricas(grafo, arvore, tempo_execucao)
+        metricas.update({
+            'atualizacao_incremental': True,
+            'vias_alteradas': len(alteracoes),
+            'trechos_alterados': len(diferenca['removidos']) + len(diferenca['adicionados']) + len(diferenca['alterados']),
+            'arestas_entraram_arvore': atualizacao['entraram'],
+            'arestas_sairam_arvore': atualizacao['sairam'],
+            'nos_removidos': atualizacao['nos_removidos']
+        })
+        print(f"Vias alteradas: {len(alteracoes)} ({metricas['trechos_alterados']} trechos); "
+              f"arvore: +{atualizacao['entraram']} / -{atualizacao['sairam']} arestas")
+        print(f"Arvore atualizada em {tempo_execucao:.3f} segundos")
+        
+        if self.salvar_snapshots:
+            pasta = pasta_snapshot(nome_snapshot, 'preparado')
+            salvar_snapshot(grafo, pasta, self._metadados_snapshot())
+            self.salvar_arvore(arvore, nome_snapshot)
+        return grafo, arvore, metricas, alteracoes
+    
+    @perfilador.medir('mst', contagens=lambda resultado: contar_grafo(resultado[0]))
     def calcular_rota_otimizada(self, grafo):
         """
         Calcula arvore geradora minima usando Prim
+        Um GrafoArrays com motor em vetores ('scipy', 'kruskal_arrays') fica em
+        vetores e a arvore tambem e devolvida como GrafoArrays
         """
         print(f"Calculando arvore geradora minima ({self.algoritmo.upper()})...")
         
         inicio = time.time()
         
         try:
-            arvore = nx.minimum_spanning_tree(grafo, weight=self.peso, algorithm=self.algoritmo)
+            if isinstance(grafo, GrafoArrays) and self.motor != 'networkx':
+                arvore = arvore_geradora_minima_arrays(grafo, self.peso, self.motor)
+            elif self.motor == 'networkx':
+                grafo = como_networkx(grafo)
+                arvore = nx.minimum_spanning_tree(grafo, weight=self.peso, algorithm=self.algoritmo)
+            else:
+                arvore = arvore_geradora_minima(grafo, self.peso, self.motor)
                 
         except Exception as e:
             print(f"Erro no uso do algoritmo: {e}")
@@ -70,15 +350,10 @@ class OtimizadorRotas:
     def _calcular_metricas(self, grafo_original, arvore_otimizada, tempo):
         """Calcula metricas de performance da otimizacao"""
         
-        comprimento_total = sum(
-            data[self.peso] 
-            for _, _, data in grafo_original.edges(data=True)
-        )
-        
-        comprimento_otimizado = sum(
-            data[self.peso] 
-            for _, _, data in arvore_otimizada.edges(data=True)
-        )
+        comprimento_total = self._extensao(grafo_original)
+        comprimento_otimizado = self._extensao(arvore_otimizada)
+        numero_nos, numero_arestas = tamanho_grafo(grafo_original)
+        _, arestas_otimizado = tamanho_grafo(arvore_otimizada)
         
         economia = comprimento_total - comprimento_otimizado
         percentual_economia = (economia / comprimento_total) * 100 if comprimento_total > 0 else 0
@@ -89,14 +364,179 @@ class OtimizadorRotas:
             'economia_metros': economia,
             'economia_percentual': percentual_economia,
             'tempo_execucao_segundos': tempo,
-            'numero_nos_original': len(grafo_original.nodes),
-            'numero_arestas_original': len(grafo_original.edges),
-            'numero_arestas_otimizado': len(arvore_otimizada.edges),
-            'algoritmo_utilizado': self.algoritmo
+            'numero_nos_original': numero_nos,
+            'numero_arestas_original': numero_arestas,
+            'numero_arestas_otimizado': arestas_otimizado,
+            'algoritmo_utilizado': self.algoritmo,
+            'motor_mst': self.motor
         }
         
         print(f"Economia de distancia: {economia:.0f}m ({percentual_economia:.1f}%)")
-        print(f"Reducao de rotas: {len(grafo_original.edges)} -> {len(arvore_otimizada.edges)} arestas")
+        print(f"Reducao de rotas: {numero_arestas} -> {arestas_otimizado} arestas")
         print(f"Comprimento total: {comprimento_total/1000:.1f}km -> {comprimento_otimizado/1000:.1f}km")
         
-        return metricas
\ No newline at end of file
+        return metricas
+    
+    def _extensao(self, grafo):
+        """Soma dos pesos das arestas (NetworkX ou GrafoArrays)"""
+        if isinstance(grafo, GrafoArrays):
+            return float(np.sum(grafo.pesos_arestas(self.peso)))
+        return sum(data[self.peso] for _, _, data in grafo.edges(data=True))
+    
+    @perfilador.medir('carteiro', contagens=lambda resultado: {'passos': len(resultado[0])})
+    def calcular_rota_carteiro(self, grafo, inicio=None):
+        """
+        Rota fechada que percorre todas as ruas do grafo preparado (carteiro chines)
+        Retorna (rota, metricas); rota e a lista de passos (de, para, coleta) e
+        coleta=False marca as ruas percorridas de novo, sem coletar
+        """
+        print("Calculando rota de coleta (CARTEIRO CHINES)...")
+        
+        inicio_tempo = time.time()
+        
+        try:
+            grafo = como_networkx(grafo)
+            rota, resumo = rota_carteiro(
+                grafo, self.peso,
+                raio=self.raio_emparelhamento,
+                melhorias=self.melhorias_emparelhamento,
+                profundidade=self.profundidade_emparelhamento,
+                inicio=inicio
+            )
+        except Exception as e:
+            print(f"Erro no calculo da rota: {e}")
+            return None, None
+        
+        tempo_execucao = time.time() - inicio_tempo
+        
+        comprimento_total = resumo['comprimento_ruas']
+        deslocamento_vazio = resumo['deslocamento_vazio']
+        percentual_vazio = (deslocamento_vazio / comprimento_total) * 100 if comprimento_total > 0 else 0
+        
+        metricas = {
+            'comprimento_total_metros': comprimento_total,
+            'comprimento_rota_metros': comprimento_total + deslocamento_vazio,
+            'deslocamento_vazio_metros': deslocamento_vazio,
+            'deslocamento_vazio_percentual': percentual_vazio,
+            'tempo_execucao_segundos': tempo_execucao,
+            'numero_nos_original': len(grafo.nodes),
+            'numero_arestas_original': len(grafo.edges),
+            'numero_passos': len(rota),
+            'numero_nos_impares': resumo['nos_impares'],
+            'rodadas_emparelhamento': resumo['rodadas'],
+            'algoritmo_utilizado': 'carteiro',
+            'modo_rota': 'carteiro'
+        }
+        
+        print(f"Nos de grau impar emparelhados: {resumo['nos_impares']} "
+              f"({resumo['rodadas']} rodadas, {resumo['pares_candidatos']} pares candidatos)")
+        print(f"Rota: {len(rota)} passos, {metricas['comprimento_rota_metros']/1000:.1f}km "
+              f"(sem coleta: {deslocamento_vazio:.0f}m, {percentual_vazio:.1f}%)")
+        print(f"Rota calculada em {tempo_execucao:.3f} segundos")
+        return rota, metricas
+    
+    @perfilador.medir('distritos', contagens=lambda resultado: {'distritos': len(resultado[0] or [])})
+    def calcular_rotas_distritos(self, grafo):
+        """
+        Divide o grafo em um distrito por caminhao e otimiza cada distrito
+        (arvore ou carteiro, conforme MODO_ROTA) em um pool de processos
+        Retorna (grafos dos distritos, [(rota, metricas) de cada distrito], metricas gerais)
+        """
+        print(f"Dividindo o grafo em {self.caminhoes} distritos...")
+        
+        inicio = time.time()
+        
+        try:
+            grafo = como_networkx(grafo)
+            with perfilador.fase('particao'):
+                distritos, partidas = dividir_distritos(grafo, self.peso, self.caminhoes, self.garagens)
+        except Exception as e:
+            print(f"Erro na divisao em distritos: {e}")
+            return None, None, None
+        
+        # Abaixo de ARESTAS_MINIMAS_POOL_DISTRITOS o pool custa mais do que economiza
+        processos = min(self.processos_distritos or os.cpu_count() or 1, len(distritos))
+        if grafo.number_of_edges() < self.arestas_minimas_pool_distritos:
+            processos = 1
+        configuracao = {atributo: getattr(self, atributo) for atributo in ATRIBUTOS_DISTRITO}
+        if processos > 1:
+            print(f"Otimizando {len(distritos)} distritos em {processos} processos...")
+            with ProcessPoolExecutor(max_workers=processos) as pool:
+                resultados = list(pool.map(_otimizar_distrito, distritos, partidas,
+                                           [configuracao] * len(distritos)))
+        else:
+            print(f"Otimizando {len(distritos)} distritos em sequencia...")
+            resultados = [_otimizar_distrito(distrito, partida, configuracao)
+                          for distrito, partida in zip(distritos, partidas)]
+        
+        if any(rota is None for rota, _ in resultados):
+            print("Erro na otimizacao de um dos distritos")
+            return None, None, None
+        
+        tempo_execucao = time.time() - inicio
+        metricas = self._metricas_distritos(grafo, distritos, partidas, resultados, tempo_execucao)
+        
+        print(f"Distritos otimizados em {tempo_execucao:.3f} segundos")
+        return distritos, resultados, metricas
+    
+    def _metricas_distritos(self, grafo, distritos, partidas, resultados, tempo):
+        """Soma as metricas dos distritos e guarda as de cada caminhao em 'caminhoes'"""
+        caminhoes = []
+        for numero, (partida, (_, metricas)) in enumerate(zip(partidas, resultados), start=1):
+            caminhoes.append(dict(metricas, caminhao=numero, partida=partida))
+        
+        extensoes = [caminhao['comprimento_total_metros'] for caminhao in caminhoes]
+        comprimento_total = sum(extensoes)
+        media = comprimento_total / len(extensoes) if extensoes else 0
+        
+        metricas = {
+            'comprimento_total_metros': comprimento_total,
+            'tempo_execucao_segundos': tempo,
+            'numero_nos_original': len(grafo.nodes),
+            'numero_arestas_original': len(grafo.edges),
+            'numero_caminhoes': len(distritos),
+            'equilibrio_distritos': max(extensoes) / media if media > 0 else 1.0,
+            'caminhoes': caminhoes
+        }
+        
+        if self.modo == 'carteiro':
+            deslocamento_vazio = sum(caminhao['deslocamento_vazio_metros'] for caminhao in caminhoes)
+            metricas.update({
+                'comprimento_rota_metros': comprimento_total + deslocamento_vazio,
+                'deslocamento_vazio_metros': deslocamento_vazio,
+                'deslocamento_vazio_percentual': (deslocamento_vazio / comprimento_total) * 100 if comprimento_total > 0 else 0,
+                'numero_passos': sum(caminhao['numero_passos'] for caminhao in caminhoes),
+                'algoritmo_utilizado': 'carteiro',
+                'modo_rota': 'carteiro'
+            })
+        else:
+            comprimento_otimizado = sum(caminhao['comprimento_otimizado_metros'] for caminhao in caminhoes)
+            economia = comprimento_total - comprimento_otimizado
+            metricas.update({
+                'comprimento_otimizado_metros': comprimento_otimizado,
+                'economia_metros': economia,
+                'economia_percentual': (economia / comprimento_total) * 100 if comprimento_total > 0 else 0,
+                'numero_arestas_otimizado': sum(caminhao['numero_arestas_otimizado'] for caminhao in caminhoes),
+                'algoritmo_utilizado': self.algoritmo,
+                'motor_mst': self.motor
+            })
+        
+        for caminhao in caminhoes:
+            print(f"Caminhao {caminhao['caminhao']}: {caminhao['numero_arestas_original']} ruas, "
+                  f"{caminhao['comprimento_total_metros']/1000:.1f}km")
+        print(f"Equilibrio dos distritos (maior/media): {metricas['equilibrio_distritos']:.2f}")
+        
+        return metricas
+
+def _otimizar_distrito(distrito, partida, configuracao):
+    """
+    Otimiza um distrito sem saida de texto (executado nos processos do pool)
+    configuracao: atributos do otimizador usados na arvore ou no carteiro (ATRIBUTOS_DISTRITO)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        otimizador = OtimizadorRotas()
+        for atributo, valor in configuracao.items():
+            setattr(otimizador, atributo, valor)
+        if otimizador.modo == 'carteiro':
+            return otimizador.calcular_rota_carteiro(distrito, inicio=partida if partida in distrito else None)
+        return otimizador.calcular_rota_otimizada(distrito)
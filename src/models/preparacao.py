@@ -0,0 +1,74 @@
+"""
+MODULO DE PREPARACAO DO GRAFO EM VETORES
+Componentes conexos por union-find sobre os vetores de arestas e extracao
+do maior componente no proprio grafo, sem copiar a malha inteira
+"""
+import numpy as np
+
+def vetores_arestas(grafo, peso):
+    """
+    (nos, origem, destino, pesos) em um unico passe pelas arestas
+    Arestas sem o atributo de peso ficam com NaN
+    """
+    nos = list(grafo.nodes)
+    indice = {no: i for i, no in enumerate(nos)}
+
+    numero_arestas = grafo.number_of_edges()
+    origem = np.empty(numero_arestas, dtype=np.int64)
+    destino = np.empty(numero_arestas, dtype=np.int64)
+    pesos = np.empty(numero_arestas, dtype=np.float64)
+
+    for k, (u, v, valor) in enumerate(grafo.edges(data=peso, default=np.nan)):
+        origem[k] = indice[u]
+        destino[k] = indice[v]
+        pesos[k] = valor
+
+    return nos, origem, destino, pesos
+
+def componentes_union_find(numero_nos, origem, destino):
+    """
+    Rotulo do componente de cada no (o menor indice do componente)
+    Union-find vetorizado: a cada rodada, cada raiz e ligada a menor raiz vizinha
+    e os caminhos sao comprimidos por saltos de ponteiro (pai = pai[pai])
+    """
+    pai = np.arange(numero_nos, dtype=np.int64)
+    if len(origem) == 0:
+        return pai
+
+    while True:
+        raiz_u, raiz_v = pai[origem], pai[destino]
+        diferentes = raiz_u != raiz_v
+        if not diferentes.any():
+            return pai
+
+        raiz_u, raiz_v = raiz_u[diferentes], raiz_v[diferentes]
+        np.minimum.at(pai, np.maximum(raiz_u, raiz_v), np.minimum(raiz_u, raiz_v))
+
+        # Compressao completa: todo no passa a apontar direto para a raiz
+        while True:
+            avo = pai[pai]
+            if np.array_equal(avo, pai):
+                break
+            pai = avo
+
+def preencher_pesos(grafo, nos, origem, destino, pesos, peso, peso_padrao):
+    """Atribui peso_padrao apenas as arestas sem peso valido; retorna quantas foram"""
+    sem_peso = np.flatnonzero(~(pesos > 0))
+    for k in sem_peso.tolist():
+        grafo[nos[origem[k]]][nos[destino[k]]][peso] = peso_padrao
+    pesos[sem_peso] = peso_padrao
+    return len(sem_peso)
+
+def manter_maior_componente(grafo, nos, rotulos):
+    """
+    Remove do proprio grafo os nos fora do maior componente
+    Retorna (numero de componentes, nos do maior componente)
+    """
+    raizes, tamanhos = np.unique(rotulos, return_counts=True)
+    if len(raizes) <= 1:
+        return len(raizes), len(nos)
+
+    maior = raizes[np.argmax(tamanhos)]
+    fora = np.flatnonzero(rotulos != maior)
+    grafo.remove_nodes_from(nos[i] for i in fora.tolist())
+    return len(raizes), int(tamanhos.max())
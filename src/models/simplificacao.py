@@ -0,0 +1,109 @@
+"""
+MODULO DE SIMPLIFICACAO DO GRAFO
+Contrai cadeias de nos de grau 2 (pontos de forma no meio da rua)
+em uma unica aresta, guardando a geometria para expandir depois
+"""
+import networkx as nx
+
+# Atributos guardados na aresta contraida
+ATRIBUTOS_GEOMETRIA = ('origem', 'nos_intermediarios', 'coordenadas', 'comprimentos')
+
+def _chave_via(data):
+    return (data.get('osm_id'), data.get('name'), data.get('highway'))
+
+def _no_interno(grafo, no):
+    """No de grau 2 entre dois trechos da mesma via (pode ser removido)"""
+    if grafo.degree(no) != 2 or grafo.has_edge(no, no):
+        return False
+    (_, _, a), (_, _, b) = grafo.edges(no, data=True)
+    return _chave_via(a) == _chave_via(b)
+
+def simplificar_grafo(grafo, peso):
+    """
+    Contrai, no proprio grafo, as cadeias de nos internos entre dois cruzamentos
+    Cadeias que formariam laco ou aresta repetida sao mantidas
+    Retorna (grafo, numero de nos removidos)
+    """
+    removidos = 0
+
+    for inicio in list(grafo.nodes):
+        if inicio not in grafo or _no_interno(grafo, inicio):
+            continue
+
+        for vizinho in list(grafo.neighbors(inicio)):
+            if vizinho not in grafo or not _no_interno(grafo, vizinho):
+                continue
+
+            # Percorre a cadeia ate o proximo no que nao e interno
+            cadeia = [inicio]
+            anterior, atual = inicio, vizinho
+            while _no_interno(grafo, atual):
+                cadeia.append(atual)
+                a, b = grafo.neighbors(atual)
+                anterior, atual = atual, (b if a == anterior else a)
+            cadeia.append(atual)
+
+            fim = atual
+            if fim == inicio or grafo.has_edge(inicio, fim):
+                continue
+
+            trechos = [grafo[a][b] for a, b in zip(cadeia[:-1], cadeia[1:])]
+            intermediarios = cadeia[1:-1]
+
+            atributos = {
+                chave: valor for chave, valor in trechos[0].items()
+                if chave not in ATRIBUTOS_GEOMETRIA
+            }
+            atributos[peso] = sum(trecho[peso] for trecho in trechos)
+            atributos['comprimentos'] = [trecho.get('length', trecho[peso]) for trecho in trechos]
+            atributos['length'] = sum(atributos['comprimentos'])
+            atributos['origem'] = inicio
+            atributos['nos_intermediarios'] = intermediarios
+            atributos['coordenadas'] = [
+                (grafo.nodes[no].get('x'), grafo.nodes[no].get('y')) for no in intermediarios
+            ]
+
+            grafo.remove_nodes_from(intermediarios)
+            grafo.add_edge(inicio, fim, **atributos)
+            removidos += len(intermediarios)
+
+    return grafo, removidos
+
+def grafo_simplificado(grafo):
+    """Indica se alguma aresta do grafo e uma cadeia contraida"""
+    return any('nos_intermediarios' in data for _, _, data in grafo.edges(data=True))
+
+def expandir_arestas(grafo, data=True):
+    """
+    Itera sobre os trechos originais (u, v, atributos), expandindo as cadeias contraidas
+    Os nos intermediarios aparecem com suas coordenadas em atributos['coordenadas_trecho']
+    """
+    for u, v, atributos in grafo.edges(data=True):
+        if 'nos_intermediarios' not in atributos:
+            yield (u, v, atributos) if data else (u, v)
+            continue
+
+        inicio = atributos['origem']
+        fim = v if inicio == u else u
+        nos = [inicio] + list(atributos['nos_intermediarios']) + [fim]
+        if not data:
+            yield from zip(nos[:-1], nos[1:])
+            continue
+
+        base = {chave: valor for chave, valor in atributos.items() if chave not in ATRIBUTOS_GEOMETRIA}
+        for a, b, comprimento in zip(nos[:-1], nos[1:], atributos['comprimentos']):
+            trecho = dict(base)
+            trecho['length'] = comprimento
+            yield a, b, trecho
+
+def expandir_grafo(grafo):
+    """Recria o grafo com todos os nos e trechos originais (para desenhar e relatar)"""
+    expandido = nx.Graph()
+    expandido.add_nodes_from(grafo.nodes(data=True))
+
+    for _, _, atributos in grafo.edges(data=True):
+        for no, (x, y) in zip(atributos.get('nos_intermediarios', ()), atributos.get('coordenadas', ())):
+            expandido.add_node(no, x=x, y=y)
+
+    expandido.add_edges_from(expandir_arestas(grafo))
+    return expandido
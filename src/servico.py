@@ -0,0 +1,275 @@
+"""
+MODO SERVIÇO - OTIMIZAÇÃO SOB DEMANDA (HTTP/JSON)
+Processo de longa duração para a ferramenta de despacho: os grafos preparados e
+as rotas dos bairros pedidos por último ficam em memória (cache LRU limitado por
+MEMORIA_CACHE_GRAFOS_MB) e as respostas trazem as métricas da otimização sem
+desenhar nada; mapas e CSVs só são gerados (e matplotlib/pandas só são
+importados) quando pedidos
+
+Uso:
+    python servico.py                       # HOST_SERVICO:PORTA_SERVICO
+    python servico.py --porta 9000 --memoria-cache 2048
+    python servico.py --usar-snapshots      # bairros já coletados, sem rede
+
+Rotas:
+    GET  /saude                             # tempo de inicialização, cache e bibliotecas carregadas
+    GET  /otimizar?bairro=Ibituruna&relatorio=1
+    POST /otimizar {"bairro": "Ibituruna", "mapa": true, "relatorio": false}
+    POST /cache/limpar
+"""
+import time
+
+# Início do processo (antes das importações), para o tempo de inicialização
+INICIO_PROCESSO = time.perf_counter()
+
+import os
+
+# Sem janela: os mapas pedidos só são salvos (plt.show não bloqueia)
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import argparse
+import json
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from data.collector import ColetorDados
+from data.grafo_arrays import como_networkx
+from models.optimizer import OtimizadorRotas
+from utils.cache_grafos import CacheGrafos
+from utils.perfil import perfilador
+from config.settings import (HOST_SERVICO, PORTA_SERVICO, MEMORIA_CACHE_GRAFOS_MB,
+                             PASTA_RESULTADOS, PASTA_SERVICO)
+
+def _nome_pasta(nome_bairro):
+    return re.sub(r'[^\w-]+', '_', nome_bairro).strip('_') or 'bairro'
+
+def _sim(valor):
+    """Parâmetro booleano vindo da query string ou do JSON"""
+    if isinstance(valor, str):
+        return valor.strip().lower() in ('1', 'true', 'sim', 's', 'yes')
+    return bool(valor)
+
+def _valor_json(valor):
+    """Números do NumPy (e o que mais sobrar) nas métricas"""
+    return valor.item() if hasattr(valor, 'item') else str(valor)
+
+class ServicoOtimizacao:
+    """
+    Coletor e otimizador criados uma vez e reaproveitados entre as requisições
+    Os cálculos (e os mapas/CSVs) são feitos um de cada vez; as respostas que
+    saem do cache não esperam por eles
+    """
+    def __init__(self, memoria_cache_mb=MEMORIA_CACHE_GRAFOS_MB, pasta_resultados=None):
+        self.coletor = ColetorDados()
+        self.otimizador = OtimizadorRotas()
+        self.cache = CacheGrafos(memoria_cache_mb)
+        self.pasta_resultados = pasta_resultados or os.path.join(PASTA_RESULTADOS, PASTA_SERVICO)
+        self.inicializacao_segundos = None
+        self._inicio = time.perf_counter()
+        self._trava = threading.Lock()
+
+    def usar_snapshots(self):
+        """Responde com os bairros já coletados (snapshots), sem acessar a rede"""
+        self.coletor.usar_snapshots = True
+        self.otimizador.usar_snapshots = True
+
+    def otimizar(self, nome_bairro, mapa=False, relatorio=False):
+        """
+        Métricas da otimização do bairro (do cache ou calculadas agora)
+        mapa/relatorio também geram os arquivos na pasta do bairro
+        Retorna None se não for possível obter ou otimizar o grafo
+        """
+        inicio = time.perf_counter()
+        # O mapa/relatório de uma resposta do cache também registra fases no perfilador
+        perfilador.limpar()
+        entrada = self.cache.obter(nome_bairro)
+        origem = 'cache'
+
+        if entrada is None:
+            with self._trava:
+                # Outra requisição pode ter calculado o mesmo bairro enquanto esta esperava
+                entrada = self.cache.obter(nome_bairro)
+                if entrada is None:
+                    origem = 'calculado'
+                    entrada = self._calcular(nome_bairro)
+                    if entrada is None:
+                        return None
+                    self.cache.guardar(nome_bairro, entrada)
+
+        resposta = {'bairro': nome_bairro, 'origem': origem, 'metricas': entrada['metricas']}
+        if origem == 'calculado':
+            resposta['fases'] = entrada['fases']
+        if mapa or relatorio:
+            with self._trava:
+                resposta['arquivos'] = self._gerar_arquivos(nome_bairro, entrada, mapa, relatorio)
+        resposta['tempo_resposta_segundos'] = time.perf_counter() - inicio
+        return resposta
+
+    def _calcular(self, nome_bairro):
+        """Coleta (ou snapshot), preparação e otimização, como no main, sem visualização"""
+        otimizador = self.otimizador
+
+        with perfilador.fase('servico'):
+            grafo_preparado = otimizador.carregar_grafo_preparado(nome_bairro)
+            if grafo_preparado is None:
+                grafo_original = self.coletor.obter_arrays_bairro(nome_bairro)
+                # Os vetores da coleta não ficam presos ao coletor entre as requisições
+                self.coletor.ultimo_arrays = None
+                if grafo_original is None:
+                    return None
+                grafo_preparado = otimizador.preparar_grafo(grafo_original, nome_snapshot=nome_bairro)
+
+            distritos = None
+            if otimizador.caminhoes > 1:
+                distritos, rota, metricas = otimizador.calcular_rotas_distritos(grafo_preparado)
+            elif otimizador.modo == 'carteiro':
+                rota, metricas = otimizador.calcular_rota_carteiro(grafo_preparado)
+            else:
+                rota, metricas = otimizador.calcular_rota_otimizada(grafo_preparado)
+
+        if not rota:
+            return None
+        return {
+            'grafo': grafo_preparado,
+            'rota': rota,
+            'distritos': distritos,
+            'metricas': metricas,
+            'fases': {fase['fase']: fase.get('tempo_segundos') for fase in perfilador.fases}
+        }
+
+    def _gerar_arquivos(self, nome_bairro, entrada, mapa, relatorio):
+        """Mapa e/ou relatórios do bairro (importa o visualizador só aqui)"""
+        from utils.visualizer import Visualizador
+
+        pasta = os.path.join(self.pasta_resultados, _nome_pasta(nome_bairro))
+        visualizador = Visualizador(pasta_resultados=pasta)
+        # O cache guarda os vetores dos snapshots; o NetworkX só é montado para os arquivos
+        grafo, rota, distritos, metricas = (como_networkx(entrada['grafo']), como_networkx(entrada['rota']),
+                                           entrada['distritos'], entrada['metricas'])
+
+        if mapa:
+            if distritos is not None:
+                visualizador.criar_mapa_distritos(grafo, distritos, rota, metricas, nome_bairro)
+            elif metricas.get('modo_rota') == 'carteiro':
+                visualizador.criar_mapa_rota(grafo, rota, metricas, nome_bairro)
+            else:
+                visualizador.criar_mapa_comparativo(grafo, rota, metricas, nome_bairro)
+        if relatorio:
+            if distritos is not None:
+                visualizador.gerar_relatorio_distritos(distritos, rota, metricas, nome_bairro)
+            elif metricas.get('modo_rota') == 'carteiro':
+                visualizador.gerar_relatorio_rota(grafo, rota, nome_bairro)
+            else:
+                visualizador.gerar_relatorio_ruas(rota, nome_bairro)
+
+        # Só os arquivos desta requisição (a pasta guarda os de pedidos anteriores)
+        return visualizador.arquivos_gerados
+
+    def saude(self):
+        return {
+            'status': 'ok',
+            'inicializacao_segundos': self.inicializacao_segundos,
+            'ativo_ha_segundos': time.perf_counter() - self._inicio,
+            'modo_rota': self.otimizador.modo,
+            'caminhoes': self.otimizador.caminhoes,
+            'cache': self.cache.estatisticas(),
+            'bibliotecas': {nome: nome in sys.modules for nome in ('pandas', 'matplotlib')}
+        }
+
+class ManipuladorServico(BaseHTTPRequestHandler):
+    """Rotas HTTP; o serviço fica em self.server.servico"""
+
+    def do_GET(self):
+        rota = urlparse(self.path)
+        if rota.path == '/saude':
+            self._responder(200, self.server.servico.saude())
+        elif rota.path == '/otimizar':
+            self._otimizar({chave: valores[-1] for chave, valores in parse_qs(rota.query).items()})
+        else:
+            self._responder(404, {'erro': f"rota desconhecida: {rota.path}"})
+
+    def do_POST(self):
+        rota = urlparse(self.path)
+        try:
+            tamanho = int(self.headers.get('Content-Length') or 0)
+            pedido = json.loads(self.rfile.read(tamanho) or b'{}')
+        except ValueError as e:
+            self._responder(400, {'erro': f"JSON inválido: {e}"})
+            return
+        if not isinstance(pedido, dict):
+            self._responder(400, {'erro': "o corpo deve ser um objeto JSON"})
+            return
+
+        if rota.path == '/otimizar':
+            self._otimizar(pedido)
+        elif rota.path == '/cache/limpar':
+            self.server.servico.cache.limpar()
+            self._responder(200, {'status': 'ok'})
+        else:
+            self._responder(404, {'erro': f"rota desconhecida: {rota.path}"})
+
+    def _otimizar(self, pedido):
+        nome_bairro = str(pedido.get('bairro') or '').strip()
+        if not nome_bairro:
+            self._responder(400, {'erro': "informe o 'bairro'"})
+            return
+
+        try:
+            resposta = self.server.servico.otimizar(nome_bairro, mapa=_sim(pedido.get('mapa')),
+                                                    relatorio=_sim(pedido.get('relatorio')))
+        except Exception as e:
+            print(f" [ERRO] {nome_bairro}: {e}")
+            self._responder(500, {'erro': str(e)})
+            return
+
+        if resposta is None:
+            self._responder(502, {'erro': f"não foi possível obter ou otimizar o bairro '{nome_bairro}'"})
+            return
+        self._responder(200, resposta)
+
+    def _responder(self, status, corpo):
+        conteudo = json.dumps(corpo, ensure_ascii=False, default=_valor_json).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(conteudo)))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def log_message(self, formato, *args):
+        print(f" [HTTP] {self.address_string()} {formato % args}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço local de otimização de rotas (HTTP/JSON)")
+    parser.add_argument('--host', default=HOST_SERVICO, help="Endereço (padrão: HOST_SERVICO)")
+    parser.add_argument('--porta', type=int, default=PORTA_SERVICO, help="Porta (padrão: PORTA_SERVICO)")
+    parser.add_argument('--memoria-cache', type=float, default=MEMORIA_CACHE_GRAFOS_MB,
+                        help="Memória do cache de grafos em MB (padrão: MEMORIA_CACHE_GRAFOS_MB)")
+    parser.add_argument('--usar-snapshots', action='store_true',
+                        help="Usa os snapshots dos bairros já coletados (sem rede)")
+    argumentos = parser.parse_args()
+
+    servico = ServicoOtimizacao(memoria_cache_mb=argumentos.memoria_cache)
+    if argumentos.usar_snapshots:
+        servico.usar_snapshots()
+
+    servidor = ThreadingHTTPServer((argumentos.host, argumentos.porta), ManipuladorServico)
+    servidor.servico = servico
+    servico.inicializacao_segundos = time.perf_counter() - INICIO_PROCESSO
+
+    print("=" * 60)
+    print(f" SERVIÇO DE OTIMIZAÇÃO em http://{argumentos.host}:{servidor.server_port}")
+    print(f" Inicialização: {servico.inicializacao_segundos:.3f}s | cache: {argumentos.memoria_cache:.0f} MB")
+    print("=" * 60)
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando o serviço...")
+    finally:
+        servidor.server_close()
+
+if __name__ == "__main__":
+    main()
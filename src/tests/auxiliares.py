@@ -0,0 +1,179 @@
+"""
+AUXILIARES DOS TESTES
+Construção silenciosa do otimizador e das malhas sintéticas, referências
+lentas (emparelhamento exato, distância por aresta), dados alterados/recortes
+sintéticos e o servidor HTTP simulado; os benchmarks reaproveitam as mesmas
+referências e o mesmo servidor
+"""
+import contextlib
+import copy
+import io
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from data.collector import ColetorDados
+from data.geodesia import RAIO_TERRA_METROS
+from models.carteiro import nos_impares
+from models.optimizer import OtimizadorRotas
+from models.preparacao import vetores_arestas
+from benchmarks.sinteticos import gerar_resposta_planar
+
+# (profundidade, melhorias) do emparelhamento do carteiro: 0/0 = só guloso
+CONFIGURACOES_EMPARELHAMENTO = [(0, 0), (4, 2), (8, 2)]
+
+def silencioso(funcao, *args, **kwargs):
+    """Executa a função descartando o que ela imprime"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcao(*args, **kwargs)
+
+def criar_otimizador(**atributos):
+    """OtimizadorRotas sem simplificação nem snapshots (Kruskal), com os atributos trocados"""
+    otimizador = silencioso(OtimizadorRotas)
+    otimizador.algoritmo = 'kruskal'
+    otimizador.simplificar = False
+    otimizador.salvar_snapshots = False
+    for atributo, valor in atributos.items():
+        setattr(otimizador, atributo, valor)
+    return otimizador
+
+def construir_malha(numero_nos, remover=0.25, preparada=True):
+    """Malha planar sintética (gerar_resposta_planar), preparada pelo otimizador ou como coletada"""
+    grafo = ColetorDados(silencioso=True).construir_grafo_real(gerar_resposta_planar(numero_nos, remover=remover))
+    if preparada:
+        grafo = silencioso(criar_otimizador().preparar_grafo, grafo)
+    return grafo
+
+MAXIMO_IMPARES_EXATO = 400 # Acima disso o emparelhamento exato fica lento demais (~260 ímpares: ~9s)
+
+def deslocamento_exato(grafo, peso):
+    """Menor deslocamento sem coleta possível (emparelhamento perfeito de custo mínimo)"""
+    nos, origem, destino, pesos = vetores_arestas(grafo, peso)
+    impares = nos_impares(len(nos), origem, destino)
+    if len(impares) > MAXIMO_IMPARES_EXATO:
+        return None
+    matriz = coo_matrix((pesos, (origem, destino)), shape=(len(nos), len(nos))).tocsr()
+    distancias = dijkstra(matriz, directed=False, indices=impares)[:, impares]
+    completo = nx.Graph()
+    completo.add_weighted_edges_from(
+        (i, j, distancias[i, j]) for i in range(len(impares)) for j in range(i + 1, len(impares)))
+    return sum(distancias[i, j] for i, j in nx.min_weight_matching(completo))
+
+def distancia_laco(lat1, lon1, lat2, lon2):
+    """Cálculo por aresta em Python puro (referência do laço antigo)"""
+    fi1, fi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((fi2 - fi1) / 2) ** 2
+         + math.cos(fi1) * math.cos(fi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * RAIO_TERRA_METROS * math.asin(math.sqrt(min(a, 1.0)))
+
+def poligono_circular(centro_lon, centro_lat, raio, pontos=720):
+    """Polígono GeoJSON aproximando um círculo (com um buraco no meio)"""
+    angulos = np.linspace(0, 2 * np.pi, pontos, endpoint=False)
+    externo = [[centro_lon + raio * np.cos(a), centro_lat + raio * np.sin(a)] for a in angulos]
+    buraco = [[centro_lon + raio * 0.2 * np.cos(a), centro_lat + raio * 0.2 * np.sin(a)] for a in angulos[::-1]]
+    return {'type': 'Polygon', 'coordinates': [externo + externo[:1], buraco + buraco[:1]]}
+
+def alterar_resposta(resposta, fracao, semente=7):
+    """
+    Cópia da resposta com vias removidas, renomeadas, nós deslocados e vias novas
+    (ligando dois nós de uma via existente por um nó novo, e algumas soltas)
+    """
+    aleatorio = np.random.default_rng(semente)
+    resposta = copy.deepcopy(resposta)
+    nos = [e for e in resposta['elements'] if e['type'] == 'node']
+    vias = [e for e in resposta['elements'] if e['type'] == 'way']
+    quantidade = max(1, int(len(vias) * fracao))
+
+    sorteadas = aleatorio.permutation(len(vias))
+    removidas = set(sorteadas[:quantidade].tolist())
+    for k in sorteadas[quantidade:2 * quantidade].tolist():
+        vias[k]['tags'] = dict(vias[k]['tags'], name=f"{vias[k]['tags']['name']} (nova)")
+    for k in aleatorio.choice(len(nos), quantidade, replace=False).tolist():
+        nos[k]['lat'] += aleatorio.normal(0, 0.0001)
+        nos[k]['lon'] += aleatorio.normal(0, 0.0001)
+
+    coordenadas = {no['id']: (no['lat'], no['lon']) for no in nos}
+    proximo_no = max(coordenadas) + 1
+    proxima_via = max(via['id'] for via in vias) + 1
+    novos_nos, novas_vias = [], []
+    for k in sorteadas[2 * quantidade:3 * quantidade].tolist():
+        u, v = vias[k]['nodes'][0], vias[k]['nodes'][-1]
+        lat = (coordenadas[u][0] + coordenadas[v][0]) / 2 + aleatorio.normal(0, 0.0002)
+        lon = (coordenadas[u][1] + coordenadas[v][1]) / 2 + aleatorio.normal(0, 0.0002)
+        novos_nos.append({'type': 'node', 'id': proximo_no, 'lat': lat, 'lon': lon})
+        novas_vias.append({'type': 'way', 'id': proxima_via, 'nodes': [u, proximo_no, v],
+                           'tags': {'highway': 'residential', 'name': f'Rua Nova {proxima_via}'}})
+        proximo_no += 1
+        proxima_via += 1
+
+    # Vias soltas (fora da malha): saem com os componentes menores
+    for _ in range(max(1, quantidade // 10)):
+        lat, lon = coordenadas[nos[0]['id']]
+        novos_nos += [{'type': 'node', 'id': proximo_no, 'lat': lat - 0.01, 'lon': lon - 0.01},
+                      {'type': 'node', 'id': proximo_no + 1, 'lat': lat - 0.0105, 'lon': lon - 0.01}]
+        novas_vias.append({'type': 'way', 'id': proxima_via, 'nodes': [proximo_no, proximo_no + 1],
+                           'tags': {'highway': 'service', 'name': f'Acesso {proxima_via}'}})
+        proximo_no += 2
+        proxima_via += 1
+
+    resposta['elements'] = (nos + novos_nos
+                            + [via for k, via in enumerate(vias) if k not in removidas] + novas_vias)
+    return resposta
+
+class ServidorSimulado(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    contadores = {}
+    conexoes = set()
+    trava = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, status, corpo=b'{"elements": []}', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(corpo)))
+        for chave, valor in (headers or {}).items():
+            self.send_header(chave, valor)
+        self.end_headers()
+        try:
+            self.wfile.write(corpo)
+        except BrokenPipeError:
+            # O cliente desistiu (timeout) antes da resposta
+            pass
+
+    def do_GET(self):
+        with self.trava:
+            self.conexoes.add(self.client_address)
+            chamadas = self.contadores.get(self.path, 0) + 1
+            self.contadores[self.path] = chamadas
+
+        if self.path == '/ok':
+            self._responder(200)
+        elif self.path == '/lento':
+            time.sleep(1.0)
+            self._responder(200)
+        elif self.path == '/falha':
+            self._responder(503)
+        elif self.path == '/limite':
+            # Duas respostas 429 com Retry-After antes de liberar
+            if chamadas <= 2:
+                self._responder(429, b'{}', {'Retry-After': '1'})
+            else:
+                self._responder(200)
+        elif self.path == '/instavel':
+            self._responder(504 if chamadas <= 2 else 200)
+        else:
+            self._responder(404, b'{}')
+
+    def do_POST(self):
+        # Consultas do Overpass: o corpo é lido para não sobrar na conexão (keep-alive)
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.do_GET()
@@ -0,0 +1,37 @@
+"""
+CONFIGURAÇÃO DOS TESTES
+Os módulos do projeto são importados a partir de src/ (como em main.py),
+de qualquer pasta onde o pytest for chamado; malhas sintéticas compartilhadas
+entre os arquivos de teste
+"""
+import os
+import sys
+
+import pytest
+
+PASTA_SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PASTA_SRC not in sys.path:
+    sys.path.insert(0, PASTA_SRC)
+
+@pytest.fixture(scope='session')
+def malha_sintetica():
+    """
+    Fábrica de malhas planares: malha_sintetica(numero_nos, remover=0.25, preparada=True)
+    Cada combinação é construída uma vez na sessão; cada chamada recebe uma cópia
+    """
+    from tests.auxiliares import construir_malha
+
+    construidas = {}
+
+    def obter(numero_nos, remover=0.25, preparada=True):
+        chave = (numero_nos, remover, preparada)
+        if chave not in construidas:
+            construidas[chave] = construir_malha(numero_nos, remover, preparada)
+        return construidas[chave].copy()
+
+    return obter
+
+@pytest.fixture(scope='module')
+def grafo(request, malha_sintetica):
+    """Malha preparada com NUMERO_NOS nós (constante do arquivo de teste)"""
+    return malha_sintetica(request.module.NUMERO_NOS)
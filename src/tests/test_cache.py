@@ -0,0 +1,79 @@
+"""
+TESTES DO CACHE DE RESPOSTAS
+Validade (TTL), remoção das entradas usadas há mais tempo pelo limite de
+tamanho, entrada corrompida e modo offline sem a resposta no cache
+"""
+import gzip
+import os
+import time
+
+import pytest
+
+from data.cache import CacheRespostas
+from data.collector import ColetorDados
+
+def gravar_antiga(cache, chave, conteudo, idade):
+    """Entrada no formato do cache, gravada há 'idade' segundos"""
+    caminho = cache._caminho(chave)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with gzip.open(caminho, 'wb') as arquivo:
+        arquivo.write(f"{time.time() - idade}\n".encode('ascii'))
+        arquivo.write(conteudo)
+
+def test_entrada_expirada(tmp_path):
+    cache = CacheRespostas(pasta=str(tmp_path), ttl=60)
+    gravar_antiga(cache, 'velha', b'dados', idade=120)
+    cache.salvar('nova', b'dados')
+
+    assert cache.obter('velha') is None
+    # O modo offline aceita a entrada vencida
+    assert cache.obter('velha', ignorar_ttl=True) == b'dados'
+    assert cache.obter('nova') == b'dados'
+
+def test_limite_remove_as_usadas_ha_mais_tempo(tmp_path, capsys):
+    cache = CacheRespostas(pasta=str(tmp_path), ttl=0, tamanho_maximo_mb=10 / 1024, silencioso=True)
+    # Conteúdo aleatório: o gzip não reduz o tamanho (cerca de 4 kB por entrada)
+    for chave in ('a', 'b'):
+        cache.salvar(chave, os.urandom(4000))
+    os.utime(cache._caminho('a'), (1000, 1000))
+    os.utime(cache._caminho('b'), (2000, 2000))
+    assert cache.obter('a') is not None  # 'a' passa a ser a usada mais recentemente
+
+    cache.salvar('c', os.urandom(4000))
+
+    assert cache.obter('b') is None
+    assert cache.obter('a') is not None and cache.obter('c') is not None
+    assert sum(tamanho for _, tamanho, _ in cache.limite.listar()) <= cache.tamanho_maximo
+    assert capsys.readouterr().out == ''
+
+def test_total_em_memoria_acompanha_as_gravacoes(tmp_path):
+    cache = CacheRespostas(pasta=str(tmp_path), ttl=0, tamanho_maximo_mb=1)
+    for k in range(5):
+        cache.salvar(f"chave{k}", os.urandom(1000))
+    cache.salvar('chave0', os.urandom(2000))  # substitui: desconta a entrada anterior
+
+    assert cache.limite._tamanho_total == sum(tamanho for _, tamanho, _ in cache.limite.listar())
+
+def test_entrada_corrompida_e_descartada(tmp_path):
+    cache = CacheRespostas(pasta=str(tmp_path))
+    caminho = cache._caminho('quebrada')
+    os.makedirs(os.path.dirname(caminho))
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(b'nao e gzip')
+
+    assert cache.obter('quebrada') is None
+    assert not os.path.exists(caminho)
+
+def test_offline_sem_a_resposta_no_cache(tmp_path):
+    coletor = ColetorDados(silencioso=True)
+    coletor.cache = CacheRespostas(pasta=str(tmp_path), ttl=60)
+    coletor.modo_offline = True
+
+    with pytest.raises(RuntimeError, match='offline'):
+        coletor._obter_conteudo('GET', 'http://exemplo.invalido/api', params={'q': 1})
+
+    # Com a resposta guardada (mesmo vencida), nada vai à rede
+    chave = coletor.cache.gerar_chave('GET', 'http://exemplo.invalido/api', {'q': 1}, None)
+    gravar_antiga(coletor.cache, chave, b'{"ok": true}', idade=3600)
+    assert coletor._obter_conteudo('GET', 'http://exemplo.invalido/api', params={'q': 1}) == b'{"ok": true}'
+    assert coletor.ultima_resposta['do_cache']
@@ -0,0 +1,38 @@
+"""
+TESTES DO CACHE DE GRAFOS EM MEMÓRIA
+Ordem de uso (LRU), remoção das entradas usadas há mais tempo pelo limite de
+memória e valor maior que o limite inteiro
+"""
+import networkx as nx
+
+from utils.cache_grafos import BYTES_POR_ARESTA, BYTES_POR_NO, CacheGrafos, memoria_estimada
+
+def test_limite_remove_os_usados_ha_mais_tempo():
+    cache = CacheGrafos(memoria_maxima_mb=3000 / (1024 * 1024))
+    for chave in ('a', 'b', 'c'):
+        assert cache.guardar(chave, chave, memoria=1000)
+    assert cache.obter('a') == 'a'  # 'a' passa a ser o usado mais recentemente
+
+    assert cache.guardar('d', 'd', memoria=1000)
+
+    estatisticas = cache.estatisticas()
+    assert estatisticas['entradas'] == ['c', 'a', 'd']
+    assert cache.obter('b') is None
+    assert cache.memoria == 3000 and estatisticas['removidos'] == 1
+
+    # Substituir uma entrada desconta a memória anterior antes de remover outras
+    assert cache.guardar('c', 'c', memoria=2000)
+    assert cache.estatisticas()['entradas'] == ['d', 'c']
+    assert cache.memoria == 3000
+
+def test_valor_maior_que_o_limite():
+    cache = CacheGrafos(memoria_maxima_mb=3000 / (1024 * 1024))
+    cache.guardar('a', 'a', memoria=1000)
+
+    assert not cache.guardar('grande', 'grande', memoria=4000)
+    assert cache.obter('grande') is None
+    assert cache.obter('a') == 'a' and cache.memoria == 1000
+
+def test_memoria_estimada_de_um_grafo():
+    grafo = nx.path_graph(4)
+    assert memoria_estimada({'grafo': grafo}) == 4 * BYTES_POR_NO + 3 * BYTES_POR_ARESTA
@@ -0,0 +1,60 @@
+"""
+TESTES DA ROTA DO CARTEIRO CHINES
+Rota fechada, contínua e que coleta cada rua uma vez; deslocamento sem
+coleta nunca abaixo do emparelhamento exato; relatório da rota com as
+cadeias contraídas expandidas trecho a trecho
+"""
+import pytest
+
+from data.collector import ColetorDados
+from models.carteiro import rota_carteiro
+from models.simplificacao import grafo_simplificado
+from utils.visualizer import Visualizador
+from benchmarks.sinteticos import gerar_conteudo_overpass
+from tests.auxiliares import CONFIGURACOES_EMPARELHAMENTO, criar_otimizador, deslocamento_exato, silencioso
+
+NUMERO_NOS = 300
+
+@pytest.fixture(scope='module')
+def exato(grafo):
+    return deslocamento_exato(grafo, 'length')
+
+def rota_valida(grafo, rota):
+    """Rota fechada, sem saltos, que coleta cada rua exatamente uma vez"""
+    continua = all(rota[k][1] == rota[k + 1][0] for k in range(len(rota) - 1))
+    fechada = bool(rota) and rota[-1][1] == rota[0][0]
+    coletadas = [frozenset((u, v)) for u, v, coleta in rota if coleta]
+    return (continua and fechada and len(coletadas) == len(grafo.edges)
+            and set(coletadas) == {frozenset(aresta) for aresta in grafo.edges})
+
+@pytest.mark.parametrize('profundidade, melhorias', CONFIGURACOES_EMPARELHAMENTO)
+def test_rota_valida_e_acima_do_exato(grafo, exato, profundidade, melhorias):
+    rota, resumo = rota_carteiro(grafo, 'length', melhorias=melhorias, profundidade=profundidade)
+
+    assert rota_valida(grafo, rota)
+    assert resumo['deslocamento_vazio'] >= exato - 1e-6
+    repetidas = sum(grafo[u][v]['length'] for u, v, coleta in rota if not coleta)
+    assert repetidas == pytest.approx(resumo['deslocamento_vazio'])
+
+def test_rota_comeca_no_inicio_pedido(grafo):
+    inicio = list(grafo.nodes)[42]
+    rota, _ = rota_carteiro(grafo, 'length', inicio=inicio)
+    assert rota[0][0] == inicio and rota_valida(grafo, rota)
+
+def test_relatorio_da_rota_expande_as_cadeias(tmp_path):
+    # Malha com pontos de forma: o grafo simplificado tem cadeias contraídas
+    original = ColetorDados(silencioso=True).construir_grafo_real(gerar_conteudo_overpass(8, 8, pontos_forma=2))
+    referencia = silencioso(criar_otimizador().preparar_grafo, original.copy())
+    simplificado = silencioso(criar_otimizador(simplificar=True).preparar_grafo, original.copy())
+    rota, _ = rota_carteiro(simplificado, 'length')
+    df = silencioso(Visualizador(pasta_resultados=str(tmp_path)).gerar_relatorio_rota, simplificado, rota, 'Teste')
+
+    assert grafo_simplificado(simplificado)
+    # Cada linha é um trecho original, em sequência contínua, e toda rua é coletada uma vez
+    assert all(referencia.has_edge(u, v) for u, v in zip(df['De'], df['Para']))
+    assert (df['Para'].iloc[:-1].values == df['De'].iloc[1:].values).all()
+    coletadas = df[df['Coleta'] == 'Sim']
+    assert len(coletadas) == referencia.number_of_edges()
+    assert {frozenset(par) for par in zip(coletadas['De'], coletadas['Para'])} == \
+        {frozenset(aresta) for aresta in referencia.edges}
+    assert set(coletadas['ID_OSM']) == {data['osm_id'] for _, _, data in referencia.edges(data=True)}
@@ -0,0 +1,97 @@
+"""
+TESTES DO CLIENTE HTTP CONTRA UM SERVIDOR LOCAL SIMULADO
+Novas tentativas, Retry-After, troca de espelho, keep-alive e métricas limitadas
+"""
+from collections import deque
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+
+from data.cliente_http import ClienteHTTP, ErroHTTP
+from tests.auxiliares import ServidorSimulado
+
+@pytest.fixture(scope='module')
+def base():
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ServidorSimulado)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}"
+    servidor.shutdown()
+    servidor.server_close()
+
+@pytest.fixture
+def cliente():
+    ServidorSimulado.contadores.clear()
+    ServidorSimulado.conexoes.clear()
+    return ClienteHTTP({'User-Agent': 'Coleta/teste'}, timeout=0.5,
+                       tentativas=4, espera_base=0.01, espera_maxima=2)
+
+def tentativas_registradas(cliente):
+    return [(m['tentativa'], m['status']) for m in cliente.metricas]
+
+def test_troca_para_o_espelho_apos_503(base, cliente, capsys):
+    assert cliente.requisitar('GET', [f"{base}/falha", f"{base}/ok"]).status_code == 200
+    assert tentativas_registradas(cliente) == [(1, 503), (2, 200)]
+
+def test_429_respeita_retry_after(base, cliente, capsys):
+    assert cliente.requisitar('GET', f"{base}/limite").status_code == 200
+    assert ServidorSimulado.contadores['/limite'] == 3
+    # Duas esperas de pelo menos 1s (Retry-After), acima da espera exponencial de 0.01s
+    assert 'nova tentativa em 1.0s' in capsys.readouterr().out
+
+def test_timeout_troca_de_espelho(base, cliente, capsys):
+    assert cliente.requisitar('GET', [f"{base}/lento", f"{base}/ok"]).status_code == 200
+    assert cliente.metricas[0]['erro'] == 'ReadTimeout'
+
+def test_504_intermitente_recupera(base, cliente, capsys):
+    assert cliente.requisitar('GET', f"{base}/instavel").status_code == 200
+    assert ServidorSimulado.contadores['/instavel'] == 3
+
+def test_falha_permanente_esgota_as_tentativas(base, cliente, capsys):
+    with pytest.raises(ErroHTTP):
+        cliente.requisitar('GET', f"{base}/falha")
+    assert ServidorSimulado.contadores['/falha'] == 4
+
+def test_404_nao_e_repetido(base, cliente):
+    with pytest.raises(requests.HTTPError):
+        cliente.requisitar('GET', f"{base}/inexistente")
+    assert ServidorSimulado.contadores['/inexistente'] == 1
+
+def test_espelhos_em_rodizio(base, cliente, capsys):
+    # falha, instavel (504), falha, instavel (504): esgota as 4 tentativas alternando os espelhos
+    with pytest.raises(ErroHTTP):
+        cliente.requisitar('GET', [f"{base}/falha", f"{base}/instavel"])
+    assert ServidorSimulado.contadores == {'/falha': 2, '/instavel': 2}
+
+def test_aguardar_antes_de_cada_tentativa(base, cliente, capsys):
+    chamadas = []
+    cliente.requisitar('GET', f"{base}/instavel", aguardar=lambda: chamadas.append(1))
+    assert len(chamadas) == 3
+
+def test_keep_alive_reaproveita_a_conexao(base, cliente):
+    for _ in range(20):
+        cliente.requisitar('GET', f"{base}/ok")
+    assert len(ServidorSimulado.conexoes) == 1
+
+def test_resumo_das_metricas(base, cliente, capsys):
+    cliente.requisitar('GET', [f"{base}/falha", f"{base}/ok"])
+    resumo = cliente.resumo_metricas()
+    (host, dados), = resumo.items()
+    assert dados['requisicoes'] == 2 and dados['erros'] == 1
+
+def test_silencioso_sem_mensagens(base, capsys):
+    cliente = ClienteHTTP({'User-Agent': 'Coleta/teste'}, timeout=0.5, tentativas=4,
+                          espera_base=0.01, espera_maxima=2, silencioso=True)
+    cliente.requisitar('GET', [f"{base}/falha", f"{base}/ok"])
+    cliente.imprimir_metricas()
+    assert capsys.readouterr().out == ''
+
+def test_metricas_limitadas(base, cliente, monkeypatch):
+    monkeypatch.setattr(cliente, 'metricas', deque(maxlen=5))
+    for _ in range(12):
+        cliente.requisitar('GET', f"{base}/ok")
+    # Só as tentativas recentes ficam guardadas; os totais por host contam todas
+    assert len(cliente.metricas) == 5
+    (dados,) = cliente.resumo_metricas().values()
+    assert dados['requisicoes'] == 12 and dados['erros'] == 0
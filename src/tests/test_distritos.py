@@ -0,0 +1,70 @@
+"""
+TESTES DA DIVISÃO EM DISTRITOS
+Distritos conexos que dividem as ruas sem sobreposição, uma partida por
+garagem, recusa de grafos desconexos e distritos otimizados no pool iguais
+aos otimizados em sequência
+"""
+import networkx as nx
+import pytest
+
+from models.distritos import dividir_distritos
+from tests.auxiliares import criar_otimizador
+
+NUMERO_NOS = 3000
+
+def distritos_validos(grafo, distritos):
+    """Distritos conexos que dividem as ruas do grafo sem sobreposição"""
+    arestas = [frozenset(aresta) for distrito in distritos for aresta in distrito.edges]
+    return (all(nx.is_connected(distrito) for distrito in distritos)
+            and len(arestas) == len(grafo.edges)
+            and set(arestas) == {frozenset(aresta) for aresta in grafo.edges})
+
+@pytest.mark.parametrize('caminhoes', [1, 2, 4, 8])
+def test_distritos_validos(grafo, caminhoes):
+    distritos, partidas = dividir_distritos(grafo, 'length', caminhoes)
+
+    assert len(distritos) == len(partidas) == caminhoes
+    assert distritos_validos(grafo, distritos)
+    assert all(partida in distrito for partida, distrito in zip(partidas, distritos))
+
+def test_uma_partida_por_garagem(grafo):
+    nos = list(grafo.nodes)
+    garagens = [(grafo.nodes[no]['y'], grafo.nodes[no]['x']) for no in (nos[10], nos[-10])]
+    distritos, partidas = dividir_distritos(grafo, 'length', 5, garagens)
+
+    assert partidas == [nos[10], nos[-10]]
+    assert distritos_validos(grafo, distritos)
+
+def test_grafo_desconexo_recusado(grafo):
+    desconexo = grafo.copy()
+    desconexo.add_edge(-1, -2, length=10.0)
+    nx.set_node_attributes(desconexo, {-1: {'x': 0.0, 'y': 0.0}, -2: {'x': 0.1, 'y': 0.1}})
+
+    with pytest.raises(ValueError, match="conexo"):
+        dividir_distritos(desconexo, 'length', 2)
+
+@pytest.mark.parametrize('modo', ['arvore', 'carteiro'])
+def test_pool_igual_ao_sequencial(grafo, capsys, modo):
+    otimizador = criar_otimizador(modo=modo, caminhoes=3, arestas_minimas_pool_distritos=0)
+    resultados = {}
+    for processos in (1, 2):
+        otimizador.processos_distritos = processos
+        resultados[processos] = otimizador.calcular_rotas_distritos(grafo)
+    assert 'em 2 processos' in capsys.readouterr().out
+
+    (distritos, rotas, metricas), (distritos_pool, rotas_pool, metricas_pool) = resultados[1], resultados[2]
+    assert [set(d.edges) for d in distritos] == [set(d.edges) for d in distritos_pool]
+    for (rota, metricas_distrito), (rota_pool, metricas_distrito_pool) in zip(rotas, rotas_pool):
+        if modo == 'carteiro':
+            assert rota == rota_pool
+        else:
+            assert set(map(frozenset, rota.edges)) == set(map(frozenset, rota_pool.edges))
+        assert metricas_distrito['comprimento_total_metros'] == pytest.approx(
+            metricas_distrito_pool['comprimento_total_metros'])
+    assert metricas['comprimento_total_metros'] == pytest.approx(metricas_pool['comprimento_total_metros'])
+
+def test_grafo_pequeno_em_sequencia(grafo, capsys):
+    otimizador = criar_otimizador(caminhoes=2, processos_distritos=2)
+    assert grafo.number_of_edges() < otimizador.arestas_minimas_pool_distritos
+    otimizador.calcular_rotas_distritos(grafo)
+    assert 'em sequencia' in capsys.readouterr().out
@@ -0,0 +1,59 @@
+"""
+TESTES DO RECORTE ESPACIAL
+Índice em grade contra o teste direto e filtro de polígono do Overpass
+"""
+import numpy as np
+import pytest
+
+from data.espacial import (IndiceGrade, PONTOS_MINIMOS_INDICE, aneis_poligono, mascara_no_poligono,
+                           poligono_overpass, pontos_dentro)
+from tests.auxiliares import poligono_circular
+
+def poligono_estrela(vertices, centro=(-43.9, -16.75), raio=0.01, semente=3):
+    """Polígono em estrela com muitos vértices (contorno recortado, como um bairro real)"""
+    aleatorio = np.random.default_rng(semente)
+    angulos = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    raios = raio * np.where(np.arange(vertices) % 2 == 0, 1.0, 0.5) * aleatorio.uniform(0.9, 1.1, vertices)
+    anel = np.column_stack([centro[0] + raios * np.cos(angulos), centro[1] + raios * np.sin(angulos)])
+    return {'type': 'Polygon', 'coordinates': [anel.tolist() + anel[:1].tolist()]}
+
+def aneis_do_filtro(filtro):
+    """Anel (lon, lat) do filtro 'poly:"lat lon ..."'"""
+    valores = np.array(filtro[len('poly:"'):-1].split(), dtype=np.float64)
+    return [valores.reshape(-1, 2)[:, ::-1]]
+
+def pontos_aleatorios(quantidade, centro=(-43.9, -16.75), raio=0.012, semente=5):
+    aleatorio = np.random.default_rng(semente)
+    return (centro[0] + aleatorio.uniform(-raio, raio, quantidade),
+            centro[1] + aleatorio.uniform(-raio, raio, quantidade))
+
+@pytest.mark.parametrize('quantidade', [500, PONTOS_MINIMOS_INDICE + 5000])
+def test_indice_e_escolha_automatica_iguais_ao_teste_direto(quantidade):
+    aneis = aneis_poligono(poligono_circular(-43.9, -16.75, 0.008))
+    x, y = pontos_aleatorios(quantidade)
+
+    direto = pontos_dentro(x, y, aneis)
+    assert direto.any() and not direto.all()
+    np.testing.assert_array_equal(IndiceGrade(x, y).pontos_no_poligono(aneis), direto)
+    np.testing.assert_array_equal(mascara_no_poligono(x, y, aneis), direto)
+
+def test_filtro_pequeno_usa_o_anel_inteiro():
+    poligono = poligono_estrela(200)
+    assert len(aneis_do_filtro(poligono_overpass(poligono))[0]) == 201
+
+def test_filtro_grande_contem_o_poligono():
+    # Anel acima do limite: o filtro não pode cortar nenhum ponto de dentro do bairro
+    poligono = poligono_estrela(3000)
+    filtro = poligono_overpass(poligono, pontos_maximos=1000)
+    anel_filtro = aneis_do_filtro(filtro)
+    assert len(anel_filtro[0]) <= 1000
+
+    x, y = pontos_aleatorios(20000)
+    dentro_bairro = pontos_dentro(x, y, aneis_poligono(poligono))
+    assert dentro_bairro.any()
+    assert pontos_dentro(x[dentro_bairro], y[dentro_bairro], anel_filtro).all()
+
+def test_filtro_sem_poligono():
+    assert poligono_overpass(None) is None
+    assert poligono_overpass({'type': 'Point', 'coordinates': [-43.9, -16.75]}) is None
+    assert poligono_overpass({'type': 'MultiPolygon', 'coordinates': []}) is None
@@ -0,0 +1,52 @@
+"""
+TESTES DAS DISTÂNCIAS GEODÉSICAS
+Fórmulas vetorizadas contra distâncias conhecidas e contra o laço por aresta
+"""
+import math
+
+import numpy as np
+import pytest
+
+from data.geodesia import calcular_distancias, METODOS_DISTANCIA, RAIO_TERRA_METROS
+from tests.auxiliares import distancia_laco
+
+GRAU_METROS = RAIO_TERRA_METROS * math.pi / 180
+
+# (descrição, lat1, lon1, lat2, lon2, distância esperada em metros, tolerância em metros)
+DISTANCIAS_CONHECIDAS = [
+    ("1 grau de latitude", 0.0, 0.0, 1.0, 0.0, GRAU_METROS, 0.01),
+    ("1 grau de longitude no equador", 0.0, 0.0, 0.0, 1.0, GRAU_METROS, 0.01),
+    ("1 grau de longitude a 60 graus", 60.0, 0.0, 60.0, 1.0, 55596.9, 5.0),
+    ("Paris - Londres", 48.8566, 2.3522, 51.5074, -0.1278, 343556.0, 500.0),
+    ("100 m para o norte em Montes Claros", -16.7350, -43.8700, -16.7350 + 100 / GRAU_METROS, -43.8700, 100.0, 0.01),
+]
+
+@pytest.mark.parametrize('metodo', METODOS_DISTANCIA)
+@pytest.mark.parametrize('descricao, lat1, lon1, lat2, lon2, esperado, tolerancia', DISTANCIAS_CONHECIDAS,
+                         ids=[caso[0] for caso in DISTANCIAS_CONHECIDAS])
+def test_distancias_conhecidas(metodo, descricao, lat1, lon1, lat2, lon2, esperado, tolerancia):
+    # A aproximação plana só vale para trechos curtos
+    if metodo == 'equiretangular' and esperado > 10000:
+        pytest.skip("aproximação plana só para trechos curtos")
+    assert float(calcular_distancias(lat1, lon1, lat2, lon2, metodo=metodo)) == pytest.approx(esperado, abs=tolerancia)
+
+@pytest.mark.parametrize('metodo, tolerancia', [('haversine', 1e-6), ('equiretangular', 1e-3)])
+def test_vetorizado_igual_ao_laco(metodo, tolerancia):
+    aleatorio = np.random.default_rng(42)
+    lat1 = -16.75 + aleatorio.random(2000) * 0.05
+    lon1 = -43.90 + aleatorio.random(2000) * 0.05
+    lat2 = lat1 + (aleatorio.random(2000) - 0.5) * 0.002
+    lon2 = lon1 + (aleatorio.random(2000) - 0.5) * 0.002
+
+    laco = [distancia_laco(*valores) for valores in zip(lat1.tolist(), lon1.tolist(), lat2.tolist(), lon2.tolist())]
+    np.testing.assert_allclose(calcular_distancias(lat1, lon1, lat2, lon2, metodo=metodo), laco, atol=tolerancia)
+
+def test_longitude_escalada_pelo_cosseno():
+    # A fórmula antiga escalava a longitude por |lat| em vez de cos(lat)
+    lat = -16.735
+    esperado = 0.001 * GRAU_METROS * math.cos(math.radians(lat))
+    assert float(calcular_distancias(lat, -43.870, lat, -43.869)) == pytest.approx(esperado, rel=1e-6)
+
+def test_metodo_desconhecido():
+    with pytest.raises(ValueError):
+        calcular_distancias(0, 0, 0, 1, metodo='manhattan')
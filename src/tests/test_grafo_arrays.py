@@ -0,0 +1,72 @@
+"""
+TESTES DO CONSTRUTOR EM VETORES
+O construtor em vetores (ConstrutorGrafoArrays) contra o construtor original
+(_construir_grafo_dicts): mesmos nós, arestas e atributos, com vias antes dos
+nós, nós e vias repetidos entre tiles e vias que citam nós ausentes
+"""
+import json
+
+import pytest
+
+from data.collector import ColetorDados
+from benchmarks.sinteticos import gerar_resposta_planar
+
+def no(id_no, lat, lon):
+    return {'type': 'node', 'id': id_no, 'lat': lat, 'lon': lon}
+
+def via(id_via, nos, nome=None, highway='residential'):
+    tags = {'highway': highway}
+    if nome:
+        tags['name'] = nome
+    return {'type': 'way', 'id': id_via, 'nodes': nos, 'tags': tags}
+
+# Dois tiles vizinhos: vias antes dos nós, o nó 3 e a via 11 nos dois tiles,
+# nós 98/99 ausentes (no fim e no meio de uma via) e uma via sem tags
+TILES = [
+    {'elements': [
+        via(10, [1, 2, 3], 'Rua A'),
+        via(11, [3, 4, 99]),
+        no(1, -22.000, -43.000),
+        no(2, -22.001, -43.000),
+        no(3, -22.002, -43.000),
+    ]},
+    {'elements': [
+        no(3, -22.002, -43.000),
+        no(4, -22.002, -43.001),
+        no(5, -22.000, -43.002),
+        no(6, -22.001, -43.003),
+        via(11, [3, 4, 99]),
+        via(12, [4, 5, 98, 6], 'Rua B', 'tertiary'),
+        {'type': 'way', 'id': 13, 'nodes': [5, 6]},
+    ]},
+]
+
+def construir(construtor, dados):
+    coletor = ColetorDados(silencioso=True)
+    coletor.construtor_grafo = construtor
+    return coletor.construir_grafo_real(dados)
+
+def conferir_iguais(grafo, referencia):
+    assert dict(grafo.nodes(data=True)) == dict(referencia.nodes(data=True))
+    assert set(map(frozenset, grafo.edges)) == set(map(frozenset, referencia.edges))
+    for u, v, dados in referencia.edges(data=True):
+        atributos = dict(grafo[u][v])
+        assert atributos.pop('length') == pytest.approx(dados['length'])
+        assert atributos == {chave: valor for chave, valor in dados.items() if chave != 'length'}
+
+@pytest.mark.parametrize('bruto', [False, True])
+def test_tiles_com_repeticoes_e_nos_ausentes(bruto):
+    tiles = [json.dumps(tile).encode() for tile in TILES] if bruto else TILES
+    grafo = construir('arrays', tiles)
+    referencia = construir('dicts', tiles)
+
+    conferir_iguais(grafo, referencia)
+    # Trechos com nó ausente ficam de fora; nós sem via continuam no grafo
+    assert set(map(frozenset, grafo.edges)) == {
+        frozenset(par) for par in [(1, 2), (2, 3), (3, 4), (4, 5)]}
+    assert grafo[3][4]['name'] == 'Via_11'
+    assert grafo.has_node(6) and grafo.degree(6) == 0
+
+def test_resposta_sintetica():
+    resposta = gerar_resposta_planar(2000)
+    conferir_iguais(construir('arrays', resposta), construir('dicts', resposta))
@@ -0,0 +1,89 @@
+"""
+TESTES DA ATUALIZAÇÃO INCREMENTAL DA ÁRVORE
+Árvore atualizada em vetores contra a preparação + árvore completas do grafo
+novo (mesma extensão e mesmos nós) e volta ao cálculo completo quando falta
+algum snapshot da execução anterior
+"""
+import shutil
+
+import networkx as nx
+import pytest
+
+from data.collector import ColetorDados
+from data.grafo_arrays import GrafoArrays
+from data.snapshot import pasta_snapshot
+from benchmarks.sinteticos import gerar_resposta_planar
+from tests.auxiliares import alterar_resposta, criar_otimizador, silencioso
+
+@pytest.fixture
+def otimizador():
+    return criar_otimizador(motor='scipy', modo='arvore', caminhoes=1, incremental=True)
+
+@pytest.fixture(scope='module')
+def resposta():
+    return gerar_resposta_planar(3000)
+
+def coletar(resposta):
+    coletor = ColetorDados(silencioso=True)
+    coletor.construtor_grafo = 'arrays'
+    grafo = coletor.construir_grafo_real(resposta)
+    return grafo, coletor.ultimo_arrays
+
+def estado_inicial(otimizador, resposta):
+    _, coleta = coletar(resposta)
+    arvore, _ = silencioso(otimizador.calcular_rota_otimizada, silencioso(otimizador.preparar_grafo, coleta))
+    return {'coleta': coleta, 'arvore': arvore}
+
+@pytest.mark.parametrize('motor', ['scipy', 'kruskal_arrays'])
+@pytest.mark.parametrize('fracao', [0.002, 0.05])
+def test_atualizacao_igual_ao_recalculo(otimizador, resposta, motor, fracao):
+    otimizador.motor = motor
+    estado = estado_inicial(otimizador, resposta)
+    grafo_novo, arrays_novos = coletar(alterar_resposta(resposta, fracao))
+
+    grafo, arvore, metricas, alteracoes = silencioso(
+        otimizador.atualizar_rota_incremental, estado, grafo_novo, None, arrays_novos)
+
+    otimizador.preparacao = 'networkx'
+    referencia = silencioso(otimizador.preparar_grafo, nx.Graph(grafo_novo))
+    completa = nx.minimum_spanning_tree(referencia, weight='length')
+
+    assert isinstance(grafo, GrafoArrays) and isinstance(arvore, GrafoArrays)
+    incremental = arvore.para_networkx()
+    assert set(incremental.nodes) == set(completa.nodes)
+    assert nx.is_tree(incremental)
+    assert incremental.size(weight='length') == pytest.approx(completa.size(weight='length'))
+    assert metricas['comprimento_otimizado_metros'] == pytest.approx(completa.size(weight='length'))
+
+    # Vias marcadas na rota têm algum trecho na árvore nova
+    assert alteracoes and metricas['arestas_entraram_arvore'] > 0
+    vias_na_arvore = {data['osm_id'] for _, _, data in incremental.edges(data=True)}
+    assert all(osm_id in vias_na_arvore for osm_id, via in alteracoes.items() if via['na_rota'])
+    assert any(via['na_rota'] for via in alteracoes.values())
+
+def test_atualizacao_sem_mudancas_mantem_a_arvore(otimizador, resposta):
+    estado = estado_inicial(otimizador, resposta)
+    _, arrays_novos = coletar(resposta)
+
+    _, arvore, metricas, alteracoes = silencioso(
+        otimizador.atualizar_rota_incremental, estado, None, None, arrays_novos)
+
+    assert alteracoes == {}
+    assert metricas['arestas_entraram_arvore'] == metricas['arestas_sairam_arvore'] == 0
+    assert arvore.numero_arestas == estado['arvore'].numero_arestas
+
+@pytest.mark.parametrize('fase', ['coleta', 'preparado', 'arvore'])
+def test_snapshot_faltando_volta_ao_calculo_completo(tmp_path, monkeypatch, otimizador, resposta, fase):
+    monkeypatch.chdir(tmp_path)
+    otimizador.salvar_snapshots = True
+    coletor = ColetorDados(silencioso=True)
+    coletor.construtor_grafo = 'arrays'
+    grafo = coletor.construir_grafo_real(resposta)
+    coletor.salvar_grafo_snapshot('Teste', grafo)
+    preparado = silencioso(otimizador.preparar_grafo, coletor.ultimo_arrays, nome_snapshot='Teste')
+    arvore, _ = silencioso(otimizador.calcular_rota_otimizada, preparado)
+    silencioso(otimizador.salvar_arvore, arvore, 'Teste')
+
+    assert silencioso(otimizador.carregar_estado_anterior, 'Teste') is not None
+    shutil.rmtree(pasta_snapshot('Teste', fase))
+    assert silencioso(otimizador.carregar_estado_anterior, 'Teste') is None
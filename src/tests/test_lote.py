@@ -0,0 +1,84 @@
+"""
+TESTES DO MODO LOTE
+Downloads simultâneos em threads não podem trocar o sys.stdout do processo;
+lote completo com dois bairros sintéticos em cada modo (árvore, carteiro,
+distritos) e a tabela consolidada
+"""
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import lote
+from data.collector import ColetorDados
+from data.tiles import LimitadorTaxa
+from config.settings import (PASTA_RESULTADOS, PASTA_LOTE, NOME_METRICAS_LOTE, NOME_RELATORIO,
+                             NOME_ROTA, NOME_RELATORIO_DISTRITOS)
+from benchmarks.sinteticos import gerar_resposta_planar
+
+def test_downloads_simultaneos_nao_trocam_o_stdout(monkeypatch, capsys):
+    # Os dois downloads se sobrepõem: cada um espera o outro começar antes de terminar
+    barreira = threading.Barrier(2)
+
+    def buscar_coordenadas(coletor, nome_bairro=None):
+        coletor._exibir(f"Buscando coordenadas para: {nome_bairro}")
+        barreira.wait(timeout=5)
+        return [-16.76, -16.75, -43.91, -43.90]
+
+    def buscar_ruas(coletor, bbox, bruto=False, poligono=None):
+        coletor._exibir("  Buscando dados das ruas...")
+        time.sleep(0.01)
+        return b'{"elements": []}'
+
+    monkeypatch.setattr(ColetorDados, 'buscar_coordenadas_bairro', buscar_coordenadas)
+    monkeypatch.setattr(ColetorDados, 'buscar_dados_ruas', buscar_ruas)
+    stdout = sys.stdout
+
+    coletor = ColetorDados()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futuros = [executor.submit(lote.baixar_bairro, bairro, coletor.cliente, LimitadorTaxa(0))
+                   for bairro in ('A', 'B')]
+        resultados = [futuro.result() for futuro in futuros]
+
+    assert sys.stdout is stdout
+    assert all(conteudo == b'{"elements": []}' for conteudo, _ in resultados)
+    # Os downloads ficam em silêncio; o que o processo imprime depois continua aparecendo
+    print("LOTE CONCLUÍDO")
+    assert capsys.readouterr().out.splitlines()[-1] == "LOTE CONCLUÍDO"
+
+def test_coletor_silencioso(capsys):
+    ColetorDados(silencioso=True)._exibir("nada")
+    ColetorDados()._exibir("visível")
+    assert capsys.readouterr().out == "visível\n"
+
+@pytest.mark.parametrize('configuracao, relatorio', [
+    ({'modo': 'arvore', 'caminhoes': 1}, NOME_RELATORIO),
+    ({'modo': 'carteiro', 'caminhoes': 1}, NOME_ROTA),
+    ({'modo': 'arvore', 'caminhoes': 2}, NOME_RELATORIO_DISTRITOS),
+])
+def test_lote_com_dois_bairros(tmp_path, monkeypatch, capsys, configuracao, relatorio):
+    monkeypatch.chdir(tmp_path)
+    respostas = {'Norte': gerar_resposta_planar(300), 'Sul': gerar_resposta_planar(500, semente=7)}
+
+    # Sem rede: a coleta devolve o conteúdo bruto das malhas sintéticas
+    def baixar(nome_bairro, cliente, limitador):
+        return json.dumps(respostas[nome_bairro]).encode(), None
+
+    monkeypatch.setattr(lote, 'baixar_bairro', baixar)
+    df = lote.executar_lote(list(respostas), processos=2, downloads=2,
+                            configuracao=dict(configuracao, algoritmo='kruskal'))
+
+    pasta_lote = tmp_path / PASTA_RESULTADOS / PASTA_LOTE
+    consolidado = pd.read_csv(pasta_lote / NOME_METRICAS_LOTE)
+    assert list(consolidado['bairro']) == ['Norte', 'Sul']
+    assert (consolidado['status'] == 'ok').all()
+    assert (consolidado['comprimento_total_metros'] > 0).all()
+    assert list(df['bairro']) == ['Norte', 'Sul']
+    for bairro in respostas:
+        assert (pasta_lote / bairro / 'log.txt').exists()
+        assert (pasta_lote / bairro / relatorio).exists()
+    assert 'LOTE CONCLUÍDO: 2/2 bairros' in capsys.readouterr().out
@@ -0,0 +1,94 @@
+"""
+TESTES DA MATRIZ DE DISTÂNCIAS
+Dijkstra em lotes contra nx.shortest_path_length, distância de acesso,
+snapshot (GrafoArrays), lotes no pool de processos e cache em disco com
+limite de tamanho
+"""
+import contextlib
+import io
+import os
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from data.snapshot import grafo_para_arrays, salvar_snapshot
+from models.matriz_distancias import MatrizDistancias
+
+NUMERO_NOS = 2000
+
+@pytest.fixture(scope='module')
+def pontos(grafo):
+    lat = np.array([data['y'] for _, data in grafo.nodes(data=True)])
+    lon = np.array([data['x'] for _, data in grafo.nodes(data=True)])
+    gerador = np.random.default_rng(0)
+    return np.column_stack([gerador.uniform(lat.min(), lat.max(), 60), gerador.uniform(lon.min(), lon.max(), 60)])
+
+def calcular(matriz_distancias, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return matriz_distancias.calcular(*args, **kwargs)
+
+@pytest.fixture
+def matriz_distancias(grafo, tmp_path):
+    matriz_distancias = MatrizDistancias(grafo)
+    matriz_distancias.pasta_cache = tmp_path
+    matriz_distancias.processos = 1
+    return matriz_distancias
+
+def test_lotes_igual_ao_networkx(grafo, pontos, matriz_distancias):
+    # Lotes pequenos: várias chamadas de Dijkstra
+    matriz_distancias.memoria_lote_mb = 0.1
+    matriz = calcular(matriz_distancias, pontos[:10], pontos, incluir_acesso=False)
+    indices, _ = matriz_distancias.ajustar(pontos)
+    nos = matriz_distancias.nos
+
+    assert matriz.shape == (10, len(pontos))
+    for i in range(10):
+        distancias = nx.single_source_dijkstra_path_length(grafo, nos[indices[i]], weight='length')
+        assert np.allclose(matriz[i], [distancias[nos[indice]] for indice in indices])
+
+def test_acesso_somado_nas_pontas(pontos, matriz_distancias):
+    sem_acesso = calcular(matriz_distancias, pontos[:5], pontos, incluir_acesso=False)
+    com_acesso = calcular(matriz_distancias, pontos[:5], pontos)
+    _, acesso = matriz_distancias.ajustar(pontos)
+    assert np.allclose(com_acesso, sem_acesso + acesso[:5, None] + acesso[None, :])
+
+def test_snapshot_igual_ao_grafo(grafo, pontos, matriz_distancias, tmp_path):
+    salvar_snapshot(grafo_para_arrays(grafo, 'length'), tmp_path / 'preparado')
+    do_snapshot = MatrizDistancias.de_snapshot(tmp_path / 'preparado')
+    do_snapshot.usar_cache = False
+
+    assert np.allclose(calcular(do_snapshot, pontos[:5], pontos), calcular(matriz_distancias, pontos[:5], pontos))
+
+def test_cache_em_disco(pontos, matriz_distancias, tmp_path):
+    matriz = calcular(matriz_distancias, pontos[:5], pontos)
+    assert len(list(tmp_path.glob('*.npy'))) == 1
+
+    matriz_distancias.matriz = None  # sem o grafo: só o cache pode responder
+    assert np.array_equal(calcular(matriz_distancias, pontos[:5], pontos), matriz)
+
+def test_pool_igual_ao_sequencial(pontos, matriz_distancias):
+    matriz_distancias.memoria_lote_mb = 0.1
+    sequencial = calcular(matriz_distancias, pontos[:10], pontos, incluir_acesso=False)
+
+    matriz_distancias.usar_cache = False
+    matriz_distancias.processos = 2
+    assert np.allclose(calcular(matriz_distancias, pontos[:10], pontos, incluir_acesso=False), sequencial)
+
+def test_limite_remove_as_usadas_ha_mais_tempo(pontos, matriz_distancias, tmp_path):
+    # Cada matriz 5 x 60 ocupa 2528 bytes; cabem duas no limite
+    matriz_distancias.tamanho_maximo_cache_mb = 6000 / (1024 * 1024)
+    grupos = [pontos[:5], pontos[5:10], pontos[10:15]]
+    calcular(matriz_distancias, grupos[0], pontos)
+    (antiga,) = tmp_path.glob('*.npy')
+    calcular(matriz_distancias, grupos[1], pontos)
+    (recente,) = set(tmp_path.glob('*.npy')) - {antiga}
+    os.utime(antiga, (1000, 1000))
+    os.utime(recente, (2000, 2000))
+    calcular(matriz_distancias, grupos[0], pontos)  # leitura do cache: a primeira volta a ser a mais recente
+
+    calcular(matriz_distancias, grupos[2], pontos)
+
+    restantes = set(tmp_path.glob('*.npy'))
+    assert len(restantes) == 2 and recente not in restantes and antiga in restantes
+    assert sum(caminho.stat().st_size for caminho in restantes) <= 6000
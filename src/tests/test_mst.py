@@ -0,0 +1,75 @@
+"""
+TESTES DOS MOTORES DE ARVORE GERADORA MINIMA
+Os motores em vetores contra nx.minimum_spanning_tree (peso e arestas)
+"""
+import contextlib
+import io
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from models.mst_esparso import mst_kruskal_arrays, mst_scipy
+from models.optimizer import OtimizadorRotas
+from benchmarks.sinteticos import gerar_grafo_grade
+
+CONFIGURACOES = [
+    ('networkx', 'prim'),
+    ('networkx', 'kruskal'),
+    ('scipy', 'kruskal'),
+    ('kruskal_arrays', 'kruskal'),
+]
+
+def arestas(arvore):
+    return {(min(u, v), max(u, v)) for u, v in arvore.edges}
+
+def extensao(arvore):
+    return sum(data['length'] for _, _, data in arvore.edges(data=True))
+
+@pytest.fixture(scope='module')
+def otimizador():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return OtimizadorRotas()
+
+@pytest.fixture(scope='module')
+def grade():
+    return gerar_grafo_grade(30, 30)
+
+def calcular(otimizador, grafo, motor, algoritmo):
+    otimizador.motor, otimizador.algoritmo = motor, algoritmo
+    with contextlib.redirect_stdout(io.StringIO()):
+        return otimizador.calcular_rota_otimizada(grafo)
+
+@pytest.mark.parametrize('motor, algoritmo', CONFIGURACOES)
+def test_motor_igual_ao_networkx(otimizador, grade, motor, algoritmo):
+    referencia = nx.minimum_spanning_tree(grade, weight='length', algorithm='kruskal')
+    arvore, metricas = calcular(otimizador, grade, motor, algoritmo)
+
+    # Pesos sintéticos são distintos, então a árvore mínima é única
+    assert arestas(arvore) == arestas(referencia)
+    assert metricas['comprimento_otimizado_metros'] == pytest.approx(extensao(referencia))
+    assert metricas['numero_arestas_otimizado'] == len(grade) - 1
+    # A árvore mantém os atributos das arestas do grafo original
+    u, v = next(iter(arvore.edges))
+    assert arvore[u][v] == grade[u][v]
+
+@pytest.mark.parametrize('motor', ['scipy', 'kruskal_arrays'])
+def test_floresta_em_grafo_desconexo(otimizador, grade, motor):
+    grafo = nx.disjoint_union(grade, gerar_grafo_grade(5, 5))
+    referencia = nx.minimum_spanning_tree(grafo, weight='length')
+    arvore, _ = calcular(otimizador, grafo, motor, 'kruskal')
+
+    assert len(arvore.edges) == len(grafo) - 2
+    assert extensao(arvore) == pytest.approx(extensao(referencia))
+
+def test_funcoes_sobre_vetores():
+    # Triângulo + aresta solta: a mais pesada do triângulo fica de fora
+    origem = np.array([0, 1, 0, 3])
+    destino = np.array([1, 2, 2, 4])
+    pesos = np.array([1.0, 2.0, 3.0, 1.5])
+    for motor in (mst_scipy, mst_kruskal_arrays):
+        assert sorted(motor(5, origem, destino, pesos).tolist()) == [0, 1, 3]
+
+def test_scipy_rejeita_peso_zero():
+    with pytest.raises(ValueError):
+        mst_scipy(2, np.array([0]), np.array([1]), np.array([0.0]))
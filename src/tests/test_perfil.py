@@ -0,0 +1,33 @@
+"""
+TESTES DO PERFIL DE FASES
+O tracemalloc só fica ligado enquanto houver fase medindo memória
+"""
+import tracemalloc
+
+from utils.perfil import Perfilador
+
+def test_memoria_desligada_nao_liga_o_tracemalloc():
+    perfilador = Perfilador(ativo=True, memoria=False)
+    with perfilador.fase('total'):
+        assert not tracemalloc.is_tracing()
+    assert perfilador.fases[0]['pico_memoria_mb'] is None
+
+def test_tracemalloc_desligado_ao_fim_da_fase_mais_externa():
+    perfilador = Perfilador(ativo=True, memoria=True)
+    with perfilador.fase('total'):
+        with perfilador.fase('coleta'):
+            dados = [0] * 100_000
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    assert perfilador.fases[1]['pico_memoria_mb'] > 0.5
+    del dados
+
+def test_tracemalloc_de_fora_continua_ligado():
+    perfilador = Perfilador(ativo=True, memoria=True)
+    tracemalloc.start()
+    try:
+        with perfilador.fase('total'):
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,59 @@
+"""
+TESTES DA PREPARAÇÃO EM VETORES
+Componentes por union-find contra nx.connected_components e a preparação
+'vetores' contra a original em NetworkX (mesmos nós, arestas e pesos)
+"""
+import networkx as nx
+import numpy as np
+import pytest
+
+from models.preparacao import componentes_union_find, manter_maior_componente, vetores_arestas
+from tests.auxiliares import criar_otimizador, silencioso
+
+@pytest.fixture(scope='module')
+def base(malha_sintetica):
+    """Malha planar com metade das arestas removidas (muitos componentes) e pesos faltando"""
+    grafo = malha_sintetica(5000, remover=0.5, preparada=False)
+    for k, (u, v) in enumerate(grafo.edges):
+        if k % 50 == 0:
+            del grafo[u][v]['length']
+    return grafo
+
+def particao(rotulos, nos):
+    grupos = {}
+    for no, rotulo in zip(nos, rotulos.tolist()):
+        grupos.setdefault(rotulo, set()).add(no)
+    return {frozenset(grupo) for grupo in grupos.values()}
+
+def test_union_find_igual_ao_networkx(base):
+    nos, origem, destino, _ = vetores_arestas(base, 'length')
+    rotulos = componentes_union_find(len(nos), origem, destino)
+
+    assert particao(rotulos, nos) == {frozenset(c) for c in nx.connected_components(base)}
+    # O rótulo é o menor índice do componente
+    assert np.all(rotulos <= np.arange(len(nos)))
+
+def test_union_find_sem_arestas():
+    vazio = np.empty(0, dtype=np.int64)
+    assert componentes_union_find(4, vazio, vazio).tolist() == [0, 1, 2, 3]
+
+def test_manter_maior_componente_no_proprio_grafo(base):
+    grafo = base.copy()
+    nos, origem, destino, _ = vetores_arestas(grafo, 'length')
+    componentes, nos_maior = manter_maior_componente(grafo, nos, componentes_union_find(len(nos), origem, destino))
+
+    maior = max(nx.connected_components(base), key=len)
+    assert componentes == nx.number_connected_components(base)
+    assert nos_maior == len(maior) and set(grafo.nodes) == maior
+
+def test_preparacao_vetores_igual_a_networkx(base):
+    preparados = {
+        modo: silencioso(criar_otimizador(preparacao=modo).preparar_grafo, base.copy())
+        for modo in ('networkx', 'vetores')
+    }
+
+    referencia, vetores = preparados['networkx'], preparados['vetores']
+    assert set(vetores.nodes) == set(referencia.nodes)
+    assert vetores.number_of_edges() == referencia.number_of_edges()
+    assert all(vetores.has_edge(u, v) and vetores[u][v] == data for u, v, data in referencia.edges(data=True))
+    assert all(data['length'] > 0 for _, _, data in vetores.edges(data=True))
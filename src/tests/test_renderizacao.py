@@ -0,0 +1,42 @@
+"""
+TESTES DO RENDERIZADOR RÁPIDO
+Mapa de uma malha pequena desenhado com o Agg, com os painéis em sequência e
+em processos paralelos, gravado em PNG
+"""
+import networkx as nx
+import numpy as np
+import pytest
+
+from utils.renderizacao import (indice_coordenadas, linha_unica, pontos_amostrados, salvar_mapa,
+                                segmentos_grafo)
+from benchmarks.sinteticos import gerar_grafo_grade
+
+ESTILO = {'largura_linha': 1, 'tamanho_ponto': 5}
+
+@pytest.fixture(scope='module')
+def paineis():
+    grafo = gerar_grafo_grade(8, 8)
+    arvore = nx.minimum_spanning_tree(grafo, weight='length')
+    indice, x, y = indice_coordenadas(grafo)
+    return [
+        (segmentos_grafo(g, indice, x, y), pontos_amostrados(g.nodes, indice, x, y, 0), cor, titulo)
+        for g, cor, titulo in [(grafo, 'blue', 'Rede'), (arvore, 'red', 'Rota')]
+    ]
+
+def test_linha_unica_separa_os_trechos_por_nan(paineis):
+    segmentos = paineis[0][0]
+    x, y = linha_unica(segmentos)
+    assert len(x) == 3 * len(segmentos)
+    assert np.isnan(x[2::3]).all() and np.isnan(y[2::3]).all()
+    assert np.array_equal(x[0::3], segmentos[:, 0, 0])
+
+@pytest.mark.parametrize('paralelo', [False, True])
+def test_mapa_gravado_em_png(tmp_path, monkeypatch, paineis, paralelo):
+    # Com um só núcleo salvar_mapa desenha em sequência: o pool é exercitado mesmo assim
+    monkeypatch.setattr('utils.renderizacao.os.cpu_count', lambda: 2)
+    caminho = tmp_path / 'mapa.png'
+    salvar_mapa(str(caminho), paineis, 'Teste', ESTILO, paralelo=paralelo, dpi=40)
+
+    with open(caminho, 'rb') as arquivo:
+        assert arquivo.read(8) == b'\x89PNG\r\n\x1a\n'
+    assert caminho.stat().st_size > 1000
@@ -0,0 +1,40 @@
+"""
+TESTES DO MODO SERVIÇO
+A resposta lista só os arquivos gerados pela própria requisição, não o que já
+estava na pasta do bairro, e as fases do perfilador não se acumulam entre as
+requisições
+"""
+from data.collector import ColetorDados
+from servico import ServicoOtimizacao
+from config.settings import NOME_MAPA, NOME_RELATORIO
+from benchmarks.sinteticos import gerar_resposta_planar
+from utils.perfil import perfilador
+from tests.auxiliares import silencioso
+
+def test_arquivos_so_da_requisicao(tmp_path, monkeypatch):
+    # Snapshot da coleta com caminho relativo: sem rede
+    monkeypatch.chdir(tmp_path)
+    coletor = ColetorDados(silencioso=True)
+    coletor.salvar_grafo_snapshot('Teste', coletor.construir_grafo_real(gerar_resposta_planar(2000)))
+
+    servico = silencioso(ServicoOtimizacao, pasta_resultados=str(tmp_path / 'resultados'))
+    servico.usar_snapshots()
+    servico.otimizador.algoritmo = servico.otimizador.algoritmo or 'kruskal'
+    servico.otimizador.modo, servico.otimizador.caminhoes = 'arvore', 1
+
+    pasta = tmp_path / 'resultados' / 'Teste'
+    pasta.mkdir(parents=True)
+    (pasta / 'pedido_anterior.csv').write_text('')
+
+    resposta = silencioso(servico.otimizar, 'Teste', relatorio=True)
+    assert resposta['arquivos'] == [str(pasta / NOME_RELATORIO)]
+
+    resposta = silencioso(servico.otimizar, 'Teste', mapa=True)
+    assert resposta['origem'] == 'cache'
+    assert resposta['arquivos'] == [str(pasta / NOME_MAPA)]
+    assert (pasta / NOME_RELATORIO).exists()
+    fases = len(perfilador.fases)
+    silencioso(servico.otimizar, 'Teste', mapa=True)
+    assert len(perfilador.fases) == fases
+
+    assert 'arquivos' not in silencioso(servico.otimizar, 'Teste')
@@ -0,0 +1,54 @@
+"""
+TESTES DA SIMPLIFICAÇÃO DO GRAFO
+Ida e volta de uma cadeia e de um ciclo: comprimento total mantido, grau dos
+cruzamentos mantido e expansão devolvendo os trechos originais (nome e osm_id)
+"""
+import networkx as nx
+import pytest
+
+from models.simplificacao import expandir_arestas, expandir_grafo, grafo_simplificado, simplificar_grafo
+
+def adicionar_via(grafo, nos, osm_id, nome):
+    for u, v in zip(nos[:-1], nos[1:]):
+        grafo.add_edge(u, v, length=10.0 + u + v, name=nome, highway='residential', osm_id=osm_id)
+
+def montar_grafo():
+    grafo = nx.Graph()
+    # Cadeia 1-2-3-4-5 entre dois cruzamentos, ciclo 5-30-31-32-5 que volta
+    # ao cruzamento e um segundo caminho 1-40-41-5 (aresta repetida 1-5)
+    adicionar_via(grafo, [1, 2, 3, 4, 5], 10, 'Rua A')
+    adicionar_via(grafo, [5, 30, 31, 32, 5], 11, 'Rua B')
+    adicionar_via(grafo, [1, 40, 41, 5], 12, 'Rua C')
+    adicionar_via(grafo, [100, 1], 13, 'Rua D')
+    for no in grafo.nodes:
+        grafo.nodes[no].update(x=-43.0 + no * 1e-4, y=-22.0 - no * 1e-4)
+    return grafo
+
+def test_ida_e_volta():
+    original = montar_grafo()
+    simplificado, removidos = simplificar_grafo(original.copy(), 'length')
+
+    assert removidos == 3
+    assert grafo_simplificado(simplificado)
+    assert simplificado.size(weight='length') == pytest.approx(original.size(weight='length'))
+    # Cruzamentos e pontas mantêm o grau; o ciclo e o caminho repetido não são contraídos
+    for no in simplificado.nodes:
+        assert simplificado.degree(no) == original.degree(no)
+    assert {30, 31, 32, 40, 41} <= set(simplificado.nodes)
+    assert not {2, 3, 4} & set(simplificado.nodes)
+
+    contraida = simplificado[1][5]
+    assert contraida['nos_intermediarios'] in ([2, 3, 4], [4, 3, 2])
+    assert (contraida['name'], contraida['osm_id']) == ('Rua A', 10)
+
+    expandido = expandir_grafo(simplificado)
+    assert dict(expandido.nodes(data=True)) == dict(original.nodes(data=True))
+    assert set(map(frozenset, expandido.edges)) == set(map(frozenset, original.edges))
+    for u, v, dados in original.edges(data=True):
+        trecho = expandido[u][v]
+        assert (trecho['name'], trecho['osm_id']) == (dados['name'], dados['osm_id'])
+        assert trecho['length'] == pytest.approx(dados['length'])
+        assert 'nos_intermediarios' not in trecho
+
+    assert sorted(map(sorted, expandir_arestas(simplificado, data=False))) == \
+        sorted(map(sorted, original.edges))
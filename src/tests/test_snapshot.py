@@ -0,0 +1,111 @@
+"""
+TESTES DOS SNAPSHOTS E DO CAMINHO EM VETORES
+Ida e volta do snapshot (coleta e preparado com cadeias contraídas) e a
+preparação e a árvore geradora mínima direto no GrafoArrays contra o
+caminho em NetworkX; tipo devolvido por obter_grafo_bairro/obter_arrays_bairro
+"""
+import networkx as nx
+import numpy as np
+import pytest
+
+from data.collector import ColetorDados
+from data.grafo_arrays import GrafoArrays
+from data.snapshot import carregar_snapshot, grafo_para_arrays, salvar_snapshot
+from benchmarks.sinteticos import gerar_conteudo_overpass
+from tests.auxiliares import criar_otimizador, silencioso
+
+def grafos_iguais(a, b):
+    """Mesmos nós, arestas e atributos (inclusive a geometria das cadeias)"""
+    if dict(a.nodes(data=True)) != dict(b.nodes(data=True)):
+        return False
+    if a.number_of_edges() != b.number_of_edges():
+        return False
+    return all(b.has_edge(u, v) and b[u][v] == data for u, v, data in a.edges(data=True))
+
+@pytest.fixture
+def otimizador():
+    return criar_otimizador()
+
+@pytest.fixture(scope='module')
+def coleta(malha_sintetica):
+    """Grafo NetworkX e vetores de uma malha com vários componentes e comprimentos faltando"""
+    grafo = malha_sintetica(3000, remover=0.5, preparada=False)
+    for u, v in list(grafo.edges)[::40]:
+        del grafo[u][v]['length']
+    return grafo_para_arrays(grafo), grafo
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_ida_e_volta_da_coleta(tmp_path, mmap):
+    coletor = ColetorDados(silencioso=True)
+    grafo = coletor.construir_grafo_real(gerar_conteudo_overpass(20, 20, pontos_forma=2))
+    salvar_snapshot(coletor.ultimo_arrays, tmp_path / 'coleta')
+
+    arrays, _ = carregar_snapshot(tmp_path / 'coleta', mmap=mmap)
+    assert grafos_iguais(grafo, arrays.para_networkx())
+
+def test_ida_e_volta_do_preparado_simplificado(tmp_path, otimizador):
+    otimizador.simplificar = True
+    grafo = ColetorDados(silencioso=True).construir_grafo_real(gerar_conteudo_overpass(20, 20, pontos_forma=2))
+    preparado = silencioso(otimizador.preparar_grafo, grafo)
+    salvar_snapshot(grafo_para_arrays(preparado, otimizador.peso), tmp_path / 'preparado')
+
+    arrays, _ = carregar_snapshot(tmp_path / 'preparado')
+    assert arrays.geometria is not None
+    assert grafos_iguais(preparado, arrays.para_networkx())
+
+def test_preparacao_em_vetores_igual_a_networkx(otimizador, coleta):
+    arrays, grafo = coleta
+    otimizador.preparacao = 'networkx'
+    referencia = silencioso(otimizador.preparar_grafo, grafo.copy())
+    otimizador.preparacao = 'vetores'
+    preparado = silencioso(otimizador.preparar_grafo, arrays)
+
+    assert isinstance(preparado, GrafoArrays)
+    assert not nx.is_connected(grafo)
+    assert grafos_iguais(referencia, preparado.para_networkx())
+
+def test_preparacao_em_vetores_nao_altera_o_snapshot(tmp_path, otimizador, coleta):
+    salvar_snapshot(coleta[0], tmp_path / 'coleta')
+    arrays, _ = carregar_snapshot(tmp_path / 'coleta')
+    numero_nos = arrays.numero_nos
+
+    preparado = silencioso(otimizador.preparar_grafo, arrays)
+    assert preparado.numero_nos < numero_nos == arrays.numero_nos
+    assert np.isnan(arrays.comprimento).any() and not np.isnan(preparado.comprimento).any()
+
+@pytest.mark.parametrize('motor', ['scipy', 'kruskal_arrays'])
+def test_mst_em_vetores_igual_a_networkx(otimizador, coleta, motor):
+    otimizador.motor = motor
+    preparado = silencioso(otimizador.preparar_grafo, coleta[0])
+    arvore, metricas = silencioso(otimizador.calcular_rota_otimizada, preparado)
+    referencia = nx.minimum_spanning_tree(preparado.para_networkx(), weight='length')
+
+    assert isinstance(arvore, GrafoArrays)
+    assert grafos_iguais(referencia, arvore.para_networkx())
+    assert metricas['numero_arestas_otimizado'] == referencia.number_of_edges()
+    assert metricas['comprimento_otimizado_metros'] == pytest.approx(referencia.size(weight='length'))
+
+def test_mst_em_vetores_mantem_a_geometria(tmp_path, otimizador):
+    otimizador.simplificar = True
+    otimizador.motor = 'scipy'
+    grafo = ColetorDados(silencioso=True).construir_grafo_real(gerar_conteudo_overpass(20, 20, pontos_forma=2))
+    preparado = silencioso(otimizador.preparar_grafo, grafo)
+    salvar_snapshot(grafo_para_arrays(preparado, otimizador.peso), tmp_path / 'preparado')
+
+    arrays, _ = carregar_snapshot(tmp_path / 'preparado')
+    arvore, _ = silencioso(otimizador.calcular_rota_otimizada, arrays)
+    referencia = nx.minimum_spanning_tree(preparado, weight='length')
+    assert grafos_iguais(referencia, arvore.para_networkx())
+
+def test_tipo_de_retorno_da_coleta(tmp_path, monkeypatch):
+    # Com o snapshot da coleta, cada método devolve sempre o mesmo tipo
+    monkeypatch.chdir(tmp_path)
+    coletor = ColetorDados(silencioso=True)
+    grafo = coletor.construir_grafo_real(gerar_conteudo_overpass(10, 10))
+    coletor.salvar_grafo_snapshot('Teste', grafo)
+    coletor.usar_snapshots = True
+
+    do_snapshot = coletor.obter_grafo_bairro('Teste')
+    arrays = coletor.obter_arrays_bairro('Teste')
+    assert isinstance(do_snapshot, nx.Graph) and grafos_iguais(grafo, do_snapshot)
+    assert isinstance(arrays, GrafoArrays) and grafos_iguais(grafo, arrays.para_networkx())
@@ -0,0 +1,66 @@
+"""
+TESTES DA SUÍTE DE BENCHMARKS
+Leitura das fixtures gravadas (formato de benchmarks.fixtures), baseline
+versionada em benchmarks/baselines e detecção de regressões
+"""
+import gzip
+import json
+import os
+
+import networkx as nx
+import pytest
+
+from data.collector import ColetorDados
+from benchmarks.fixtures import carregar_fixture, listar_fixtures
+from benchmarks.sinteticos import gerar_conteudo_overpass
+from benchmarks.suite import ESCALAS, MOTORES, PASTA_BASELINES, TEMPO_MINIMO, comparar
+
+ETAPAS = (['construir_grafo_real', 'preparar_grafo']
+          + [f"mst_{algoritmo}_{motor}" for algoritmo, motor in MOTORES]
+          + ['criar_mapa_comparativo', 'gerar_relatorio_ruas'])
+
+def gravar(pasta, nome, respostas, geojson=None):
+    """Fixture no mesmo formato de benchmarks.fixtures.gravar_fixture (sem rede)"""
+    with gzip.open(os.path.join(pasta, f"{nome}.json.gz"), 'wt', encoding='utf-8') as arquivo:
+        json.dump({'bairro': nome, 'nominatim': {'geojson': geojson},
+                   'overpass': [resposta.decode('utf-8') for resposta in respostas]}, arquivo)
+
+def test_fixture_reproduz_a_construcao(tmp_path):
+    conteudo = gerar_conteudo_overpass(10, 10)
+    gravar(tmp_path, 'um_tile', [conteudo])
+    gravar(tmp_path, 'dois_tiles', [conteudo, conteudo])
+
+    assert listar_fixtures(tmp_path) == ['um_tile', 'dois_tiles']
+    coletor = ColetorDados(silencioso=True)
+    direto = coletor.construir_grafo_real(conteudo)
+
+    conteudo_fixture, poligono = carregar_fixture('um_tile', tmp_path)
+    assert conteudo_fixture == conteudo and poligono is None
+    assert nx.utils.graphs_equal(coletor.construir_grafo_real(conteudo_fixture), direto)
+
+    # Tiles sobrepostos: nós e vias repetidos entram uma única vez
+    tiles, _ = carregar_fixture('dois_tiles', tmp_path)
+    assert len(tiles) == 2
+    assert nx.utils.graphs_equal(coletor.construir_grafo_real(tiles), direto)
+
+@pytest.mark.parametrize('escala', ['pequena'])
+def test_baseline_versionada_cobre_a_suite(escala):
+    with open(os.path.join(PASTA_BASELINES, f"{escala}.json"), encoding='utf-8') as arquivo:
+        baseline = json.load(arquivo)
+
+    casos = [f"{tipo}_{tamanho}x{tamanho}" if tipo == 'grade' else f"{tipo}_{tamanho}"
+             for tipo, tamanho in ESCALAS[escala]]
+    esperado = {f"{caso}/{etapa}" for caso in casos for etapa in ETAPAS}
+    assert baseline['escala'] == escala
+    assert esperado <= set(baseline['resultados'])
+
+def test_comparar_acusa_apenas_regressoes_acima_do_limite():
+    base = {'a': {'tempo_segundos': 1.0, 'memoria_mb': 100.0},
+            'b': {'tempo_segundos': 1.0, 'memoria_mb': 100.0},
+            'c': {'tempo_segundos': TEMPO_MINIMO / 4, 'memoria_mb': 0.2}}
+    atual = {'a': {'tempo_segundos': 1.2, 'memoria_mb': 120.0},
+             'b': {'tempo_segundos': 1.5, 'memoria_mb': 130.0},
+             'c': {'tempo_segundos': TEMPO_MINIMO / 2, 'memoria_mb': 0.9},
+             'nova': {'tempo_segundos': 9.0, 'memoria_mb': 900.0}}
+
+    assert comparar(atual, base) == [('b', 'tempo_segundos', 1.5, 1.0), ('b', 'memoria_mb', 130.0, 100.0)]
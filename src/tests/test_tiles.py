@@ -0,0 +1,75 @@
+"""
+TESTES DOS TILES
+Divisão da área, seleção pelo polígono e novas tentativas de um tile com falha
+"""
+import contextlib
+import io
+import threading
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from data.cliente_http import ClienteHTTP, ErroHTTP
+from data.collector import ColetorDados
+from data.tiles import dividir_em_tiles, tiles_no_poligono
+from tests.auxiliares import ServidorSimulado
+
+class LimitadorContado:
+    """Limite de taxa que só conta as chamadas"""
+    def __init__(self):
+        self.chamadas = 0
+        self.trava = threading.Lock()
+
+    def aguardar(self):
+        with self.trava:
+            self.chamadas += 1
+
+@pytest.fixture
+def servidor():
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ServidorSimulado)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    ServidorSimulado.contadores.clear()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}"
+    servidor.shutdown()
+    servidor.server_close()
+
+def coletor_local(url):
+    with contextlib.redirect_stdout(io.StringIO()):
+        coletor = ColetorDados()
+    coletor.usar_cache = coletor.modo_offline = False
+    coletor.overpass_url, coletor.overpass_espelhos = url, [url]
+    coletor.cliente = ClienteHTTP({}, timeout=0.5, tentativas=3, espera_base=0.01, espera_maxima=0.02)
+    coletor.limitador = LimitadorContado()
+    coletor.tamanho_tile = 0.01
+    return coletor
+
+def test_divisao_cobre_a_area():
+    tiles = dividir_em_tiles([0.0, 0.025, 10.0, 10.012], 0.01)
+    assert len(tiles) == 3 * 2
+    assert min(t[0] for t in tiles) == 0.0 and max(t[1] for t in tiles) == pytest.approx(0.025)
+    assert all(t[1] - t[0] <= 0.01 + 1e-12 and t[3] - t[2] <= 0.01 + 1e-12 for t in tiles)
+
+def test_tiles_fora_do_poligono_sao_descartados():
+    tiles = dividir_em_tiles([0.0, 0.04, 0.0, 0.04], 0.01)
+    # Quadrado no canto sudoeste: só os tiles que ele toca ficam
+    anel = np.array([[0.001, 0.001], [0.015, 0.001], [0.015, 0.015], [0.001, 0.015]])
+    selecionados = tiles_no_poligono(tiles, [anel])
+    assert len(selecionados) == 4
+
+def test_tile_com_falha_repete_so_as_tentativas_do_cliente(servidor):
+    coletor = coletor_local(f"{servidor}/falha")
+    with contextlib.redirect_stdout(io.StringIO()), pytest.raises(ErroHTTP):
+        list(coletor.buscar_dados_ruas_em_tiles([0.0, 0.005, 0.0, 0.005]))
+
+    # Sem laço por tile: 3 requisições (não 3 x 3), todas pelo limite de taxa
+    assert ServidorSimulado.contadores['/falha'] == 3
+    assert coletor.limitador.chamadas == 3
+
+def test_novas_tentativas_passam_pelo_limite_de_taxa(servidor):
+    coletor = coletor_local(f"{servidor}/instavel")
+    with contextlib.redirect_stdout(io.StringIO()):
+        conteudos = list(coletor.buscar_dados_ruas_em_tiles([0.0, 0.005, 0.0, 0.005]))
+
+    assert conteudos == [b'{"elements": []}']
+    assert ServidorSimulado.contadores['/instavel'] == coletor.limitador.chamadas == 3
@@ -0,0 +1,84 @@
+"""
+MODULO DE CACHE DE GRAFOS EM MEMORIA
+Guarda, no servico, os grafos preparados e as rotas dos bairros pedidos por
+ultimo; o limite e de memoria (estimada pelo tamanho dos grafos) e os bairros
+usados ha mais tempo saem primeiro (LRU)
+"""
+import threading
+from collections import OrderedDict
+
+from config.settings import MEMORIA_CACHE_GRAFOS_MB
+
+# Memoria de um grafo NetworkX com os atributos do coletor (medida com tracemalloc)
+BYTES_POR_NO = 270
+BYTES_POR_ARESTA = 380
+BYTES_POR_VALOR = 32 # Demais valores (numeros e textos das metricas, passos da rota)
+
+def memoria_estimada(valor):
+    """Bytes estimados de grafos NetworkX, GrafoArrays e de listas, tuplas e dicionarios com eles"""
+    if hasattr(valor, 'numero_arestas'):
+        # Vetores do grafo (inclusive pesos e geometria), sem as tabelas de texto
+        vetores = list(vars(valor).values()) + list(valor.pesos.values()) + list((valor.geometria or {}).values())
+        return sum(vetor.nbytes for vetor in vetores if hasattr(vetor, 'nbytes'))
+    if hasattr(valor, 'number_of_edges'):
+        return len(valor) * BYTES_POR_NO + valor.number_of_edges() * BYTES_POR_ARESTA
+    if isinstance(valor, dict):
+        return sum(memoria_estimada(item) for item in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sum(memoria_estimada(item) for item in valor)
+    return BYTES_POR_VALOR
+
+class CacheGrafos:
+    def __init__(self, memoria_maxima_mb=MEMORIA_CACHE_GRAFOS_MB):
+        self.memoria_maxima = int(memoria_maxima_mb * 1024 * 1024)
+        self.memoria = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.removidos = 0
+        self._entradas = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        """Entrada guardada (e marcada como a mais recente) ou None"""
+        with self._trava:
+            if chave not in self._entradas:
+                self.faltas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return self._entradas[chave][0]
+
+    def guardar(self, chave, valor, memoria=None):
+        """
+        Guarda o valor e remove os menos usados ate caber no limite
+        Um valor maior que o limite inteiro nao e guardado
+        """
+        memoria = memoria_estimada(valor) if memoria is None else memoria
+        with self._trava:
+            if chave in self._entradas:
+                self.memoria -= self._entradas.pop(chave)[1]
+            if memoria > self.memoria_maxima:
+                return False
+            self._entradas[chave] = (valor, memoria)
+            self.memoria += memoria
+            while self.memoria > self.memoria_maxima:
+                _, (_, memoria_removida) = self._entradas.popitem(last=False)
+                self.memoria -= memoria_removida
+                self.removidos += 1
+            return True
+
+    def limpar(self):
+        with self._trava:
+            self._entradas.clear()
+            self.memoria = 0
+
+    def estatisticas(self):
+        with self._trava:
+            return {
+                'entradas': list(self._entradas),
+                'memoria_mb': self.memoria / (1024 * 1024),
+                'memoria_maxima_mb': self.memoria_maxima / (1024 * 1024),
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'removidos': self.removidos
+            }
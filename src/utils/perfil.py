@@ -0,0 +1,204 @@
+"""
+MODULO DE PERFIL DE EXECUCAO
+Mede cada fase do pipeline (tempo de relogio, tempo de CPU, pico de memoria
+e contagens) e grava as medicoes em JSON/CSV junto aos resultados
+"""
+import contextlib
+import cProfile
+import csv
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from config.settings import (MEDIR_FASES, MEDIR_MEMORIA, PERFIL_CPROFILE,
+                             NOME_METRICAS_FASES, NOME_PERFIL_CPROFILE)
+
+def contar_grafo(grafo):
+    """Contagens de um grafo NetworkX ou GrafoArrays (usado como contagens= de medir)"""
+    if grafo is None:
+        return {}
+    if hasattr(grafo, 'numero_arestas'):
+        return {'nos': grafo.numero_nos, 'arestas': grafo.numero_arestas}
+    return {'nos': len(grafo.nodes), 'arestas': len(grafo.edges)}
+
+class Perfilador:
+    """
+    Registro das fases medidas; fases aninhadas aparecem como 'pai/filha'
+    O pico de memoria (tracemalloc) so e medido na thread principal
+    e o tempo de CPU e o do processo inteiro (inclui outras threads);
+    o tracemalloc ligado aqui e desligado ao fim da fase mais externa
+    """
+    def __init__(self, ativo=MEDIR_FASES, memoria=MEDIR_MEMORIA):
+        self.ativo = ativo
+        self.memoria = memoria
+        self.fases = []
+        self._tracemalloc_proprio = False
+        self._inicio = time.perf_counter()
+        self._trava = threading.Lock()
+        self._local = threading.local()
+
+    def _pilha(self):
+        if not hasattr(self._local, 'pilha'):
+            self._local.pilha = []
+        return self._local.pilha
+
+    def limpar(self):
+        with self._trava:
+            self.fases = []
+        self._inicio = time.perf_counter()
+
+    @contextlib.contextmanager
+    def fase(self, nome, **contagens):
+        """
+        Mede o bloco como uma fase
+        O dicionario retornado recebe contagens registradas dentro do bloco
+        """
+        registro = dict(contagens)
+        if not self.ativo:
+            yield registro
+            return
+
+        pilha = self._pilha()
+        medir_memoria = self.memoria and threading.current_thread() is threading.main_thread()
+        if medir_memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracemalloc_proprio = True
+            # O pico da fase pai e guardado antes de zerar o contador para a filha
+            if pilha:
+                pilha[-1]['pico'] = max(pilha[-1]['pico'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        quadro = {
+            'fase': f"{pilha[-1]['fase']}/{nome}" if pilha else nome,
+            'pico': 0,
+            'registro': registro
+        }
+        entrada = {
+            'fase': quadro['fase'],
+            'nivel': len(pilha),
+            'inicio_segundos': time.perf_counter() - self._inicio
+        }
+        with self._trava:
+            self.fases.append(entrada)
+        pilha.append(quadro)
+
+        inicio = time.perf_counter()
+        inicio_cpu = time.process_time()
+        erro = None
+        try:
+            yield registro
+        except BaseException as e:
+            erro = type(e).__name__
+            raise
+        finally:
+            entrada['tempo_segundos'] = time.perf_counter() - inicio
+            entrada['tempo_cpu_segundos'] = time.process_time() - inicio_cpu
+            pilha.pop()
+
+            if medir_memoria and tracemalloc.is_tracing():
+                pico = max(quadro['pico'], tracemalloc.get_traced_memory()[1])
+                entrada['pico_memoria_mb'] = pico / (1024 * 1024)
+                if pilha:
+                    pilha[-1]['pico'] = max(pilha[-1]['pico'], pico)
+                tracemalloc.reset_peak()
+                if not pilha and self._tracemalloc_proprio:
+                    tracemalloc.stop()
+                    self._tracemalloc_proprio = False
+            else:
+                entrada['pico_memoria_mb'] = None
+
+            entrada['erro'] = erro
+            entrada.update(registro)
+
+    def medir(self, nome, contagens=None):
+        """
+        Decorador: mede cada chamada da funcao como uma fase
+        contagens(resultado) -> dict acrescenta contagens a partir do retorno
+        """
+        def decorador(funcao):
+            @functools.wraps(funcao)
+            def medida(*args, **kwargs):
+                with self.fase(nome) as registro:
+                    resultado = funcao(*args, **kwargs)
+                    if contagens is not None and self.ativo:
+                        try:
+                            registro.update(contagens(resultado))
+                        except Exception:
+                            pass
+                    return resultado
+            return medida
+        return decorador
+
+    def contar(self, **contagens):
+        """Acrescenta contagens a fase em andamento (nesta thread)"""
+        pilha = self._pilha()
+        if self.ativo and pilha:
+            pilha[-1]['registro'].update(contagens)
+
+    @contextlib.contextmanager
+    def cprofile(self, pasta, ativo=PERFIL_CPROFILE):
+        """Grava o perfil cProfile do bloco em pasta/NOME_PERFIL_CPROFILE (pstats/snakeviz)"""
+        if not ativo:
+            yield None
+            return
+
+        perfil = cProfile.Profile()
+        perfil.enable()
+        try:
+            yield perfil
+        finally:
+            perfil.disable()
+            os.makedirs(pasta, exist_ok=True)
+            caminho = os.path.join(pasta, NOME_PERFIL_CPROFILE)
+            perfil.dump_stats(caminho)
+            print(f"Perfil cProfile salvo como: '{caminho}'")
+
+    def salvar(self, pasta, nome=NOME_METRICAS_FASES, metadados=None):
+        """Grava as fases em pasta/<nome>.json e pasta/<nome>.csv; retorna os caminhos"""
+        if not self.ativo or not self.fases:
+            return None
+
+        with self._trava:
+            fases = [dict(fase) for fase in self.fases]
+
+        os.makedirs(pasta, exist_ok=True)
+        caminho_json = os.path.join(pasta, f"{nome}.json")
+        caminho_csv = os.path.join(pasta, f"{nome}.csv")
+
+        with open(caminho_json, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'criado_em': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'metadados': metadados or {},
+                'fases': fases
+            }, arquivo, ensure_ascii=False, indent=2)
+
+        colunas = []
+        for fase in fases:
+            colunas.extend(chave for chave in fase if chave not in colunas)
+        with open(caminho_csv, 'w', newline='', encoding='utf-8') as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=colunas)
+            escritor.writeheader()
+            escritor.writerows(fases)
+
+        print(f"Metricas das fases salvas como: '{caminho_json}' e '{caminho_csv}'")
+        return caminho_json, caminho_csv
+
+    def imprimir_resumo(self):
+        if not self.ativo or not self.fases:
+            return
+        print("\nPERFIL DAS FASES")
+        print(f"{'fase':<40} {'tempo (s)':>10} {'cpu (s)':>10} {'pico (MB)':>10}")
+        for fase in self.fases:
+            if 'tempo_segundos' not in fase:
+                continue
+            nome = '  ' * fase['nivel'] + fase['fase'].rsplit('/', 1)[-1]
+            pico = fase['pico_memoria_mb']
+            print(f"{nome:<40} {fase['tempo_segundos']:>10.3f} {fase['tempo_cpu_segundos']:>10.3f} "
+                  f"{pico if pico is not None else float('nan'):>10.1f}")
+
+# Perfilador do processo, compartilhado por coleta, otimizacao e visualizacao
+perfilador = Perfilador()
@@ -0,0 +1,146 @@
+"""
+MODULO DE RENDERIZACAO RAPIDA
+Desenha a malha a partir de vetores de coordenadas: todas as ruas em uma unica
+linha (trechos separados por NaN), camadas densas rasterizadas e pontos amostrados;
+usa apenas Figure + FigureCanvasAgg (sem pyplot), entao nunca abre janela nem bloqueia
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+def indice_coordenadas(grafo):
+    """(indice {no: posicao}, x, y) dos nos do grafo"""
+    nos = list(grafo.nodes)
+    dados = grafo.nodes
+    x = np.fromiter((dados[no]['x'] for no in nos), dtype=np.float64, count=len(nos))
+    y = np.fromiter((dados[no]['y'] for no in nos), dtype=np.float64, count=len(nos))
+    return {no: i for i, no in enumerate(nos)}, x, y
+
+def segmentos_grafo(grafo, indice, x, y):
+    """
+    Vetor (E, 2, 2) com os trechos [[x1, y1], [x2, y2]] do grafo
+    Cadeias contraidas (models.simplificacao) sao desenhadas pela geometria guardada
+    """
+    origem, destino, extras = [], [], []
+    for u, v, data in grafo.edges(data=True):
+        if 'nos_intermediarios' not in data:
+            origem.append(indice[u])
+            destino.append(indice[v])
+            continue
+        inicio = data['origem']
+        fim = v if inicio == u else u
+        pontos = ([(x[indice[inicio]], y[indice[inicio]])] + list(data['coordenadas'])
+                  + [(x[indice[fim]], y[indice[fim]])])
+        extras.extend(zip(pontos[:-1], pontos[1:]))
+
+    origem = np.array(origem, dtype=np.int64)
+    destino = np.array(destino, dtype=np.int64)
+    segmentos = np.empty((len(origem), 2, 2), dtype=np.float64)
+    segmentos[:, 0, 0], segmentos[:, 0, 1] = x[origem], y[origem]
+    segmentos[:, 1, 0], segmentos[:, 1, 1] = x[destino], y[destino]
+    if extras:
+        segmentos = np.concatenate([segmentos, np.array(extras, dtype=np.float64).reshape(-1, 2, 2)])
+    return segmentos
+
+def pontos_amostrados(nos, indice, x, y, maximo, semente=0):
+    """Coordenadas (N, 2) dos nos; acima de 'maximo', uma amostra aleatoria fixa"""
+    posicoes = np.fromiter((indice[no] for no in nos), dtype=np.int64)
+    if maximo and len(posicoes) > maximo:
+        posicoes = np.sort(np.random.default_rng(semente).choice(posicoes, maximo, replace=False))
+    return np.column_stack([x[posicoes], y[posicoes]])
+
+def limites_mapa(segmentos, margem=0.001):
+    """(x_min, x_max, y_min, y_max) dos trechos com a mesma margem do mapa original"""
+    if isinstance(segmentos, list):
+        segmentos = np.concatenate(segmentos) if segmentos else np.empty((0, 2, 2))
+    if len(segmentos) == 0:
+        return None
+    coordenadas = segmentos.reshape(-1, 2)
+    x_min, y_min = coordenadas.min(axis=0)
+    x_max, y_max = coordenadas.max(axis=0)
+    return x_min - margem, x_max + margem, y_min - margem, y_max + margem
+
+def linha_unica(segmentos):
+    """
+    Coordenadas (x, y) de todos os trechos em uma unica linha, separados por NaN
+    Um so Path para o Agg, em vez de um Path por trecho (LineCollection)
+    """
+    pontos = np.full((len(segmentos), 3, 2), np.nan)
+    pontos[:, :2] = segmentos
+    return pontos[:, :, 0].ravel(), pontos[:, :, 1].ravel()
+
+def desenhar_painel(ax, segmentos, pontos, cor, titulo, largura_linha, tamanho_ponto,
+                    limites=None, rasterizar=True):
+    """
+    Mesmo painel de Visualizador._plotar_grafo, com um unico artista por camada
+    Com 'cor' em lista, 'segmentos' e uma lista de camadas (uma cor cada, ex.: distritos)
+    e os pontos (garagens) sao desenhados em preto
+    """
+    camadas = zip(segmentos, cor) if isinstance(cor, list) else [(segmentos, cor)]
+    for segmentos_camada, cor_camada in camadas:
+        x, y = linha_unica(segmentos_camada)
+        ax.add_line(Line2D(x, y, color=cor_camada, linewidth=largura_linha, alpha=0.7,
+                           rasterized=rasterizar))
+    if len(pontos):
+        ax.scatter(pontos[:, 0], pontos[:, 1], s=tamanho_ponto, c='black' if isinstance(cor, list) else cor,
+                   alpha=0.6, linewidths=0, rasterized=rasterizar, zorder=2)
+
+    ax.set_title(titulo, fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.set_xlabel('Longitude')
+    ax.set_ylabel('Latitude')
+    if limites is not None:
+        ax.set_xlim(limites[0], limites[1])
+        ax.set_ylim(limites[2], limites[3])
+
+def renderizar_painel(segmentos, pontos, estilo, titulo, limites, tamanho=(8, 8), dpi=150):
+    """
+    Renderiza um painel sozinho e retorna a imagem RGBA (alto x largura x 4)
+    Executado nos processos do pool quando os paineis sao desenhados em paralelo
+    """
+    fig = Figure(figsize=tamanho, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    desenhar_painel(ax, segmentos, pontos, titulo=titulo, limites=limites, **estilo)
+    fig.tight_layout()
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+def salvar_mapa(caminho, paineis, titulo, estilo, paralelo=False, dpi=150):
+    """
+    Salva o mapa com os paineis lado a lado
+    paineis: lista de (segmentos, pontos, cor, titulo); ver desenhar_painel para camadas
+    paralelo=True renderiza cada painel em um processo e monta as imagens na figura final
+    (com um unico nucleo disponivel, os paineis sao desenhados em sequencia)
+    """
+    paralelo = paralelo and (os.cpu_count() or 1) > 1
+    fig = Figure(figsize=(8 * len(paineis), 8))
+    FigureCanvasAgg(fig)
+
+    if paralelo:
+        with ProcessPoolExecutor(max_workers=len(paineis)) as pool:
+            futuros = [
+                pool.submit(renderizar_painel, segmentos, pontos, dict(estilo, cor=cor),
+                            titulo_painel, limites_mapa(paineis[0][0]), dpi=dpi)
+                for segmentos, pontos, cor, titulo_painel in paineis
+            ]
+            imagens = [futuro.result() for futuro in futuros]
+        for k, imagem in enumerate(imagens):
+            ax = fig.add_subplot(1, len(paineis), k + 1)
+            ax.imshow(imagem, interpolation='none')
+            ax.set_axis_off()
+    else:
+        limites = limites_mapa(paineis[0][0])
+        for k, (segmentos, pontos, cor, titulo_painel) in enumerate(paineis):
+            ax = fig.add_subplot(1, len(paineis), k + 1)
+            desenhar_painel(ax, segmentos, pontos, cor=cor, titulo=titulo_painel,
+                            limites=limites, **estilo)
+
+    fig.suptitle(titulo, fontsize=16, fontweight='bold')
+    # tight_layout no lugar de bbox_inches='tight', que desenha a figura duas vezes
+    fig.tight_layout()
+    fig.savefig(caminho, dpi=dpi)
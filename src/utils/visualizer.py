@@ -1,57 +1,216 @@
 """
 MODULO DE VISUALIZACAO DE RESULTADOS
 Gera mapas e relatorios da otimizacao
+matplotlib e pandas so sao importados quando um mapa ou CSV e gerado
 """
-import matplotlib.pyplot as plt
-import pandas as pd
 import networkx as nx
+import numpy as np
 import os
 
+from models.simplificacao import expandir_arestas, expandir_grafo, grafo_simplificado
+from utils.perfil import perfilador
+
 # Import relativo correto
 from config.settings import (COR_REDE_COMPLETA, COR_ROTA_OTIMIZADA, 
                             TAMANHO_PONTO, LARGURA_LINHA, PASTA_RESULTADOS,
-                            NOME_MAPA, NOME_RELATORIO)
+                            NOME_MAPA, NOME_RELATORIO, NOME_ROTA, NOME_RELATORIO_DISTRITOS,
+                            NOME_RELATORIO_ALTERACOES,
+                            CORES_DISTRITOS, RENDERIZADOR, RASTERIZAR_MAPA,
+                            MAXIMO_PONTOS_MAPA, PAINEIS_PARALELOS, ARESTAS_PAINEIS_PARALELOS)
 
 class Visualizador:
-    def __init__(self):
+    def __init__(self, pasta_resultados=None):
         self.cor_rede = COR_REDE_COMPLETA
         self.cor_rota = COR_ROTA_OTIMIZADA
         self.tamanho_ponto = TAMANHO_PONTO
         self.largura_linha = LARGURA_LINHA
-        self.pasta_resultados = PASTA_RESULTADOS
+        self.pasta_resultados = pasta_resultados or PASTA_RESULTADOS
+        self.renderizador = RENDERIZADOR
+        self.rasterizar = RASTERIZAR_MAPA
+        self.maximo_pontos = MAXIMO_PONTOS_MAPA
+        self.paineis_paralelos = PAINEIS_PARALELOS
+        self.arestas_paineis_paralelos = ARESTAS_PAINEIS_PARALELOS
+        self.cores_distritos = CORES_DISTRITOS
+        self.arquivos_gerados = [] # Caminhos gravados por este visualizador, na ordem
         
         os.makedirs(self.pasta_resultados, exist_ok=True)
     
+    @perfilador.medir('mapa')
     def criar_mapa_comparativo(self, grafo_original, arvore_otimizada, metricas, nome_bairro):
         print("Criando mapa comparativo...")
         
+        if self.renderizador == 'rapido':
+            return self._criar_mapa_rapido(grafo_original, arvore_otimizada, metricas, nome_bairro)
+        
+        import matplotlib.pyplot as plt
+        
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
         
-        pos = {node: (data['x'], data['y']) for node, data in grafo_original.nodes(data=True)}
+        # Cadeias contraidas sao expandidas para desenhar a geometria real das ruas;
+        # os pontos marcados continuam sendo apenas os nos do grafo (cruzamentos)
+        rede_desenho = expandir_grafo(grafo_original) if grafo_simplificado(grafo_original) else grafo_original
+        rota_desenho = expandir_grafo(arvore_otimizada) if grafo_simplificado(arvore_otimizada) else arvore_otimizada
         
-        self._plotar_grafo(ax1, grafo_original, pos, self.cor_rede, 
-                          f"Malha Viaria Completa\n{len(grafo_original.nodes)} nos, {len(grafo_original.edges)} ruas")
+        pos = {node: (data['x'], data['y']) for node, data in rede_desenho.nodes(data=True)}
         
-        self._plotar_grafo(ax2, arvore_otimizada, pos, self.cor_rota,
-                          f"Rota Otimizada\n{len(arvore_otimizada.edges)} ruas selecionadas")
+        self._plotar_grafo(ax1, rede_desenho, pos, self.cor_rede, 
+                          f"Malha Viaria Completa\n{len(grafo_original.nodes)} nos, {len(grafo_original.edges)} ruas",
+                          nos=grafo_original.nodes)
+        
+        self._plotar_grafo(ax2, rota_desenho, pos, self.cor_rota,
+                          f"Rota Otimizada\n{len(arvore_otimizada.edges)} ruas selecionadas",
+                          nos=arvore_otimizada.nodes)
         
         fig.suptitle(
-            f'Otimizacao de Rotas de Coleta - {nome_bairro}\n'
-            f'Economia: {metricas["economia_metros"]:.0f}m ({metricas["economia_percentual"]:.1f}%) - '
-            f'Algoritmo: {metricas["algoritmo_utilizado"].upper()}',
+            self._titulo_mapa(metricas, nome_bairro),
             fontsize=16, 
             fontweight='bold'
         )
         
         plt.tight_layout()
+        perfilador.contar(arestas_desenhadas=len(rede_desenho.edges) + len(rota_desenho.edges))
         
         caminho_mapa = f"{self.pasta_resultados}/{NOME_MAPA}"
         plt.savefig(caminho_mapa, dpi=150, bbox_inches='tight')
+        self.arquivos_gerados.append(caminho_mapa)
         plt.show()
+        plt.close(fig)
+        
+        print(f"Mapa salvo como: '{caminho_mapa}'")
+    
+    def _titulo_mapa(self, metricas, nome_bairro):
+        return (
+            f'Otimizacao de Rotas de Coleta - {nome_bairro}\n'
+            f'Economia: {metricas["economia_metros"]:.0f}m ({metricas["economia_percentual"]:.1f}%) - '
+            f'Algoritmo: {metricas["algoritmo_utilizado"].upper()}'
+        )
+    
+    def _criar_mapa_rapido(self, grafo_original, arvore_otimizada, metricas, nome_bairro):
+        """
+        Mesmo mapa, desenhado a partir de vetores de coordenadas (sem pyplot e sem janela)
+        Cadeias contraidas sao desenhadas pela geometria guardada, sem expandir o grafo
+        """
+        from utils.renderizacao import indice_coordenadas, pontos_amostrados, salvar_mapa, segmentos_grafo
+        
+        indice, x, y = indice_coordenadas(grafo_original)
+        segmentos_rede = segmentos_grafo(grafo_original, indice, x, y)
+        segmentos_rota = segmentos_grafo(arvore_otimizada, indice, x, y)
+        perfilador.contar(arestas_desenhadas=len(segmentos_rede) + len(segmentos_rota))
+        
+        paineis = [
+            (segmentos_rede, pontos_amostrados(grafo_original.nodes, indice, x, y, self.maximo_pontos),
+             self.cor_rede,
+             f"Malha Viaria Completa\n{len(grafo_original.nodes)} nos, {len(grafo_original.edges)} ruas"),
+            (segmentos_rota, pontos_amostrados(arvore_otimizada.nodes, indice, x, y, self.maximo_pontos),
+             self.cor_rota,
+             f"Rota Otimizada\n{len(arvore_otimizada.edges)} ruas selecionadas")
+        ]
+        estilo = {
+            'largura_linha': self.largura_linha,
+            'tamanho_ponto': self.tamanho_ponto,
+            'rasterizar': self.rasterizar
+        }
+        paralelo = self.paineis_paralelos and len(segmentos_rede) >= self.arestas_paineis_paralelos
+        
+        caminho_mapa = f"{self.pasta_resultados}/{NOME_MAPA}"
+        salvar_mapa(caminho_mapa, paineis, self._titulo_mapa(metricas, nome_bairro), estilo, paralelo=paralelo)
+        self.arquivos_gerados.append(caminho_mapa)
         
         print(f"Mapa salvo como: '{caminho_mapa}'")
     
-    def _plotar_grafo(self, ax, grafo, pos, cor, titulo):
+    @perfilador.medir('mapa')
+    def criar_mapa_rota(self, grafo, rota, metricas, nome_bairro):
+        """
+        Mapa da rota do carteiro chines: a malha inteira (todas as ruas sao coletadas)
+        ao lado dos trechos percorridos de novo, sem coletar
+        """
+        print("Criando mapa da rota de coleta...")
+        
+        from utils.renderizacao import indice_coordenadas, pontos_amostrados, salvar_mapa, segmentos_grafo
+        
+        indice, x, y = indice_coordenadas(grafo)
+        repetidas = grafo.edge_subgraph({(u, v) for u, v, coleta in rota if not coleta})
+        segmentos_rede = segmentos_grafo(grafo, indice, x, y)
+        segmentos_vazio = segmentos_grafo(repetidas, indice, x, y)
+        perfilador.contar(arestas_desenhadas=len(segmentos_rede) + len(segmentos_vazio))
+        
+        paineis = [
+            (segmentos_rede, pontos_amostrados(grafo.nodes, indice, x, y, self.maximo_pontos),
+             self.cor_rede,
+             f"Ruas Coletadas\n{len(grafo.nodes)} nos, {len(grafo.edges)} ruas"),
+            (segmentos_vazio, pontos_amostrados(repetidas.nodes, indice, x, y, self.maximo_pontos),
+             self.cor_rota,
+             f"Deslocamento sem Coleta\n{len(repetidas.edges)} ruas repetidas")
+        ]
+        estilo = {
+            'largura_linha': self.largura_linha,
+            'tamanho_ponto': self.tamanho_ponto,
+            'rasterizar': self.rasterizar
+        }
+        paralelo = self.paineis_paralelos and len(segmentos_rede) >= self.arestas_paineis_paralelos
+        titulo = (
+            f'Rota de Coleta (Carteiro Chines) - {nome_bairro}\n'
+            f'Rota: {metricas["comprimento_rota_metros"]/1000:.1f}km - '
+            f'Sem coleta: {metricas["deslocamento_vazio_metros"]:.0f}m '
+            f'({metricas["deslocamento_vazio_percentual"]:.1f}%)'
+        )
+        
+        caminho_mapa = f"{self.pasta_resultados}/{NOME_MAPA}"
+        salvar_mapa(caminho_mapa, paineis, titulo, estilo, paralelo=paralelo)
+        self.arquivos_gerados.append(caminho_mapa)
+        
+        print(f"Mapa salvo como: '{caminho_mapa}'")
+    
+    @perfilador.medir('mapa')
+    def criar_mapa_distritos(self, grafo, distritos, resultados, metricas, nome_bairro):
+        """
+        Mapa com uma cor por caminhao: os distritos (todas as ruas de cada um) ao lado
+        das rotas otimizadas de cada distrito (arvore ou trechos sem coleta do carteiro)
+        """
+        print("Criando mapa dos distritos...")
+        
+        from utils.renderizacao import indice_coordenadas, pontos_amostrados, salvar_mapa, segmentos_grafo
+        
+        carteiro = metricas.get('modo_rota') == 'carteiro'
+        indice, x, y = indice_coordenadas(grafo)
+        cores = [self.cores_distritos[k % len(self.cores_distritos)] for k in range(len(distritos))]
+        
+        segmentos_distritos, segmentos_rotas = [], []
+        for distrito, (rota, _) in zip(distritos, resultados):
+            segmentos_distritos.append(segmentos_grafo(distrito, indice, x, y))
+            if carteiro:
+                rota = distrito.edge_subgraph({(u, v) for u, v, coleta in rota if not coleta})
+            segmentos_rotas.append(segmentos_grafo(rota, indice, x, y))
+        perfilador.contar(arestas_desenhadas=sum(map(len, segmentos_distritos)) + sum(map(len, segmentos_rotas)))
+        
+        partidas = [caminhao['partida'] for caminhao in metricas['caminhoes']]
+        garagens = np.array([(grafo.nodes[no]['x'], grafo.nodes[no]['y']) for no in partidas]).reshape(-1, 2)
+        paineis = [
+            (segmentos_distritos, garagens, cores,
+             f"Distritos\n{len(distritos)} caminhoes, equilibrio {metricas['equilibrio_distritos']:.2f}"),
+            (segmentos_rotas, garagens, cores,
+             "Deslocamento sem Coleta por Caminhao" if carteiro else "Rota Otimizada por Caminhao")
+        ]
+        estilo = {
+            'largura_linha': self.largura_linha,
+            'tamanho_ponto': self.tamanho_ponto * 3,
+            'rasterizar': self.rasterizar
+        }
+        paralelo = self.paineis_paralelos and len(grafo.edges) >= self.arestas_paineis_paralelos
+        if carteiro:
+            resumo = (f'Rota: {metricas["comprimento_rota_metros"]/1000:.1f}km - '
+                      f'Sem coleta: {metricas["deslocamento_vazio_percentual"]:.1f}%')
+        else:
+            resumo = f'Economia: {metricas["economia_metros"]:.0f}m ({metricas["economia_percentual"]:.1f}%)'
+        titulo = f'Rotas por Caminhao - {nome_bairro}\n{resumo} - {len(distritos)} caminhoes'
+        
+        caminho_mapa = f"{self.pasta_resultados}/{NOME_MAPA}"
+        salvar_mapa(caminho_mapa, paineis, titulo, estilo, paralelo=paralelo)
+        self.arquivos_gerados.append(caminho_mapa)
+        
+        print(f"Mapa salvo como: '{caminho_mapa}'")
+    
+    def _plotar_grafo(self, ax, grafo, pos, cor, titulo, nos=None):
         nx.draw_networkx_edges(
             grafo, pos, ax=ax, 
             edge_color=cor, 
@@ -61,6 +220,7 @@ class Visualizador:
         
         nx.draw_networkx_nodes(
             grafo, pos, ax=ax,
+            nodelist=list(nos) if nos is not None else None,
             node_size=self.tamanho_ponto,
             node_color=cor,
             alpha=0.6
@@ -77,24 +237,18 @@ class Visualizador:
             ax.set_xlim(min(xs) - 0.001, max(xs) + 0.001)
             ax.set_ylim(min(ys) - 0.001, max(ys) + 0.001)
     
+    @perfilador.medir('relatorio_csv', contagens=lambda df: {'linhas': len(df)})
     def gerar_relatorio_ruas(self, arvore_otimizada, nome_bairro):
         print("Gerando relatorio de ruas...")
         
-        dados_ruas = []
-        for u, v, data in arvore_otimizada.edges(data=True):
-            dados_ruas.append({
-                'Rua': data.get('name', f'Rua {u}-{v}'),
-                'Comprimento (m)': int(data.get('length', 0)),
-                'Comprimento (km)': round(data.get('length', 0) / 1000, 2),
-                'Tipo de Via': data.get('highway', 'desconhecido').title(),
-                'ID_OSM': data.get('osm_id', 'N/A')
-            })
+        import pandas as pd
         
-        df = pd.DataFrame(dados_ruas)
+        df = pd.DataFrame(self._linhas_ruas(arvore_otimizada))
         df = df.sort_values('Comprimento (m)', ascending=False)
         
         caminho_relatorio = f"{self.pasta_resultados}/{NOME_RELATORIO}"
         df.to_csv(caminho_relatorio, index=False, encoding='utf-8')
+        self.arquivos_gerados.append(caminho_relatorio)
         
         print(f"RESUMO DAS RUAS - {nome_bairro}:")
         print(f"Total de ruas na rota: {len(df)}")
@@ -108,13 +262,169 @@ class Visualizador:
         
         return df
 
+    @perfilador.medir('relatorio_csv', contagens=lambda df: {'linhas': len(df)})
+    def gerar_relatorio_rota(self, grafo, rota, nome_bairro):
+        """Sequencia da rota de coleta, um trecho de rua percorrido por linha"""
+        print("Gerando relatorio da rota...")
+        
+        import pandas as pd
+        
+        df = pd.DataFrame(self._linhas_rota(grafo, rota))
+        
+        caminho_rota = f"{self.pasta_resultados}/{NOME_ROTA}"
+        df.to_csv(caminho_rota, index=False, encoding='utf-8')
+        self.arquivos_gerados.append(caminho_rota)
+        
+        print(f"RESUMO DA ROTA - {nome_bairro}:")
+        print(f"Passos na rota: {len(df)} ({(df['Coleta'] == 'Nao').sum()} sem coleta)")
+        print(f"Rota salva como: '{caminho_rota}'")
+        
+        return df
+
+    def gerar_relatorio_alteracoes(self, alteracoes, nome_bairro):
+        """Ruas (vias OSM) adicionadas, removidas ou alteradas desde a coleta anterior"""
+        print("Gerando relatorio de ruas alteradas...")
+        
+        import pandas as pd
+        
+        colunas = ['ID_OSM', 'Rua', 'Tipo de Via', 'Alteracao', 'Trechos',
+                   'Comprimento Antes (m)', 'Comprimento Depois (m)', 'Na Rota']
+        df = pd.DataFrame([
+            {
+                'ID_OSM': osm_id,
+                'Rua': alteracao['nome'] or f'Via_{osm_id}',
+                'Tipo de Via': (alteracao['highway'] or 'desconhecido').title(),
+                'Alteracao': alteracao['alteracao'].title(),
+                'Trechos': alteracao['trechos'],
+                'Comprimento Antes (m)': int(alteracao['comprimento_antes']),
+                'Comprimento Depois (m)': int(alteracao['comprimento_depois']),
+                'Na Rota': 'Sim' if alteracao['na_rota'] else 'Nao'
+            }
+            for osm_id, alteracao in alteracoes.items()
+        ], columns=colunas)
+        df = df.sort_values(['Alteracao', 'Rua'])
+        
+        caminho_relatorio = f"{self.pasta_resultados}/{NOME_RELATORIO_ALTERACOES}"
+        df.to_csv(caminho_relatorio, index=False, encoding='utf-8')
+        self.arquivos_gerados.append(caminho_relatorio)
+        
+        print(f"RUAS ALTERADAS - {nome_bairro}:")
+        for alteracao, quantidade in df['Alteracao'].value_counts().items():
+            print(f"{alteracao}: {quantidade}")
+        print(f"Na rota: {(df['Na Rota'] == 'Sim').sum()}")
+        print(f"Relatorio salvo como: '{caminho_relatorio}'")
+        
+        return df
+    
+    def _linhas_ruas(self, arvore_otimizada):
+        """Linhas do relatorio de ruas; cadeias contraidas voltam a ser listadas trecho a trecho"""
+        return [
+            {
+                'Rua': data.get('name', f'Rua {u}-{v}'),
+                'Comprimento (m)': int(data.get('length', 0)),
+                'Comprimento (km)': round(data.get('length', 0) / 1000, 2),
+                'Tipo de Via': data.get('highway', 'desconhecido').title(),
+                'ID_OSM': data.get('osm_id', 'N/A')
+            }
+            for u, v, data in expandir_arestas(arvore_otimizada)
+        ]
+    
+    def _trechos_passo(self, grafo, u, v):
+        """Trechos originais (a, b, atributos) de um passo u -> v, no sentido percorrido"""
+        data = grafo[u][v]
+        if 'nos_intermediarios' not in data:
+            return [(u, v, data)]
+        # expandir_arestas percorre a cadeia a partir de 'origem' (como no relatorio de ruas)
+        trechos = list(expandir_arestas(grafo.edge_subgraph([(u, v)])))
+        if data['origem'] != u:
+            trechos = [(b, a, trecho) for a, b, trecho in reversed(trechos)]
+        return trechos
+    
+    def _linhas_rota(self, grafo, rota):
+        """Linhas do relatorio da rota, um trecho por linha (cadeias contraidas expandidas)"""
+        dados_rota = []
+        distancia = 0.0
+        trechos = (
+            (a, b, data, coleta)
+            for u, v, coleta in rota
+            for a, b, data in self._trechos_passo(grafo, u, v)
+        )
+        for ordem, (u, v, data, coleta) in enumerate(trechos, start=1):
+            comprimento = data.get('length', 0)
+            distancia += comprimento
+            dados_rota.append({
+                'Ordem': ordem,
+                'De': u,
+                'Para': v,
+                'Rua': data.get('name', f'Rua {u}-{v}'),
+                'Comprimento (m)': int(comprimento),
+                'Distancia Acumulada (km)': round(distancia / 1000, 2),
+                'Tipo de Via': data.get('highway', 'desconhecido').title(),
+                'Coleta': 'Sim' if coleta else 'Nao',
+                'ID_OSM': data.get('osm_id', 'N/A')
+            })
+        return dados_rota
+    
+    @perfilador.medir('relatorio_csv', contagens=lambda df: {'linhas': len(df)})
+    def gerar_relatorio_distritos(self, distritos, resultados, metricas, nome_bairro):
+        """
+        Metricas de cada caminhao (NOME_RELATORIO_DISTRITOS) e as ruas/rota de todos
+        os distritos em um so arquivo, com a coluna 'Caminhao'
+        """
+        print("Gerando relatorio dos distritos...")
+        
+        import pandas as pd
+        
+        carteiro = metricas.get('modo_rota') == 'carteiro'
+        linhas = []
+        for numero, (distrito, (rota, _)) in enumerate(zip(distritos, resultados), start=1):
+            linhas_distrito = self._linhas_rota(distrito, rota) if carteiro else self._linhas_ruas(rota)
+            linhas.extend(dict(linha, Caminhao=numero) for linha in linhas_distrito)
+        
+        df = pd.DataFrame(linhas)
+        if not carteiro and len(df):
+            df = df.sort_values(['Caminhao', 'Comprimento (m)'], ascending=[True, False])
+        caminho_ruas = f"{self.pasta_resultados}/{NOME_ROTA if carteiro else NOME_RELATORIO}"
+        df.to_csv(caminho_ruas, index=False, encoding='utf-8')
+        self.arquivos_gerados.append(caminho_ruas)
+        
+        colunas = ['caminhao', 'partida', 'numero_nos_original', 'numero_arestas_original',
+                   'comprimento_total_metros', 'tempo_execucao_segundos']
+        if carteiro:
+            colunas += ['comprimento_rota_metros', 'deslocamento_vazio_metros',
+                        'deslocamento_vazio_percentual', 'numero_passos']
+        else:
+            colunas += ['comprimento_otimizado_metros', 'economia_metros',
+                        'economia_percentual', 'numero_arestas_otimizado']
+        df_caminhoes = pd.DataFrame(metricas['caminhoes'])[colunas]
+        caminho_distritos = f"{self.pasta_resultados}/{NOME_RELATORIO_DISTRITOS}"
+        df_caminhoes.to_csv(caminho_distritos, index=False, encoding='utf-8')
+        self.arquivos_gerados.append(caminho_distritos)
+        
+        print(f"RESUMO DOS DISTRITOS - {nome_bairro}:")
+        print(df_caminhoes.to_string(index=False))
+        print(f"Relatorio salvo como: '{caminho_ruas}' e '{caminho_distritos}'")
+        
+        return df
+
     def gerar_relatorio_execucao(self, metricas, nome_bairro):
         print("\nRELATORIO FINAL DE EXECUCAO")
         print("=" * 50)
         print(f"BAIRRO: {nome_bairro}")
+        if metricas.get('numero_caminhoes'):
+            print(f"CAMINHOES: {metricas['numero_caminhoes']} (equilibrio {metricas['equilibrio_distritos']:.2f})")
         print(f"ALGORITMO: {metricas['algoritmo_utilizado'].upper()}")
+        if metricas.get('atualizacao_incremental'):
+            print(f"ATUALIZACAO INCREMENTAL: {metricas['vias_alteradas']} vias alteradas "
+                  f"(+{metricas['arestas_entraram_arvore']} / -{metricas['arestas_sairam_arvore']} arestas na arvore)")
         print(f"TEMPO DE EXECUCAO: {metricas['tempo_execucao_segundos']:.3f}s")
         print(f"EXTENSAO TOTAL: {metricas['comprimento_total_metros']:.0f}m")
+        if metricas.get('modo_rota') == 'carteiro':
+            print(f"EXTENSAO DA ROTA: {metricas['comprimento_rota_metros']:.0f}m")
+            print(f"SEM COLETA: {metricas['deslocamento_vazio_metros']:.0f}m ({metricas['deslocamento_vazio_percentual']:.1f}%)")
+            print(f"PASSOS DA ROTA: {metricas['numero_passos']}")
+            print("=" * 50)
+            return
         print(f"EXTENSAO OTIMIZADA: {metricas['comprimento_otimizado_metros']:.0f}m")
         print(f"ECONOMIA: {metricas['economia_metros']:.0f}m ({metricas['economia_percentual']:.1f}%)")
         print(f"REDUCAO DE ROTAS: {metricas['numero_arestas_original']} -> {metricas['numero_arestas_otimizado']}")